@@ -0,0 +1,70 @@
+from collections import OrderedDict  # for the least recently used resized images
+
+from PIL import Image
+
+
+class AssetCache:
+    """Images of the game (maze tiles, sprites, menus) decoded once per process, and their resized variants kept in a
+    least recently used cache, shared by every window so that building a new level window doesn't read, decode and
+    resize the images again.
+
+    Only PIL images are cached: a Tk PhotoImage belongs to the window it is created for, so the windows create their
+    PhotoImages from the cached images.
+
+    Attributes:
+        max_variants (int): The maximum number of resized images kept
+        images (dict): The decoded images, by (path, mode)
+        variants (OrderedDict): The resized images, by (path, mode, size), the least recently used first
+    """
+
+    __slots__ = ['max_variants', 'images', 'variants']
+
+    def __init__(self, max_variants=256):
+        """Initialize the AssetCache instance, empty.
+
+        Args:
+            max_variants (int): The maximum number of resized images kept
+        """
+        self.max_variants = max_variants
+        self.images = {}
+        self.variants = OrderedDict()
+
+    def image(self, path, mode='RGBA'):
+        """Get an image, decoded the first time. It is shared, it must not be modified.
+
+        Args:
+            path (str): The path of the image file
+            mode (str): The mode the image is converted to (RGBA to handle transparency), None to keep the mode of the file
+
+        Returns:
+            (Image): The decoded image
+        """
+        key = (path, mode)
+        if key not in self.images:
+            image = Image.open(path)
+            image = image.convert(mode) if mode is not None else image.copy()  # copy to read the file and close it
+            self.images[key] = image
+        return self.images[key]
+
+    def resized(self, path, size, mode='RGBA'):
+        """Get an image resized, resized the first time it is asked with this size. It is shared, it must not be modified.
+
+        Args:
+            path (str): The path of the image file
+            size (tuple): The wanted width and height
+            mode (str): The mode the image is converted to, None to keep the mode of the file
+
+        Returns:
+            (Image): The resized image
+        """
+        key = (path, mode, tuple(size))
+        if key in self.variants:
+            self.variants.move_to_end(key)
+        else:
+            self.variants[key] = self.image(path, mode).resize(key[2])
+            if len(self.variants) > self.max_variants:
+                self.variants.popitem(last=False)
+        return self.variants[key]
+
+
+assets = AssetCache()  # images shared by every window of the game
@@ -1,5 +1,6 @@
 import random  # to randomly position elements
 import math  # to compute euclidian dist
+from GameFiles.SpawnAllocator import level_allocator
 
 
 class GameElements:
@@ -13,69 +14,77 @@ class GameElements:
 
     __slots__ = ['game_state', 'treasure']
 
-    def __init__(self, game_state, nb_traps=5):
+    def __init__(self, game_state, nb_traps=5, rng=random, allocator=None):
         """ Initialize every game elements in the maze
 
         Args:
             game_state (dict): The state of the game containing all trap states and positions
             nb_traps (int): Number of traps to initialize
+            rng (random.Random): The random number generator of the game
+            allocator (SpawnAllocator): The spawn allocator of the level, a new one if None
         """
+        if allocator is None:
+            allocator = level_allocator(game_state, rng)
 
-        self.treasure = Treasure(game_state)
+        # the elements never spawn on the player or the monster
+        for position in (game_state['player_position'], game_state['monster_position']):
+            if position is not None:
+                allocator.occupy(position)
+
+        self.treasure = Treasure(game_state, rng, allocator)
 
         if game_state['traps'] == {}:
             for i in range(nb_traps):
-                Trap(game_state)
+                Trap(game_state, rng, allocator)
 
 class Trap:
     """ Class representing a trap
 
     Attributes:
         game_state (dict): Dictionary containing the traps states and positions
-        trap_position (tuple): The coordinates of the trap within the maze
+        rng (random.Random): The random number generator of the game
+        allocator (SpawnAllocator): The spawn allocator of the level
+        trap_position (tuple): The coordinates of the trap within the maze, None if there was no cell left for it
         activated (bool): Status indicating whether the trap has been activated
         type (int): Numerical identifier representing the type of trap
     """
 
-    __slots__ = ['game_state', 'trap_position', 'activated', 'type']
+    __slots__ = ['game_state', 'rng', 'allocator', 'trap_position', 'activated', 'type']
 
-    def __init__(self, game_state):
+    def __init__(self, game_state, rng=random, allocator=None):
         """Initialize the Trap instance.
 
         Args:
             game_state (dict): Dictionary containing the traps states and positions
+            rng (random.Random): The random number generator of the game
+            allocator (SpawnAllocator): The spawn allocator of the level, a new one if None
         """
         self.game_state = game_state
+        self.rng = rng
+        self.allocator = allocator if allocator is not None else level_allocator(game_state, rng)
 
         self.trap_position = self.init_trap_position()
         self.activated = False
-        self.type = random.randint(1, 3)  # Randomly assigns a type to the trap.
+        self.type = rng.randint(1, 3)  # Randomly assigns a type to the trap.
 
-        self.game_state['traps'][self.trap_position] = [self.activated, self.type]
+        if self.trap_position is not None:
+            self.game_state['traps'][self.trap_position] = [self.activated, self.type]
 
     def init_trap_position(self):
         """spawns a trap at a random position in the maze, avoiding walls, other traps, monster and player
 
         Return
-            trap_pos (tuple): coordinates of the trap, x and y.
+            trap_pos (tuple): coordinates of the trap, x and y, None if every cell far enough from the player is taken.
         """
-        trap_pos = ()
-
-        x = 0
-        y = 0
-
         max_distance = math.sqrt((0.1 * self.game_state['maze_size'][0])**2 + (0.1 * self.game_state['maze_size'][1])**2)
-        distance = max_distance
-        while self.game_state['maze'][x][y].type != 'path' or trap_pos in self.game_state['traps'].keys() \
-                or trap_pos == self.game_state['treasure_position'] or trap_pos == self.game_state['monster_position'] \
-                or distance <= max_distance:   # check position to avoid overlaping objects and check distance to player to avoid putting traps to close
-            x = random.randint(1, self.game_state['maze_size'][0] - 2)
-            y = random.randint(1, self.game_state['maze_size'][1] - 2)
-            trap_pos = (x, y)
+        player_x, player_y = self.game_state['player_position']
 
-            distance = math.sqrt((x - self.game_state['player_position'][0]) ** 2 + (y - self.game_state['player_position'][1]) ** 2)
+        def far_enough(x, y):
+            """check distance to player to avoid putting traps to close"""
+            return math.sqrt((x - player_x) ** 2 + (y - player_y) ** 2) > max_distance
 
-        return trap_pos
+        # the other traps, the treasure and the monster are already taken in the allocator
+        return self.allocator.draw(('far from', (player_x, player_y)), far_enough)
 
 
 
@@ -84,31 +93,32 @@ class Treasure:
 
     Attributes:
         game_state (dict): Dictionary containing the treasure position
+        rng (random.Random): The random number generator of the game
+        allocator (SpawnAllocator): The spawn allocator of the level
     """
 
-    __slots__ = ['game_state']
+    __slots__ = ['game_state', 'rng', 'allocator']
 
-    def __init__(self, game_state):
+    def __init__(self, game_state, rng=random, allocator=None):
         """Initialize the Treasure instance
 
         Args:
             game_state (dict): Dictionary containing the treasure position
+            rng (random.Random): The random number generator of the game
+            allocator (SpawnAllocator): The spawn allocator of the level, a new one if None
         """
         self.game_state = game_state
+        self.rng = rng
+        self.allocator = allocator if allocator is not None else level_allocator(game_state, rng)
 
         if game_state['treasure_position'] is None:
             game_state['treasure_position'] = self.init_treasure_position()
 
 
     def init_treasure_position(self):
-        """Spawns the treasure at a random position in the maze, taking care that it doesn't appear on walls.
+        """Spawns the treasure at a random free path of the maze, so never on walls or on another element.
 
         Returns:
             (x,y) (tuple): position of the treasure in the maze as a tuple of x position and y position.
         """
-        x = 0
-        y = 0
-        while self.game_state['maze'][x][y].type != 'path':
-            x = random.randint(1, self.game_state['maze_size'][0] - 2)
-            y = random.randint(1, self.game_state['maze_size'][1] - 2)
-        return (x, y)
+        return self.allocator.draw()
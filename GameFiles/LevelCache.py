@@ -0,0 +1,134 @@
+import os  # for file gestion
+import hashlib  # to address the levels by the hash of their parameters
+
+from GameFiles.SaveFormat import encode_save, decode_save
+
+CACHE_VERSION = 5  # to increase when the generation of the levels changes, so that old levels are not used anymore
+LEVEL_FIELDS = ('maze_size', 'player_position', 'monster_position', 'treasure_position', 'traps', 'seed', 'algorithm')  # with the maze
+
+
+def level_key(seed, maze_size, nb_traps, algorithm):
+    """Compute the key of a level from the parameters fully defining it.
+
+    Args:
+        seed (int): The seed of the level
+        maze_size (tuple): Dimensions of the maze (width, height)
+        nb_traps (int): Number of traps in the level
+        algorithm (str): Name of the maze generator
+
+    Returns:
+        (str): The hexadecimal hash of the parameters
+    """
+    parameters = repr((CACHE_VERSION, seed, tuple(maze_size), nb_traps, algorithm))
+    return hashlib.sha256(parameters.encode()).hexdigest()
+
+
+def encode_level(game_state):
+    """Serialize the level defined by a game_state (its maze and the initial positions of every element) in the save
+    format, versioned and checksummed. Only plain data is stored, so that reading a level never runs any code.
+
+    Args:
+        game_state (dict): The game_state of the level, just after its generation
+
+    Returns:
+        (bytes): The serialized level
+    """
+    return encode_save(game_state)
+
+
+def decode_level(data):
+    """Deserialize a level serialized by encode_level.
+
+    Args:
+        data (bytes): The serialized level
+
+    Returns:
+        level (dict): The fields of the game_state defining the level, a new copy at every call
+
+    Raises:
+        ValueError: If the data is not a level of this version, or is corrupted
+    """
+    game_state, generation = decode_save(data)
+    level = {field: game_state[field] for field in LEVEL_FIELDS}
+    level['maze'] = game_state['maze']
+    return level
+
+
+class LevelCache:
+    """Content-addressed cache of fully generated levels (maze and initial positions of every element), kept in memory
+    and on the disk so that a level with the same parameters is never generated twice.
+
+    Attributes:
+        directory (str): The directory storing the cached levels
+        max_levels (int): Maximum number of levels kept on the disk, the oldest ones are removed
+        memory (dict): The levels already read or stored during this session, serialized by encode_level
+    """
+
+    __slots__ = ['directory', 'max_levels', 'memory']
+
+    def __init__(self, directory='./data/cache/', max_levels=256):
+        """Initialize the LevelCache instance.
+
+        Args:
+            directory (str): The directory storing the cached levels
+            max_levels (int): Maximum number of levels kept on the disk
+        """
+        self.directory = directory
+        self.max_levels = max_levels
+        self.memory = {}
+
+    def load(self, key):
+        """Get a cached level.
+
+        Args:
+            key (str): The key of the level, see level_key
+
+        Returns:
+            level (dict): The fields of the game_state defining the level, or None if the level is not cached
+        """
+        data = self.memory.get(key)
+        if data is None:
+            try:
+                with open(os.path.join(self.directory, key + '.level'), 'rb') as file:
+                    data = file.read()
+            except FileNotFoundError:
+                return None
+            self.memory[key] = data
+
+        try:
+            return decode_level(data)  # a new copy every time so that the cached level is never modified
+        except ValueError:
+            print(f"Cached level {key} is corrupted")
+            del self.memory[key]
+            return None
+
+    def store(self, key, game_state):
+        """Store the level defined by a game_state in the cache.
+
+        Args:
+            key (str): The key of the level, see level_key
+            game_state (dict): The game_state of the level, just after its generation
+        """
+        data = encode_level(game_state)
+        self.memory[key] = data
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            filename = os.path.join(self.directory, key + '.level')
+
+            # write in a temporary file first so that a level is never partially written
+            with open(filename + '.tmp', 'wb') as file:
+                file.write(data)
+            os.replace(filename + '.tmp', filename)
+
+            self.prune()
+        except OSError as error:
+            print(f"Level could not be cached: {error}")
+
+    def prune(self):
+        """Remove the oldest levels from the disk when there are more than max_levels."""
+        levels = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.level')]
+        if len(levels) > self.max_levels:
+            levels.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in levels[:len(levels) - self.max_levels]:
+                os.remove(entry.path)
@@ -0,0 +1,126 @@
+import os  # to count the cores
+import struct  # to write the header and the index of the pack
+import random  # to choose the seeds of the levels
+import time  # to measure the generation speed
+import argparse  # for the command line
+from concurrent.futures import ProcessPoolExecutor  # to generate the levels on every core
+
+from GameFiles.MazeGame import MazeGame
+from GameFiles.LevelCache import encode_level, decode_level
+
+# a pack is the header, an index with the offset and length of every level, then the levels serialized by encode_level
+PACK_MAGIC = b'DMZPACK1'
+PACK_HEADER = struct.Struct('<8sI')  # magic, number of levels
+PACK_ENTRY = struct.Struct('<QI')  # offset, length of the serialized level
+
+
+def pack_parameters(nb_levels, sizes, traps, seed=None, algorithm='prim'):
+    """Compute the parameters of every level of a pack, the size and number of traps growing linearly from the first
+    to the last level like in the game.
+
+    Args:
+        nb_levels (int): Number of levels in the pack
+        sizes (tuple): Width and height of the maze of the first and last levels
+        traps (tuple): Number of traps of the first and last levels
+        seed (int): Seed from which the seeds of the levels are chosen, a random one if None
+        algorithm (str): Name of the maze generator, see MazeGenerators.GENERATORS
+
+    Returns:
+        parameters (list): The (maze_size, nb_traps, level, seed, algorithm) of every level
+    """
+    rng = random.Random(seed)
+    parameters = []
+    for ind in range(nb_levels):
+        progress = ind / (nb_levels - 1) if nb_levels > 1 else 0
+        size = round(sizes[0] + (sizes[1] - sizes[0]) * progress)
+        nb_traps = round(traps[0] + (traps[1] - traps[0]) * progress)
+        parameters.append(((size, size), nb_traps, ind + 1, rng.randrange(2**32), algorithm))
+    return parameters
+
+
+def generate_pack_level(parameters):
+    """Generate a level of a pack, in a worker process.
+
+    Args:
+        parameters (tuple): The (maze_size, nb_traps, level, seed, algorithm) of the level
+
+    Returns:
+        (bytes): The level serialized by encode_level
+    """
+    maze_size, nb_traps, level, seed, algorithm = parameters
+
+    game = MazeGame(maze_size, seed)
+    game.game_state["level"] = level
+    game.create_level(nb_traps, algorithm)
+
+    return encode_level(game.game_state)
+
+
+def write_pack(filename, parameters, workers=None):
+    """Generate levels on every core and write them in a single pack file.
+
+    Args:
+        filename (str): The pack file to write
+        parameters (list): The (maze_size, nb_traps, level, seed, algorithm) of every level, see pack_parameters
+        workers (int): Number of worker processes, one per core if None
+
+    Returns:
+        elapsed (float): The time taken to generate and write the levels, in seconds
+    """
+    start = time.perf_counter()
+    entries = []
+
+    with open(filename, 'wb') as file:
+        # the index is written at the end, when the offsets of the levels are known
+        file.write(PACK_HEADER.pack(PACK_MAGIC, len(parameters)))
+        file.write(bytes(PACK_ENTRY.size * len(parameters)))
+
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            chunksize = max(1, len(parameters) // (4 * (workers or os.cpu_count() or 1)))
+            for data in executor.map(generate_pack_level, parameters, chunksize=chunksize):
+                entries.append(PACK_ENTRY.pack(file.tell(), len(data)))
+                file.write(data)
+
+        file.seek(PACK_HEADER.size)
+        file.write(b''.join(entries))
+
+    return time.perf_counter() - start
+
+
+def read_pack_level(filename, ind):
+    """Read a level from a pack file without reading the other ones.
+
+    Args:
+        filename (str): The pack file
+        ind (int): The index of the level in the pack, starting at 0
+
+    Returns:
+        level (dict): The fields of the game_state defining the level, see LevelCache.decode_level
+    """
+    with open(filename, 'rb') as file:
+        magic, nb_levels = PACK_HEADER.unpack(file.read(PACK_HEADER.size))
+        if magic != PACK_MAGIC:
+            raise ValueError(f"{filename} is not a level pack")
+        if not 0 <= ind < nb_levels:
+            raise IndexError(f"level {ind} is not in the pack, it has {nb_levels} levels")
+
+        file.seek(PACK_HEADER.size + ind * PACK_ENTRY.size)
+        offset, length = PACK_ENTRY.unpack(file.read(PACK_ENTRY.size))
+        file.seek(offset)
+        return decode_level(file.read(length))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a pack of levels on every core.")
+    parser.add_argument('output', help="the pack file to write")
+    parser.add_argument('-n', '--levels', type=int, default=100, help="number of levels")
+    parser.add_argument('--sizes', type=int, nargs=2, default=(12, 111), metavar=('FIRST', 'LAST'), help="maze size of the first and last levels")
+    parser.add_argument('--traps', type=int, nargs=2, default=(3, 201), metavar=('FIRST', 'LAST'), help="number of traps of the first and last levels")
+    parser.add_argument('--seed', type=int, default=None, help="seed of the pack")
+    parser.add_argument('--algorithm', default='prim', help="maze generator, see MazeGenerators.GENERATORS")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="number of worker processes, one per core by default")
+    args = parser.parse_args()
+
+    levels = pack_parameters(args.levels, args.sizes, args.traps, args.seed, args.algorithm)
+    elapsed = write_pack(args.output, levels, args.workers)
+    print(f"{len(levels)} levels written to {args.output} in {elapsed:.2f} s ({len(levels) / elapsed:.1f} levels/s)")
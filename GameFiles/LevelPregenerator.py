@@ -0,0 +1,81 @@
+import random  # to choose the seed of the next level
+from concurrent.futures import ThreadPoolExecutor  # to generate the next level in a worker thread
+
+
+class LevelPregenerator:
+    """Generates the next level in a worker thread while the current one is played, so that it is ready when the
+    player clicks on the next level button.
+
+    Attributes:
+        build (function): The function building a level from (maze_size, nb_traps, level, seed, algorithm)
+        executor (ThreadPoolExecutor): The executor running the generation in a single worker thread
+        parameters (tuple): The (maze_size, nb_traps, level, algorithm) of the level being generated
+        future (Future): The result of the generation, None if no level is being generated
+    """
+
+    __slots__ = ['build', 'executor', 'parameters', 'future']
+
+    def __init__(self, build):
+        """Initialize the LevelPregenerator instance.
+
+        Args:
+            build (function): The function building a level from (maze_size, nb_traps, level, seed, algorithm) and
+                returning the game object
+        """
+        self.build = build
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='level-pregeneration')
+        self.parameters = None
+        self.future = None
+
+    def start(self, maze_size, nb_traps, level, algorithm='prim'):
+        """Start generating a level in the background, replacing the level previously being generated.
+
+        Args:
+            maze_size (tuple): Dimensions of the maze (width, height).
+            nb_traps (int): Number of traps to place in the maze.
+            level (int): The level number.
+            algorithm (str): name of the maze generator, see MazeGenerators.GENERATORS
+        """
+        if self.future is not None:
+            self.future.cancel()  # only possible if it didn't start yet, otherwise its result is ignored
+
+        seed = random.randrange(2**32)  # chosen here so that the level is the one that would be generated synchronously
+        self.parameters = (tuple(maze_size), nb_traps, level, algorithm)
+        self.future = self.executor.submit(self.build, maze_size, nb_traps, level, seed, algorithm)
+
+    def take(self, maze_size, nb_traps, level, algorithm='prim'):
+        """Hand over the level generated in the background if it is the wanted one.
+
+        Args:
+            maze_size (tuple): Dimensions of the maze (width, height).
+            nb_traps (int): Number of traps to place in the maze.
+            level (int): The level number.
+            algorithm (str): name of the maze generator, see MazeGenerators.GENERATORS
+
+        Returns:
+            game (MazeGame): The generated game, or None if it has to be generated synchronously
+        """
+        future, parameters = self.future, self.parameters
+        self.future, self.parameters = None, None
+
+        if future is None or parameters != (tuple(maze_size), nb_traps, level, algorithm):
+            if future is not None:
+                future.cancel()
+            return None
+
+        # if the worker didn't start yet, generating synchronously is faster than waiting for it
+        if future.cancel():
+            return None
+
+        # otherwise it is already running, so waiting for it is faster than starting again
+        try:
+            return future.result()
+        except Exception as error:
+            print(f"Background generation of the level failed: {error}")
+            return None
+
+    def shutdown(self):
+        """Stop the worker thread, abandoning the level being generated."""
+        if self.future is not None:
+            self.future.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,4 +1,4 @@
-import random  # needed to generate the maze
+import random  # needed to seed the levels
 import time  # needed to count the time taken to finish a level
 
 # for file gestion
@@ -10,6 +10,16 @@ from colorama import init, Fore
 init()
 
 from GameFiles.Observer_Observable_logic import Observable
+from GameFiles.MazeGrid import MazeGrid, MazeCell, WALL, PATH, UNCHECKED, CELL_CODES  # MazeCell is kept importable from here
+from GameFiles import MazeGenerators
+from GameFiles.Player import Player
+from GameFiles.Monster import Monster
+from GameFiles.GameElements import GameElements
+from GameFiles.SpawnAllocator import level_allocator
+from GameFiles.Occupancy import level_occupancy
+from GameFiles.SaveFormat import read_save, save_checksum
+from GameFiles.SaveSlots import write_slot_save
+from GameFiles.SaveJournal import SaveJournal, replay_journal, SCORE_CHANGED
 
 class MazeGame(Observable):
     """
@@ -18,9 +28,16 @@ class MazeGame(Observable):
     Attributes:
     maze_size (tuple): Dimensions of the maze (width, height)
     player_position (tuple): position of the player within the maze as a tuple of integers (x, y)
-    maze (list): A 2D list of MazeCell objects representing the structure and state of the maze
+    maze (MazeGrid): The grid of cell codes representing the structure and state of the maze
+    rng (random.Random): The random number generator of the game, seeded with the seed of the level
+    spawns (SpawnAllocator): The free cells where the elements of the level can spawn, see spawn_allocator
+    occupancy (Occupancy): The entities on every cell for the collision checks, see occupancy_grid
+    generation (int): The number of saves of the game, written in the save
+    journal (SaveJournal): The journal of the events since the last save, see log_event
+    save_filename (str): The file of the last save, compacting the journal saves again to it
+    writer (SaveWriter): The writer saving in the background, None to save synchronously
     game_state (dict): A dictionary containing all relevant game state variables including:
-        - maze (list): Same as the class attribute 'maze'
+        - maze (MazeGrid): Same as the class attribute 'maze'
         - maze_size (tuple): Same as the class attribute 'maze_size'
         - life (int): Number of lives the player has left
         - level (int): Current game level
@@ -29,19 +46,25 @@ class MazeGame(Observable):
         - monster_position (tuple): Position of the monster within the maze
         - traps (dict): Locations and states of traps within the maze
         - treasure_position (tuple): Location of the treasure within the maze
+        - seed (int): Seed from which the level is generated, None for old saves
+        - algorithm (str): Name of the maze generator used to generate the level
     """
 
-    __slots__ = ['game_state', 'start_time', 'end', 'maze', 'maze_size']
+    __slots__ = ['game_state', 'start_time', 'end', 'maze', 'maze_size', 'rng', 'spawns', 'occupancy', 'generation', 'journal', 'save_filename', 'writer']
 
-    def __init__(self, maze_size=(12, 12)):
+    def __init__(self, maze_size=(12, 12), seed=None):
         """Initialize the MazeGame instance.
 
         Args:
             maze_size (tuple): Dimensions of the maze (width, height)
+            seed (int): Seed of the level, a random one is chosen if None
         """
+        if seed is None:
+            seed = random.randrange(2**32)
+
         # initialise dictionary to save the game state at all time
         self.game_state = {
-            'maze': [],
+            'maze': None,
             'maze_size': maze_size,
             'life': 3,
             'level': 1,
@@ -49,9 +72,14 @@ class MazeGame(Observable):
             'player_position': None,
             'monster_position': None,
             'traps': {},
-            'treasure_position': None
+            'treasure_position': None,
+            'seed': seed,
+            'algorithm': 'prim'
         }
 
+        # every random choice of the level comes from this generator so that the level can be reproduced from its seed
+        self.rng = random.Random(seed)
+
         self.start_time = time.time()
         self.end = False
 
@@ -59,88 +87,117 @@ class MazeGame(Observable):
         self.maze = self.game_state['maze']
         self.maze_size = self.game_state['maze_size']
 
-    def generate_maze(self):
-        """Generate a random maze layout using Prim's MST algorithm."""
-        # initialise the maze list with 'unchecked cells
-        walls = []
-        for x in range(0, self.maze_size[0]):
-            line = []
-            for y in range(0, self.maze_size[1]):
-                line.append(MazeCell(x, y, 'unchecked'))
-            self.maze.append(line)
-
-        # choose a random coordinate from which the algorithm will start
-        starting_coord = (random.randint(1, self.maze_size[0] - 2), random.randint(1, self.maze_size[1] - 2))
-        self.maze[starting_coord[0]][starting_coord[1]] = MazeCell(starting_coord[0], starting_coord[1], 'path')
-
-        # set the cells around the randomly chosen coordinate to walls
-        for offset in range(-1, 2, 2):
-            walls.append([starting_coord[0] + offset, starting_coord[1]])
-            self.maze[starting_coord[0] + offset][starting_coord[1]] = MazeCell(starting_coord[0] + offset, starting_coord[1], 'wall')
-            walls.append([starting_coord[0], starting_coord[1] + offset])
-            self.maze[starting_coord[0]][starting_coord[1] + offset] = MazeCell(starting_coord[0], starting_coord[1] + offset, 'wall')
-
-        # while there are walls still not checked
-        while walls:
-            # we select a random wall
-            rand_wall = walls.pop(random.randint(0, len(walls) - 1))
-
-            for offset in range(-1, 2, 2):
-                # on the x axis
-                if 0 < rand_wall[0] < self.maze_size[0] - 1:  # to avoid checking cells outside the maze
-                    # we check if the 2 cells separated by the random wall are unchecked for one and a path for the other
-                    if self.maze[rand_wall[0] + offset][rand_wall[1]].type == 'unchecked' and self.maze[rand_wall[0] - offset][rand_wall[1]].type == 'path':
-                        neighboring_path = len(self.maze[rand_wall[0]][rand_wall[1]].get_cell_neighbors(self.maze, self.maze_size, 'path'))
-
-                        # if the random wall have less than 2 neighbouring cell of the path type, then it becomes a path
-                        if neighboring_path < 2:
-                            self.maze[rand_wall[0]][rand_wall[1]] = MazeCell(rand_wall[0], rand_wall[1], 'path')
-
-                            # replace every neighbouring cell of unchecked type to a wall as we did for the starting cell
-                            for offset in range(-1, 2, 2):
-                                if self.maze[rand_wall[0] + offset][rand_wall[1]].type == 'unchecked':
-                                    self.maze[rand_wall[0] + offset][rand_wall[1]] = MazeCell(rand_wall[0] + offset, rand_wall[1], 'wall')
-                                    walls.append([rand_wall[0] + offset, rand_wall[1]])
-                                if self.maze[rand_wall[0]][rand_wall[1] + offset].type == 'unchecked':
-                                    self.maze[rand_wall[0]][rand_wall[1] + offset] = MazeCell(rand_wall[0], rand_wall[1] + offset, 'wall')
-                                    walls.append([rand_wall[0], rand_wall[1] + offset])
-
-                # same thing for the cell separated on the y axis
-                if 0 < rand_wall[1] < self.maze_size[1] - 1:
-                    if self.maze[rand_wall[0]][rand_wall[1] + offset].type == 'unchecked' and self.maze[rand_wall[0]][rand_wall[1] - offset].type == 'path':
-                        neighboring_path = len(self.maze[rand_wall[0]][rand_wall[1]].get_cell_neighbors(self.maze, self.maze_size, 'path'))
-
-                        if neighboring_path < 2:
-                            self.maze[rand_wall[0]][rand_wall[1]] = MazeCell(rand_wall[0], rand_wall[1], 'path')
-
-                            for offset in range(-1, 2, 2):
-                                if self.maze[rand_wall[0]][rand_wall[1] + offset].type == 'unchecked':
-                                    self.maze[rand_wall[0]][rand_wall[1] + offset] = MazeCell(rand_wall[0], rand_wall[1] + offset, 'wall')
-                                    walls.append([rand_wall[0], rand_wall[1] + offset])
-                                if self.maze[rand_wall[0] + offset][rand_wall[1]].type == 'unchecked':
-                                    self.maze[rand_wall[0] + offset][rand_wall[1]] = MazeCell(rand_wall[0] + offset, rand_wall[1], 'wall')
-                                    walls.append([rand_wall[0] + offset, rand_wall[1]])
-
-        # to remove the remaining unchecked cells, we convert them to walls
-        for y in range(0, self.maze_size[0]):
-            for x in range(0, self.maze_size[1]):
-                if self.maze[y][x].type == 'unchecked':
-                    self.maze[y][x].type = 'wall'
+        self.spawns = None
+        self.occupancy = None
+        self.generation = 0
+        self.journal = None
+        self.save_filename = None
+        self.writer = None
+
+    def generate_maze(self, algorithm='prim'):
+        """Generate a random maze layout with one of the generators of MazeGenerators (Prim's MST algorithm by default).
+
+        Args:
+            algorithm (str): Name of the maze generator to use, see MazeGenerators.GENERATORS
+        """
+        self.maze = MazeGenerators.generate(self.maze_size, algorithm, self.rng)
+        self.game_state['maze'] = self.maze
+        self.game_state['algorithm'] = algorithm
+
+    def create_level(self, nb_traps, algorithm='prim'):
+        """Generate the maze of a new level then place its elements (player, monster, treasure and traps), every
+        random choice coming from the seed of the game. Used for the levels of the game and of the level packs, so
+        that they are built the same way.
+
+        Args:
+            nb_traps (int): Number of traps to place in the maze
+            algorithm (str): Name of the maze generator to use, see MazeGenerators.GENERATORS
+        """
+        self.generate_maze(algorithm)
+
+        # the elements are initialised in their positions as they are not in the game_state yet
+        Player(self.game_state, self)
+        Monster(self.game_state)
+        GameElements(self.game_state, nb_traps, self.rng, self.spawn_allocator())
+
+    def spawn_allocator(self):
+        """Get the spawn allocator of the level, built once per maze with the cells of the elements already placed
+        occupied.
+
+        Returns:
+            (SpawnAllocator): The spawn allocator of the current maze
+        """
+        if self.spawns is None or self.spawns.grid is not self.maze:
+            self.spawns = level_allocator(self.game_state, self.rng)
+        return self.spawns
+
+    def occupancy_grid(self, rebuild=False):
+        """Get the occupancy of the level, built from the positions of the game_state the first time.
+
+        Args:
+            rebuild (bool): Build it again, when the positions were changed without updating it
+
+        Returns:
+            (Occupancy): The occupancy of the current maze
+        """
+        if rebuild or self.occupancy is None or self.occupancy.grid is not self.maze:
+            self.occupancy = level_occupancy(self.game_state)
+        return self.occupancy
 
     def print_maze(self):
         """make it easier to display the maze for the programmer"""
         for y in range(0, len(self.maze)):
             for x in range(0, len(self.maze[0])):
-                if self.maze[y][x].type == 'unchecked':
+                if self.maze.get(y, x) == UNCHECKED:
                     print(Fore.WHITE, f'{self.maze[y][x]}', end="")
-                elif self.maze[y][x].type == 'path':
+                elif self.maze.get(y, x) == PATH:
                     print(Fore.GREEN, f'{self.maze[y][x]}', end="")
                 else:
                     print(Fore.RED, f'{self.maze[y][x]}', end="")
             print('\n')
 
-    def save_game(self, filename='savegame.csv'):
-        """Save the current game state to a CSV file.
+    def save_game(self, filename='savegame.sav'):
+        """Save the current game state to a binary save file (see SaveFormat), then start a new empty journal for the
+        events following this snapshot. With a writer, the save is written in the background and the new journal is
+        started once it is written.
+
+        Args:
+            filename (str): The filename for saving the game state. Defaults to 'savegame.sav'.
+        """
+        self.generation += 1
+        self.save_filename = filename
+        self.maze.detach()  # the grid of a loaded save may be mapped from the file replaced
+        journal_filename = './data/saves/' + os.path.splitext(filename)[0] + '.journal'
+        if self.journal is None or self.journal.filename != journal_filename:
+            self.close_journal()
+            self.journal = SaveJournal(journal_filename)
+
+        if self.writer is None:
+            self.journal.start(write_slot_save('./data/saves/' + filename, self.game_state, self.generation))
+        else:
+            self.journal.rotate(self.writer.save('./data/saves/' + filename, self.game_state, self.generation))
+
+    def log_event(self, kind, x=0, y=0, value=0):
+        """Save an event of the game in the journal, so that the game is saved continuously. The journal is compacted
+        into a new save when it gets long. Nothing is saved before the first save_game.
+
+        Args:
+            kind (int): The kind of event, see SaveJournal
+            x (int): The x-coordinate of the event
+            y (int): The y-coordinate of the event
+            value (float): The value of the event
+        """
+        if self.journal is not None and self.journal.log(kind, x, y, value):
+            self.save_game(self.save_filename)
+
+    def close_journal(self):
+        """Wait for the save being written, write the last events of the journal and close it."""
+        if self.journal is not None:
+            self.journal.close()
+
+    def save_csv_game(self, filename='savegame.csv'):
+        """Save the current game state to a CSV file, the format of the old saves. Only kept to compare it with the
+        binary format, see SaveFormat.benchmark.
 
         Args:
             filename (str): The filename for saving the game state. Defaults to 'savegame.csv'.
@@ -158,7 +215,7 @@ class MazeGame(Observable):
 
             # Write header
             writer.writerow(['maze', 'maze_size', 'life', 'score', 'player_position',
-                             'monster_position', 'traps', 'treasure_position'])
+                             'monster_position', 'traps', 'treasure_position', 'seed', 'algorithm'])
 
             # write the data in the file
             writer.writerow([
@@ -170,7 +227,9 @@ class MazeGame(Observable):
                 self.game_state['player_position'],
                 self.game_state['monster_position'],
                 self.game_state['traps'],
-                self.game_state['treasure_position']
+                self.game_state['treasure_position'],
+                self.game_state['seed'],
+                self.game_state['algorithm']
             ])
 
     def parse_position(self, position_str):
@@ -191,49 +250,49 @@ class MazeGame(Observable):
 
     def str_to_class(self, object_string):
         """
-        Convert a string representation of an MazeCell object to an instance of the class
+        Convert a string representation of an MazeCell object to its coordinates and cell code
 
         Parameters:
             object_string (str): The string representation of the MazeCell object
 
         Returns:
-            MazeCell(x, y, type): An instance of the MazeCell class initialized with the attributes extracted from the string
+            (x, y, code) (tuple): the coordinates and the code of the cell, extracted from the string
         """
         useful_data = object_string.strip('<>').split('=')  # to get a list of the key and values needed to recreate the object
 
-        # get the coordinates and type of wall to recreate an instance with the same attributes
+        # get the coordinates and type of wall to recreate the cell with the same attributes
         if useful_data != [''] and useful_data != ['None']:
             x = int(useful_data[1].split(',')[0])
             y = int(useful_data[2].split(',')[0])
             type = useful_data[3]
 
-            return MazeCell(x, y, type)
+            return x, y, CELL_CODES[type]
 
 
     def parse_list(self, list_str):
-        """Convert a string representation of a list back to a list. Used for the maze list
+        """Convert a string representation of a list back to a maze grid. Used for the maze list
         
         Args:
             list_str (string): The string representation of the maze list.
 
         Returns:
-            new_list (list): A list of MazeCell objects.
+            new_grid (MazeGrid): The grid of the maze.
         """
         if list_str == 'None':
             return None
 
         elif list_str == '[]':
-            return []
+            return None
 
         else:
-            new_list = []
-            for row in list_str.strip('[]').split('], ['):
-                new_row = []
+            rows = list_str.strip('[]').split('], [')
+            new_grid = MazeGrid((len(rows), len(rows[0].split(', <'))), WALL)
+            for row in rows:
                 for cell in row.strip('[]').split(', <'):
-                    new_row.append(self.str_to_class(cell))
-                new_list.append(new_row)
+                    x, y, code = self.str_to_class(cell)
+                    new_grid.set(x, y, code)
 
-            return new_list
+            return new_grid
 
     def parse_dict(self, list_str):
         """Convert a string representation of a dictionary back to a dictionary. Used for the traps dictionary.
@@ -270,21 +329,73 @@ class MazeGame(Observable):
 
             return new_dict
 
-    def load_game(self, filename='savegame.csv'):
-        """ Load a saved game in CSV format by restoring the state of the maze game.
+    def load_game(self, filename='savegame.sav', legacy_filename='savegame.csv'):
+        """ Load a binary save by restoring the state of the maze game, then replay over it the events of its journal
+        saved since, the following events being added to the journal. If there is no binary save yet but an old CSV
+        save, the CSV save is imported and saved again in the binary format, so it is only parsed once.
+
+        Args:
+            filename (str): The name of the binary save file to load.
+            legacy_filename (str): The name of the old CSV save file to import if there is no binary save, None if
+                there is none.
+        """
+        if not os.path.exists('./data/saves/' + filename) and legacy_filename is not None and \
+                os.path.exists('./data/saves/' + legacy_filename):
+            self.load_csv_game(legacy_filename)
+            if self.game_state['maze'] is not None:
+                self.save_game(filename)
+            return
+
+        try:
+            game_state, generation = read_save('./data/saves/' + filename)
+            game_state['maze'].verify()  # a mapped grid is only checked when needed, and the game needs it all at once
+            self.game_state, self.generation = game_state, generation
+
+        except FileNotFoundError:
+            print(f"No saved game found at {'./data/saves/' + filename}")
+            return
+
+        except ValueError as error:
+            print(f"File {filename} can't be loaded: {error}")
+            return
+
+        snapshot = save_checksum('./data/saves/' + filename)
+        journal_filename = './data/saves/' + os.path.splitext(filename)[0] + '.journal'
+        nb_events = replay_journal(journal_filename, self.game_state, snapshot)
+        self.restore_state()
+
+        # the game goes on in the journal of the save, the save is only written again when the journal is compacted
+        self.save_filename = filename
+        if self.journal is None or self.journal.filename != journal_filename:
+            self.close_journal()
+            self.journal = SaveJournal(journal_filename)
+        self.journal.resume(snapshot, nb_events)
+
+    def restore_state(self):
+        """Update the attributes depending on the game_state after it was replaced by a loaded one."""
+        if self.game_state['seed'] is not None:
+            self.rng = random.Random(self.game_state['seed'])
+
+        # to access these variable more easily
+        self.maze = self.game_state['maze']
+        self.maze_size = self.game_state['maze_size']
+
+    def load_csv_game(self, filename='savegame.csv'):
+        """ Load a saved game in CSV format, the format of the old saves, by restoring the state of the maze game.
 
         Args:
             filename (str): The name of the CSV file to load.
         """
         try:
             with open('./data/saves/' + filename, mode='r', newline='') as file:
+                csv.field_size_limit(max(csv.field_size_limit(), os.path.getsize('./data/saves/' + filename)))  # the maze of a big level is a huge field
                 reader = csv.reader(file)
 
                 next(reader)  # Skip header
 
                 row = next(reader)
                 self.game_state = {
-                    'maze': self.parse_list(row[0]),  # Convert back to list of tuples
+                    'maze': self.parse_list(row[0]),  # Convert back to a maze grid
                     'maze_size': tuple(map(int, row[1].strip('()').split(','))),  # Convert back to tuple
                     'life': int(row[2]),
                     'level': int(row[3]),
@@ -292,9 +403,13 @@ class MazeGame(Observable):
                     'player_position': self.parse_position(row[5]),  # Convert back to tuple
                     'monster_position': self.parse_position(row[6]),  # Convert back to tuple
                     'traps': self.parse_dict(row[7]),  # Convert back to list of tuples
-                    'treasure_position': self.parse_position(row[8])  # Convert back to tuple
+                    'treasure_position': self.parse_position(row[8]),  # Convert back to tuple
+                    'seed': int(row[9]) if len(row) > 9 and row[9] not in ('', 'None') else None,  # old saves have no seed
+                    'algorithm': row[10] if len(row) > 10 else 'prim'
                 }
 
+                self.restore_state()
+
         except FileNotFoundError:
             print(f"No saved game found at {'./data/saves/' + filename}")
 
@@ -304,6 +419,7 @@ class MazeGame(Observable):
     def update_score(self):
         """ Function updating the player's score by taking the time that we stocked at the start of the level and removing the time at which the player loses or wins """
         self.game_state['score'] += time.time() - self.start_time
+        self.log_event(SCORE_CHANGED, value=self.game_state['score'])
 
     def win_game(self):
         """ update the time taken and notify the observer to display the winning end game menu """
@@ -318,82 +434,3 @@ class MazeGame(Observable):
         self.update_score()
         self.notify_observer("lose")
 
-
-class MazeCell:
-    """Class representing a cell in the maze.
-
-    Attributes:
-        coord (tuple): The (x, y) coordinates of the cell
-        type (str): The type of cell, which can be 'wall', 'path', or 'unchecked'
-    """
-
-    __slots__ = ['coord', 'type']
-
-    def __init__(self, x, y, type):
-        """Initialize the MazeCell instance.
-
-        Args:
-            x (int): The x-coordinate of the cell.
-            y (int): The y-coordinate of the cell.
-            type (String): string indicating the type of cell (wall, path or unchecked).
-        """
-        self.coord = (x, y)
-        self.type = type
-
-    def __str__(self):
-        """
-        make it easier to understand cell type when printing
-
-         Returns:
-            str: A single character representing the type of the cell ('w' for wall, 'p' for path, 'u' for unchecked).
-        """
-        if self.type == 'wall':
-            return 'w'
-        elif self.type == 'path':
-            return 'p'
-        else:
-            return 'u'
-
-    def __repr__(self):
-        """
-        Custom string representation including the object's data. Needed to parse back it's data when loading a save.
-
-        Returns:
-            (string): A string representation of the object's data of the form: <x=<x coord>, y=<y coord>, type=<type>>
-        """
-        return f'<x={self.coord[0]}, y={self.coord[1]}, type={self.type}>'
-
-    def get_cell_neighbors(self, maze, maze_size, searched_type):
-        """ Retrieve the neighbors of a certain type of the cell in the maze.
-        Args:
-            maze (list): A 2D list representing the maze layout.
-            maze_size (int): The size of the maze (number of cells in each dimension).
-            searched_type (string): A string containing describing the type of studied object.
-        
-        Returns:
-            searched_cells_list (list): The list of the searched cells.
-        """
-        searched_cells_list = []
-
-        # if we don't look for a specific type of cell
-        if searched_type == "any":
-            for offset in range(-1, 2, 2):
-                # add the neighbours on the y axis to the list
-                if 0 <= self.coord[1] + offset < maze_size[1]:
-                    searched_cells_list.append(maze[self.coord[0]][self.coord[1] + offset])
-                # add the neighbours on the x axis to the list
-                if 0 <= self.coord[0] + offset < maze_size[0]:
-                    searched_cells_list.append(maze[self.coord[0] + offset][self.coord[1]])
-
-        # if we look for a specific type of cell
-        else:
-            for offset in range(-1, 2, 2):
-                # add the neighbours on the y axis to the list
-                if 0 <= self.coord[1] + offset < maze_size[1]:
-                    if maze[self.coord[0]][self.coord[1] + offset].type == searched_type:
-                        searched_cells_list.append(maze[self.coord[0]][self.coord[1] + offset])
-                # add the neighbours on the x axis to the list
-                if 0 <= self.coord[0] + offset < maze_size[0]:
-                    if maze[self.coord[0] + offset][self.coord[1]].type == searched_type:
-                        searched_cells_list.append(maze[self.coord[0] + offset][self.coord[1]])
-        return searched_cells_list
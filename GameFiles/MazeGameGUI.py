@@ -1,19 +1,35 @@
 import tkinter as tk
 from PIL import ImageTk, Image  # for RGBA images
 import math  # to compute floor and ceil
+import os  # to find the saves of the old versions
+import time  # to display the date of the saves
 from GameFiles.Observer_Observable_logic import Observer
+from GameFiles.SaveSlots import read_index, NB_SLOTS, LEGACY_SLOT
+from GameFiles.AssetCache import assets
+from GameFiles.MazeTiles import background_chunks, compose_background, tile_ids
+
+# colors of the pixel codes of the save thumbnails: wall, path, player, treasure
+THUMBNAIL_PALETTE = [40, 30, 25, 200, 190, 160, 60, 140, 255, 255, 200, 0]
+
+# below this cell size (in pixels) the maze doesn't fit on the screen, it is displayed in a viewport following the player
+MIN_CELL_SIZE = 24
+VIEW_CHUNK_CELLS = 16  # width and height of the chunks of the maze background materialized by the viewport, in cells
+VIEW_MARGIN = 1  # number of chunks materialized around the viewport, so that they are ready before being seen
 
 class MazeGUI(tk.Tk, Observer):
     """Class for creating a graphical user interface (GUI) for the maze game.
 
     Attributes:
         game_state (dict): A dictionary containing the state of the game
-        maze (list): 2D list representing the maze
+        maze (MazeGrid): grid representing the maze
         maze_size (tuple): Dimensions of the maze
         monster (Monster): The Monster object in the game
         player (Player): The Player object in the game
 
-        cell_size (int): Pixel size for each cell in the maze to fit the screen size
+        cell_size (int): Pixel size for each cell in the maze to fit the screen size, at least MIN_CELL_SIZE
+        viewport (bool): True if the maze is too big for the screen and only the part around the player is displayed
+        view_size (tuple): Width and height of the displayed part of the maze, in pixels
+        camera (tuple): Position of the top left corner of the displayed part of the maze on the canvas, in pixels
 
         screen_width (int): Width of the screen
         screen_height (int): Height of the screen
@@ -27,6 +43,11 @@ class MazeGUI(tk.Tk, Observer):
         life_sprite (Image): Image sprite for lives
         lose_life_sprite (Image): Image sprite for displaying lost of lives
         traps (dict): Dictionary to store trap images and their canvas items
+        maze_imgs (list): The images of the chunks of the maze background
+        maze_tiles (bytes): The tile ids of the cells of the maze, see MazeTiles.tile_ids (viewport only)
+        chunks (dict): The canvas item and image of the materialized chunks of the background, by chunk (viewport only)
+        free_chunks (list): The hidden canvas items of the chunks gone out of the viewport, to be recycled
+        frames (dict): The frames of the sprites cut for the cell size of the level, see crop_images
     """
 
     __slots__ = ["game_state", "maze", "maze_size", "monster", "player", "cell_size",
@@ -34,7 +55,8 @@ class MazeGUI(tk.Tk, Observer):
                  "treasure_sprite", "bear_trap_sprite", "fire_trap_sprite", "spike_trap_sprite",
                  "life_sprite", "lose_life_sprite", "player_img", "player_char", "monster_image",
                  "monster_char", "life_img", "life_display", "traps_imgs", "traps", "canvas",
-                 "clicked_button"]
+                 "clicked_button", "maze_imgs", "frames", "viewport", "view_size", "camera", "maze_tiles",
+                 "chunks", "free_chunks"]
 
     def __init__(self, game_state, monster, player):
         """Initializes the MazeGUI class.
@@ -66,28 +88,73 @@ class MazeGUI(tk.Tk, Observer):
         else:
             self.cell_size = math.floor(0.95*self.screen_height / self.maze_size[1])
 
+        # the cells of a big maze would be too small, only a part of the maze is displayed
+        self.viewport = self.cell_size < MIN_CELL_SIZE
+        self.camera = (0, 0)
+        if self.viewport:
+            self.cell_size = MIN_CELL_SIZE
+            side = math.floor(0.95*self.screen_width) if self.maze_size[0] > self.maze_size[1] else math.floor(0.95*self.screen_height)
+            self.view_size = (min(side, self.maze_size[1] * self.cell_size), min(side, self.maze_size[0] * self.cell_size))
+        else:
+            self.view_size = (self.maze_size[1] * self.cell_size, self.maze_size[0] * self.cell_size)
+
         # Load images for game elements
         # characters
-        self.player_sprite = Image.open("./data/player.png").convert("RGBA")  # RGBA to handle transparency
-        self.monster_sprite = Image.open("./data/monster.png").convert("RGBA")
+        self.player_sprite = assets.image("./data/player.png")  # RGBA to handle transparency
+        self.monster_sprite = assets.image("./data/monster.png")
 
         # treasure
-        self.treasure_sprite = Image.open("./data/treasure.png").convert("RGBA")
+        self.treasure_sprite = assets.image("./data/treasure.png")
 
         # traps
-        self.bear_trap_sprite = Image.open("./data/traps/Bear_Trap.png").convert("RGBA")
-        self.fire_trap_sprite = Image.open("./data/traps/Fire_Trap.png").convert("RGBA")
-        self.spike_trap_sprite = Image.open("./data/traps/Spike_Trap.png").convert("RGBA")
+        self.bear_trap_sprite = assets.image("./data/traps/Bear_Trap.png")
+        self.fire_trap_sprite = assets.image("./data/traps/Fire_Trap.png")
+        self.spike_trap_sprite = assets.image("./data/traps/Spike_Trap.png")
         self.traps = {}  # dict to store the traps canvas element
+        self.traps_imgs = {1: (self.bear_trap_sprite, 4), 2: (self.fire_trap_sprite, 14), 3: (self.spike_trap_sprite, 14)}  # associate a number to an image and the number of frames for the animation
 
         # life
-        self.life_sprite = Image.open("./data/HUD/life.png").convert("RGBA")
-        self.lose_life_sprite = Image.open("./data/HUD/lose_life.png").convert("RGBA")
+        self.life_sprite = assets.image("./data/HUD/life.png")
+        self.lose_life_sprite = assets.image("./data/HUD/lose_life.png")
+
+        self.frames = {}
+        self.load_frames()
 
         self.main_window()
 
+    def load_frames(self):
+        """Cuts every frame of the sprite sheets once for the cell size of the level, so that the animations only swap
+        the images of the canvas items."""
+        sheets = [(self.player_sprite, (4, 4), 'perso'), (self.monster_sprite, (4, 4), 'perso'),
+                  (self.treasure_sprite, (2, 1), 'treasure'),
+                  (self.life_sprite, (1, 4), 'life'), (self.lose_life_sprite, (1, 4), 'life')]
+        sheets += [(sprite, (frames, 1), 'trap') for sprite, frames in self.traps_imgs.values()]
 
-    def crop_images(self,  img, split, nb, type = 'perso'):
+        for img, split, type in sheets:
+            for column in range(1, split[0] + 1):
+                for row in range(1, split[1] + 1):
+                    self.crop_images(img, split, (column, row), type)
+
+    def crop_images(self, img, split, nb, type='perso'):
+        """Gets a frame of a sprite sheet from the frame table, cut the first time it is asked (see cut_frame).
+
+        Args:
+            img (Image): The source PIL Image to crop
+            split (tuple): Dimensions to split the image into (columns, rows)
+            nb (tuple): Tuple specifying the part of the split image to use (column, row)
+            type (str): Type of image being processed to determine resizing
+
+        Returns:
+            image (PhotoImage): the resized PhotoImage
+            new_w (int): new width
+            new_h (int): new height
+        """
+        key = (id(img), split, nb, type)  # the sprites are kept by the window, their id can't be reused
+        if key not in self.frames:
+            self.frames[key] = self.cut_frame(img, split, nb, type)
+        return self.frames[key]
+
+    def cut_frame(self,  img, split, nb, type = 'perso'):
         """Crops image to a certain part and resizes them.
 
         Args:
@@ -135,7 +202,10 @@ class MazeGUI(tk.Tk, Observer):
 
     def main_window(self):
         """Main game window displaying the maze, hud and game elements"""
-        self.canvas = tk.Canvas(self, width=self.maze_size[1] * self.cell_size, height=self.maze_size[0] * self.cell_size)
+        self.canvas = tk.Canvas(self, width=self.view_size[0], height=self.view_size[1])
+        if self.viewport:
+            # the whole maze can be scrolled to, see follow_player
+            self.canvas.configure(scrollregion=(0, 0, self.maze_size[0] * self.cell_size, self.maze_size[1] * self.cell_size))
         self.canvas.pack()
 
         # bind the moving keys
@@ -154,322 +224,78 @@ class MazeGUI(tk.Tk, Observer):
 
         self.draw_life()
 
+        self.follow_player()
+
     def draw_maze(self):
-        """Draws the maze on the canvas by choosing the right image for every cells."""
-        # Load images for walls and paths
-        self.w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_bbot_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/full_bbottom_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        # last line
-        self.bbot_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/bbottom_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.bbot_m_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/bbottom_mid_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_l_bbot_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_left_bbottom_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_r_bbot_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_right_bbottom_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        # first line
-        self.ttop_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/ttop_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.ttop_m_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/ttop_mid_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_l_ttop_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_left_ttop_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_r_ttop_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_right_ttop_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        # first column
-        self.ll_m_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/lleft_mid_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.ll_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/lleft_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_top_lleft_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_top_lleft_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_bot_lleft_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_bot_lleft_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        # last column
-        self.rr_m_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/rright_mid_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.rr_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/rright_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_top_rright_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_top_rright_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_bot_rright_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_bot_rright_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        # corners
-        self.tt_rr_c_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/ttop_rright_corner.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.tt_ll_c_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/ttop_lleft_corner.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.bb_rr_c_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/bbot_rright_corner.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.bb_ll_c_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/bbot_lleft_corner.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        # vertical and horizontal walls
-        self.bot_w_v_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/bottom_wall_vertical.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.w_v_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_vertical.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.w_h_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_horizontal.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        # corners
-        self.top_l_c_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/top_left_corner.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.top_r_c_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/top_right_corner.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.bot_l_c_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/bottom_left_corner.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.bot_r_c_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/bottom_right_corner.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        self.r_m_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/right_mid_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.l_m_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/left_mid_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.top_m_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/top_mid_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.bot_m_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/bottom_mid_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        # group of walls
-        self.l_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/left_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.r_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/right_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        self.f_top_l_c_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_top_left_corner.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_top_r_c_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_top_right_corner.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_bot_l_c_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_bottom_left_corner.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_bot_r_c_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_bottom_right_corner.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        self.f_top_r_m_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_top_right_mid_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_top_l_m_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_top_left_mid_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_bot_r_m_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_bot_right_mid_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_bot_l_m_w_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_bot_left_mid_wall.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        self.f_top_w_h_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_top_wall_horizontal.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_top_r_w_h_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_top_right_wall_horizontal.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_top_l_w_h_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_top_left_wall_horizontal.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        self.f_bot_w_h_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_bot_wall_horizontal.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_bot_r_w_h_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_bot_right_wall_horizontal.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.f_bot_l_w_h_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/filled_bot_left_wall_horizontal.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        self.w_top_l = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_top_left_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.w_top_r = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_top_right_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.w_bot_l = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_bot_left_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.w_bot_r = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_bot_right_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        self.w_top_l_r = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_top_left_right_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.w_bot_l_r = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_bot_left_right_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.w_top_l_bot_r = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_top_left_bot_right_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.w_top_r_bot_r = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_top_right_bot_right_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.w_top_l_bot_l = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_top_left_bot_left_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.w_top_r_bot_l = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_top_right_bot_left_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        self.w_top_l_r_bot_r = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_top_left_right_bot_right_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.w_top_r_bot_l_r = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_top_right_bot_left_right_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.w_top_l_bot_l_r = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_top_left_bot_left_right_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-        self.w_top_l_r_bot_l = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_top_left_right_bot_left_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        self.w_top_l_r_bot_l_r = ImageTk.PhotoImage(Image.open("./data/Maze_assets/wall_top_left_right_bot_left_right_hole.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        # path
-        self.p_img = ImageTk.PhotoImage(Image.open("./data/Maze_assets/path.png").convert("RGBA").resize((self.cell_size, self.cell_size)))
-
-        # for each cell in the maze
-        for i in range(self.maze_size[0]):
-            for j in range(self.maze_size[1]):
-                cell = self.maze[i][j]
-
-                # left, right, top and bottom coordinates of the cell on the canvas
-                x0, y0 = i * self.cell_size, j * self.cell_size
-                x1, y1 = x0 + self.cell_size, y0 + self.cell_size
-
-                # get the neighbors to chose the correct image
-                neighbors = cell.get_cell_neighbors(self.maze, self.maze_size, "any")
-
-                if cell.type == "wall":
-                    if 0 < cell.coord[0] < self.maze_size[0] - 1 and 0 < cell.coord[1] < self.maze_size[1] - 1:
-                        # vertical wall
-                        if neighbors[0].type == "wall" and neighbors[1].type == "path" and neighbors[2].type == "wall" and neighbors[3].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_v_img)
-                        elif neighbors[0].type == "path" and neighbors[1].type == "path" and neighbors[2].type == "wall" and neighbors[3].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_v_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "path" and neighbors[2].type == "path" and neighbors[3].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.bot_w_v_img)
-
-                        # horizontal wall
-                        elif neighbors[0].type == "path" and neighbors[1].type == "wall" and neighbors[2].type == "path" and neighbors[3].type == "wall":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_h_img)
-                        elif neighbors[0].type == "path" and neighbors[1].type == "path" and neighbors[2].type == "path" and neighbors[3].type == "wall":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_h_img)
-                        elif neighbors[0].type == "path" and neighbors[1].type == "wall" and neighbors[2].type == "path" and neighbors[3].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_h_img)
-
-                        # corners
-                        elif neighbors[0].type == "path" and neighbors[1].type == "path" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.top_l_c_img)
-                        elif neighbors[0].type == "path" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "path" and self.maze[i-1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.top_r_c_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "path" and neighbors[3].type == "path" and self.maze[i-1][j-1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.bot_r_c_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "path" and neighbors[2].type == "path" and neighbors[3].type == "wall" and self.maze[i+1][j-1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.bot_l_c_img)
-
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "path" and self.maze[i-1][j+1].type == "path" and self.maze[i-1][j-1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.r_m_w_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "path" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i+1][j-1].type == "path" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.l_m_w_img)
-                        elif neighbors[0].type == "path" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i-1][j+1].type == "path" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.top_m_w_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "path" and neighbors[3].type == "wall" and self.maze[i-1][j-1].type == "path" and self.maze[i+1][j-1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.bot_m_w_img)
-
-                        # filled horizontal
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "path" and neighbors[3].type == "wall" and self.maze[i-1][j-1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_top_r_w_h_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "path" and neighbors[3].type == "wall" and self.maze[i+1][j-1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_top_l_w_h_img)
-                        elif neighbors[0].type == "path" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i-1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bot_r_w_h_img)
-                        elif neighbors[0].type == "path" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bot_l_w_h_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "path" and neighbors[3].type == "wall":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_top_w_h_img)
-                        elif neighbors[0].type == "path" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bot_w_h_img)
-
-                        # filled corners
-                        elif neighbors[0].type == "path" and neighbors[1].type == "path" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i+1][j+1].type == "wall":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_top_l_c_img)
-                        elif neighbors[0].type == "path" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "path" and self.maze[i-1][j+1].type == "wall":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_top_r_c_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "path" and neighbors[3].type == "path" and self.maze[i-1][j-1].type == "wall":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bot_r_c_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "path" and neighbors[2].type == "path" and neighbors[3].type == "wall" and self.maze[i+1][j-1].type == "wall":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bot_l_c_img)
-
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "path" and self.maze[i-1][j+1].type == "path" and self.maze[i-1][j-1].type == "wall":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_top_r_m_w_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "path" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i+1][j-1].type == "wall" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_top_l_m_w_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "path" and self.maze[i-1][j+1].type == "wall" and self.maze[i-1][j-1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bot_r_m_w_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "path" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i+1][j-1].type == "path" and self.maze[i+1][j+1].type == "wall":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bot_l_m_w_img)
-
-                        # surrounded by walls
-                        # no walls in the corners
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i-1][j-1].type == "path" and self.maze[i+1][j-1].type == "path" and self.maze[i-1][j+1].type == "path" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_top_l_r_bot_l_r)
-
-                        # one wall in the corner
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i-1][j-1].type == "path" and self.maze[i+1][j-1].type == "path" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_top_l_r_bot_r)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i-1][j-1].type == "path" and self.maze[i+1][j-1].type == "path" and self.maze[i-1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_top_l_r_bot_l)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i-1][j-1].type == "path" and self.maze[i-1][j+1].type == "path" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_top_l_bot_l_r)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i+1][j-1].type == "path" and self.maze[i-1][j+1].type == "path" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_top_r_bot_l_r)
-
-                        # 2 walls in the corners
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i-1][j-1].type == "path" and self.maze[i+1][j-1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_top_l_r)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i-1][j+1].type == "path" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_bot_l_r)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i-1][j-1].type == "path" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_top_l_bot_r)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i+1][j-1].type == "path" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_top_r_bot_r)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i-1][j-1].type == "path" and self.maze[i-1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_top_l_bot_l)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i-1][j+1].type == "path" and self.maze[i+1][j-1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_top_r_bot_l)
-
-                        # 3 walls in the corners
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i-1][j-1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_top_l)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i+1][j-1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_top_r)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i-1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_bot_l)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_bot_r)
-
-                        # 4 walls in the corners
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "wall":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_img)
-
-                        # filled vertical
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "path" and self.maze[i-1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_top_l_m_w_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "path" and self.maze[i-1][j-1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bot_l_m_w_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "path" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i+1][j+1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_top_r_m_w_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "path" and neighbors[2].type == "wall" and neighbors[3].type == "wall" and self.maze[i+1][j-1].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bot_r_m_w_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "wall" and neighbors[2].type == "wall" and neighbors[3].type == "path":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.l_w_img)
-                        elif neighbors[0].type == "wall" and neighbors[1].type == "path" and neighbors[2].type == "wall" and neighbors[3].type == "wall":
-                            self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.r_w_img)
-
-                        else:
-                            self.canvas.create_rectangle(x0, y0, x1, y1, fill="black")  # in case I forgot a possible case
-                    else:
-                        if cell.coord != (0, 0) and cell.coord != (self.maze_size[0] - 1, 0) and cell.coord != (0, self.maze_size[1] - 1) and cell.coord != (self.maze_size[0] - 1, self.maze_size[1] - 1):
-                            # bottom line
-                            if cell.coord[1] == self.maze_size[1] - 1 and neighbors[0].type == "wall" and self.maze[i-1][j-1].type == "wall" and self.maze[i+1][j-1].type == "wall":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bbot_w_img)
-                            elif cell.coord[1] == self.maze_size[1] - 1 and neighbors[0].type == "wall" and self.maze[i-1][j-1].type == "wall" and self.maze[i+1][j-1].type == "path":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_l_bbot_w_img)
-                            elif cell.coord[1] == self.maze_size[1] - 1 and neighbors[0].type == "wall" and self.maze[i-1][j-1].type == "path" and self.maze[i+1][j-1].type == "wall":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_r_bbot_w_img)
-                            elif cell.coord[1] == self.maze_size[1] - 1 and neighbors[0].type == "wall" and self.maze[i-1][j-1].type == "path" and self.maze[i+1][j-1].type == "path":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.bbot_m_w_img)
-                            elif cell.coord[1] == self.maze_size[1] - 1:
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.bbot_w_img)
-
-                            # top line
-                            elif cell.coord[1] == 0 and neighbors[1].type == "wall" and self.maze[i-1][j+1].type == "wall" and self.maze[i+1][j+1].type == "wall":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_img)
-                            elif cell.coord[1] == 0 and neighbors[1].type == "wall" and self.maze[i-1][j+1].type == "wall" and self.maze[i+1][j+1].type == "path":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_l_ttop_w_img)
-                            elif cell.coord[1] == 0 and neighbors[1].type == "wall" and self.maze[i-1][j+1].type == "path" and self.maze[i+1][j+1].type == "wall":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_r_ttop_w_img)
-                            elif cell.coord[1] == 0 and neighbors[1].type == "wall" and self.maze[i-1][j+1].type == "path" and self.maze[i+1][j+1].type == "path":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.ttop_m_w_img)
-                            elif cell.coord[1] == 0:
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.ttop_w_img)
-
-                            # left side
-                            elif cell.coord[0] == 0 and neighbors[2].type == "wall" and self.maze[i+1][j+1].type == "wall" and self.maze[i+1][j-1].type == "wall":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_img)
-                            elif cell.coord[0] == 0 and neighbors[2].type == "wall" and self.maze[i+1][j+1].type == "path" and self.maze[i+1][j-1].type == "wall":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_top_lleft_w_img)
-                            elif cell.coord[0] == 0 and neighbors[2].type == "wall" and self.maze[i+1][j+1].type == "wall" and self.maze[i+1][j-1].type == "path":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bot_lleft_w_img)
-                            elif cell.coord[0] == 0 and neighbors[2].type == "wall" and self.maze[i+1][j+1].type == "path" and self.maze[i+1][j-1].type == "path":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.ll_m_w_img)
-                            elif cell.coord[0] == 0:
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.ll_w_img)
-
-                            # right side
-                            elif cell.coord[0] == self.maze_size[0] - 1 and neighbors[1].type == "wall" and self.maze[i-1][j+1].type == "wall" and self.maze[i-1][j-1].type == "wall":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_img)
-                            elif cell.coord[0] == self.maze_size[0] - 1 and neighbors[1].type == "wall" and self.maze[i-1][j+1].type == "path" and self.maze[i-1][j-1].type == "wall":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_top_rright_w_img)
-                            elif cell.coord[0] == self.maze_size[0] - 1 and neighbors[1].type == "wall" and self.maze[i-1][j+1].type == "wall" and self.maze[i-1][j-1].type == "path":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bot_rright_w_img)
-                            elif cell.coord[0] == self.maze_size[0] - 1 and neighbors[1].type == "wall" and self.maze[i-1][j+1].type == "path" and self.maze[i-1][j-1].type == "path":
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.rr_m_w_img)
-                            elif cell.coord[0] == self.maze_size[0] - 1:
-                                self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.rr_w_img)
-                            else:
-                                self.canvas.create_rectangle(x0, y0, x1, y1, fill="black")
-                        else:
-                            # top left corner
-                            if cell.coord == (0, 0):
-                                if self.maze[i+1][j+1].type == "wall":
-                                    self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_img)
-                                else:
-                                    self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.tt_ll_c_img)
-                            # bottom left corner
-                            elif cell.coord == (0, self.maze_size[0] - 1):
-                                if self.maze[i+1][j-1].type == "wall":
-                                    self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bbot_w_img)
-                                else:
-                                    self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.bb_ll_c_img)
-                            # top right corner
-                            elif cell.coord == (self.maze_size[1] - 1, 0):
-                                if self.maze[i-1][j+1].type == "wall":
-                                    self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.w_img)
-                                else:
-                                    self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.tt_rr_c_img)
-                            # bottom right corner
-                            elif cell.coord == (self.maze_size[0] - 1, self.maze_size[1] - 1):
-                                if self.maze[i-1][j-1].type == "wall":
-                                    self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.f_bbot_w_img)
-                                else:
-                                    self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.bb_rr_c_img)
+        """Draws the maze on the canvas. The walls and paths never change, so their tiles are composited off-screen in a
+        few big images (see MazeTiles.background_chunks) instead of being a canvas item per cell. In the viewport, the
+        chunks are only materialized around the camera, see update_chunks."""
+        self.maze_imgs = []
+        if self.viewport:
+            self.maze_tiles = tile_ids(self.maze)  # computed once, the chunks are composited as the camera moves
+            self.chunks = {}
+            self.free_chunks = []
+            return
+
+        for x, y, chunk in background_chunks(self.maze, self.cell_size):
+            image = ImageTk.PhotoImage(chunk)
+            self.canvas.create_image(x, y, anchor=tk.NW, image=image)
+            self.maze_imgs.append(image)  # keep a reference to the image, the canvas doesn't
+
+    def follow_player(self, x=None, y=None):
+        """Moves the camera of the viewport to center it on the player, without going out of the maze.
 
-                else:
-                    self.canvas.create_image(x0, y0, anchor=tk.NW, image=self.p_img)
+        Args:
+            x (float): The x-coordinate of the player's image on the canvas, its current position if None
+            y (float): The y-coordinate of the player's image on the canvas, its current position if None
+        """
+        if not self.viewport:
+            return
+        if x is None:
+            x, y = self.canvas.coords(self.player_char)
+
+        view_w, view_h = self.view_size
+        maze_w, maze_h = self.maze_size[0] * self.cell_size, self.maze_size[1] * self.cell_size
+        left = max(min(int(x + self.player_w/2 - view_w/2), maze_w - view_w), 0)
+        top = max(min(int(y + self.player_h/2 - view_h/2), maze_h - view_h), 0)
+        if (left, top) == self.camera and self.chunks:
+            return
+
+        self.camera = (left, top)
+        self.canvas.xview_moveto(left / maze_w)
+        self.canvas.yview_moveto(top / maze_h)
+        self.canvas.coords(self.life_display, left, top + view_h)  # the hud stays in the corner of the window
+        self.update_chunks()
+
+    def update_chunks(self):
+        """Materializes the chunks of the maze background seen by the camera and the VIEW_MARGIN chunks around it, and
+        hides the other ones. Their canvas items are recycled for the new chunks, so that the number of canvas items
+        and images only depends on the size of the viewport, not on the size of the maze."""
+        chunk_size = VIEW_CHUNK_CELLS * self.cell_size
+        left, top = self.camera
+        last_x, last_y = (self.maze_size[0] - 1) // VIEW_CHUNK_CELLS, (self.maze_size[1] - 1) // VIEW_CHUNK_CELLS
+        visible = {(chunk_x, chunk_y)
+                   for chunk_x in range(max(left // chunk_size - VIEW_MARGIN, 0), min((left + self.view_size[0] - 1) // chunk_size + VIEW_MARGIN, last_x) + 1)
+                   for chunk_y in range(max(top // chunk_size - VIEW_MARGIN, 0), min((top + self.view_size[1] - 1) // chunk_size + VIEW_MARGIN, last_y) + 1)}
+
+        for chunk in list(self.chunks):
+            if chunk not in visible:
+                item, _ = self.chunks.pop(chunk)
+                self.canvas.itemconfig(item, image='', state='hidden')
+                self.free_chunks.append(item)
+
+        for chunk in visible - self.chunks.keys():
+            x, y = chunk[0] * VIEW_CHUNK_CELLS, chunk[1] * VIEW_CHUNK_CELLS
+            image = ImageTk.PhotoImage(compose_background(self.maze, self.cell_size, x, y, min(VIEW_CHUNK_CELLS, self.maze_size[0] - x),
+                                                          min(VIEW_CHUNK_CELLS, self.maze_size[1] - y), self.maze_tiles))
+            if self.free_chunks:
+                item = self.free_chunks.pop()
+                self.canvas.coords(item, x * self.cell_size, y * self.cell_size)
+                self.canvas.itemconfig(item, image=image, state='normal')
+            else:
+                item = self.canvas.create_image(x * self.cell_size, y * self.cell_size, anchor=tk.NW, image=image)
+                self.canvas.tag_lower(item)  # under the game elements
+            self.chunks[chunk] = (item, image)  # keep a reference to the image, the canvas doesn't
 
     def update_observer(self, message, *args):
         """
@@ -511,9 +337,6 @@ class MazeGUI(tk.Tk, Observer):
 
     def draw_traps(self):
         """Draws the traps on the canvas."""
-        # create a list associating a number to a trap's sprite and the number of frames on the trap's sprite
-        self.traps_imgs = {1: (self.bear_trap_sprite, 4), 2: (self.fire_trap_sprite, 14), 3: (self.spike_trap_sprite, 14)}  # associate a number to an image and the number of frames for the animation
-
         for trap_pos, [activated, type] in self.game_state['traps'].items():
 
             sprite, frames = self.traps_imgs[type]
@@ -542,7 +365,7 @@ class MazeGUI(tk.Tk, Observer):
         life = self.game_state['life']
         self.life_image, _, _ = self.crop_images(self.life_sprite, (1, 4), (1, 4 - life), 'life')
 
-        x, y = 0, self.game_state['maze_size'][0] * self.cell_size
+        x, y = self.camera[0], self.camera[1] + self.view_size[1]
         self.life_display = self.canvas.create_image(x, y, anchor=tk.SW, image=self.life_image)
 
 
@@ -580,6 +403,7 @@ class MazeGUI(tk.Tk, Observer):
                     move_step_y = y - ((step/4) - 1)*self.cell_size
 
             self.canvas.moveto(self.player_char, move_step_x, move_step_y)
+            self.follow_player(move_step_x, move_step_y)
 
             # Recursively call to animate next frame
             self.after(40, self.update_player, player_direction, step + 1)
@@ -592,6 +416,7 @@ class MazeGUI(tk.Tk, Observer):
             x, y = self.game_state['player_position'][0] * self.cell_size + 1.5 * (self.cell_size / 2 - self.player_w / 2), \
                    self.game_state['player_position'][1] * self.cell_size + 1.5 * (self.cell_size / 2 - self.player_h / 1.7)
             self.canvas.moveto(self.player_char, x, y)
+            self.follow_player(x, y)
 
     def update_monster(self, monster_direction, step=0):
         """ Animate and move the monster's image similar to the player's method
@@ -707,9 +532,9 @@ class MazeGUI(tk.Tk, Observer):
         window_width = int(0.35 * self.screen_width)
         window_height = int(0.4 * self.screen_height)
 
-        # get left and top dimension of the end menu
-        background_x1 = int(middle - window_width/2)  # left
-        background_y1 = int(middle - window_height/2)  # top
+        # get left and top dimension of the end menu, in the middle of the displayed part of the maze
+        background_x1 = int(self.camera[0] + middle - window_width/2)  # left
+        background_y1 = int(self.camera[1] + middle - window_height/2)  # top
 
         # Rectangle as background for text and image
         rect_x1 = int(background_x1 + window_width * 0.2)  # left
@@ -720,50 +545,50 @@ class MazeGUI(tk.Tk, Observer):
 
         if not win:
             # game over text
-            game_over_base_img = Image.open("./data/menus/gameover.png").convert("RGBA")
+            game_over_base_img = assets.image("./data/menus/gameover.png")
             game_over_img_w, game_over_img_h = game_over_base_img.size
-            self.game_over_img = ImageTk.PhotoImage(game_over_base_img.resize((int(window_width * 0.6), int(window_width * 0.6 * game_over_img_h / game_over_img_w))))
+            self.game_over_img = ImageTk.PhotoImage(assets.resized("./data/menus/gameover.png", (int(window_width * 0.6), int(window_width * 0.6 * game_over_img_h / game_over_img_w))))
             self.canvas.create_image(int(background_x1 + 0.5*window_width), int(background_y1 + 0.35*window_height), image=self.game_over_img)
 
             # Retry button
-            retry_base_img = Image.open("./data/menus/retry_button.png").convert("RGBA")
+            retry_base_img = assets.image("./data/menus/retry_button.png")
             retry_base_img_w, retry_base_img_h = retry_base_img.size
-            self.retry_img = ImageTk.PhotoImage(retry_base_img.resize((int(window_width * 0.35), int(window_width * 0.35 * retry_base_img_h / retry_base_img_w))))
+            self.retry_img = ImageTk.PhotoImage(assets.resized("./data/menus/retry_button.png", (int(window_width * 0.35), int(window_width * 0.35 * retry_base_img_h / retry_base_img_w))))
 
             retry_btn = self.canvas.create_image(background_x1 + window_width*0.75, background_y1 + window_height*0.8, image=self.retry_img)
             # to change size when the button is hovered
-            self.canvas.tag_bind(retry_btn, "<Enter>", lambda e: self.on_hover(retry_btn, window_width, retry_base_img, retry_base_img_w, retry_base_img_h))
+            self.canvas.tag_bind(retry_btn, "<Enter>", lambda e: self.on_hover(retry_btn, window_width, "./data/menus/retry_button.png", retry_base_img_w, retry_base_img_h))
             self.canvas.tag_bind(retry_btn, "<Leave>", lambda e: self.on_leave(retry_btn, self.retry_img))
 
             self.canvas.tag_bind(retry_btn, "<Button-1>", lambda e: self.set_clicked_button("retry"))
 
         else:
             # win text
-            win_base_img = Image.open("./data/menus/win.png").convert("RGBA")
+            win_base_img = assets.image("./data/menus/win.png")
             win_img_w, win_img_h = win_base_img.size
-            self.win_img = ImageTk.PhotoImage(win_base_img.resize((int(window_width * 0.6), int(window_width * 0.6 * win_img_h / win_img_w))))
+            self.win_img = ImageTk.PhotoImage(assets.resized("./data/menus/win.png", (int(window_width * 0.6), int(window_width * 0.6 * win_img_h / win_img_w))))
 
             self.canvas.create_image(int(background_x1 + 0.5 * window_width), int(background_y1 + 0.35 * window_height), image=self.win_img)
 
             # Next level button
-            next_level_base_img = Image.open("./data/menus/nextlevel_button.png").convert("RGBA")
+            next_level_base_img = assets.image("./data/menus/nextlevel_button.png")
             next_level_base_img_w, next_level_base_img_h = next_level_base_img.size
-            self.next_level_img = ImageTk.PhotoImage(next_level_base_img.resize((int(window_width * 0.35), int(window_width * 0.35 * next_level_base_img_h / next_level_base_img_w))))
+            self.next_level_img = ImageTk.PhotoImage(assets.resized("./data/menus/nextlevel_button.png", (int(window_width * 0.35), int(window_width * 0.35 * next_level_base_img_h / next_level_base_img_w))))
 
             next_level_btn = self.canvas.create_image(background_x1 + window_width * 0.75, background_y1 + window_height * 0.8, image=self.next_level_img)
             # to change size when the button is hovered
-            self.canvas.tag_bind(next_level_btn, "<Enter>", lambda e: self.on_hover(next_level_btn, window_width, next_level_base_img, next_level_base_img_w, next_level_base_img_h))
+            self.canvas.tag_bind(next_level_btn, "<Enter>", lambda e: self.on_hover(next_level_btn, window_width, "./data/menus/nextlevel_button.png", next_level_base_img_w, next_level_base_img_h))
             self.canvas.tag_bind(next_level_btn, "<Leave>", lambda e: self.on_leave(next_level_btn, self.next_level_img))
 
             self.canvas.tag_bind(next_level_btn, "<Button-1>", lambda e: self.set_clicked_button("nextlvl"))
 
         # Home button
-        home_base_img = Image.open("./data/menus/home_button.png").convert("RGBA")
+        home_base_img = assets.image("./data/menus/home_button.png")
         home_base_img_w, home_base_img_h = home_base_img.size
-        self.home_img = ImageTk.PhotoImage(home_base_img.resize((int(window_width * 0.35), int(window_width * 0.35 * home_base_img_h / home_base_img_w))))
+        self.home_img = ImageTk.PhotoImage(assets.resized("./data/menus/home_button.png", (int(window_width * 0.35), int(window_width * 0.35 * home_base_img_h / home_base_img_w))))
         home_btn = self.canvas.create_image(background_x1 + window_width*0.25, background_y1 + window_height*0.8, image=self.home_img)
         # to change size when the button is hovered
-        self.canvas.tag_bind(home_btn, "<Enter>", lambda e: self.on_hover(home_btn, window_width, home_base_img, home_base_img_w, home_base_img_h))
+        self.canvas.tag_bind(home_btn, "<Enter>", lambda e: self.on_hover(home_btn, window_width, "./data/menus/home_button.png", home_base_img_w, home_base_img_h))
         self.canvas.tag_bind(home_btn, "<Leave>", lambda e: self.on_leave(home_btn, self.home_img))
 
         self.canvas.tag_bind(home_btn, "<Button-1>", lambda e: self.set_clicked_button("home"))
@@ -775,19 +600,19 @@ class MazeGUI(tk.Tk, Observer):
         self.canvas.create_text(background_x1 + window_width*0.62, background_y1 + window_height*0.65, text=f"Time: {round(self.game_state['score'])}s",
                                   font=("Arial", font_size), fill="white")
 
-    def on_hover(self, button, window_width, base_image, w, h):
+    def on_hover(self, button, window_width, image_path, w, h):
         """ Resizes the button image when hovered
 
         Args:
             button (int): Canvas tag for the button being interacted with
             window_width (int): Width of the window to calculate resizing
-            base_image (Image): Image to be resized
+            image_path (str): Path of the image to be resized, see AssetCache
             w (int): Original width of the image. Needed to keep proportions
             h (int): Original height of the image. Needed to keep proportions
         """
         new_width = int(0.35 * window_width * 1.05)
         new_height = int(0.35 * window_width / w * h * 1.05)
-        self.new_img = ImageTk.PhotoImage(base_image.resize((new_width, new_height)))  # self because the canvas.itemconfig function needs it
+        self.new_img = ImageTk.PhotoImage(assets.resized(image_path, (new_width, new_height)))  # self because the canvas.itemconfig function needs it
         self.canvas.itemconfig(button, image=self.new_img)
 
     def on_leave(self, button, image):
@@ -850,16 +675,24 @@ class MainMenu(tk.Tk):
         quit_img_h (int): The height of the original "Quit" button image. Used to keep proportionality
         quit_img (ImageTk.PhotoImage): The resized "Quit" button image. Needed for the canvas
         quit_btn (int): The canvas ID of the "Quit" button. Needed for the canvas
+
+        slot (int): The selected save slot, loaded by "Continue" and saved to by "New Game"
+        slots_info (dict): The information of every saved slot, read from the index of the slots (see SaveSlots)
+        slot_imgs (list): The thumbnails of the slots. Needed for the canvas
     """
 
-    __slots__ = ["window_width", "window_height", "clicked_button", "canvas",
+    __slots__ = ["window_width", "window_height", "clicked_button", "canvas", "slot", "slots_info", "slot_imgs",
                  "background_base_img", "background_img_w", "background_img_h", "background_img", "background",
                  "title_base_img", "title_img_w", "title_img_h", "title_img", "game_title",
                  "new_game_base_img", "new_game_img_w", "new_game_img_h", "new_game_img", "new_game_btn",
                  "continue_base_img", "continue_img_w", "continue_img_h", "continue_img", "continue_btn",
                  "quit_base_img", "quit_img_w", "quit_img_h", "quit_img", "quit_btn"]
-    def __init__(self):
-        """Initialize the MazeGameMenu class, setting up the main window and elements."""
+    def __init__(self, slot=LEGACY_SLOT):
+        """Initialize the MazeGameMenu class, setting up the main window and elements.
+
+        Args:
+            slot (int): The save slot selected when the menu opens
+        """
         super().__init__()
 
         self.title("Daedalus Maze")
@@ -875,6 +708,11 @@ class MainMenu(tk.Tk):
 
         self.clicked_button = "Quit"  # to get the clicked button at the end
 
+        # only the small index of the slots is read, no save is opened before a slot is chosen
+        self.slot = slot
+        self.slots_info = read_index()
+        self.slot_imgs = []
+
         self.create_widgets()
 
     def create_widgets(self):
@@ -883,65 +721,125 @@ class MainMenu(tk.Tk):
         self.canvas.pack(fill="both", expand=True)
 
         # background image
-        self.background_base_img = Image.open("./data/menus/background.png")
+        self.background_base_img = assets.image("./data/menus/background.png", None)
         self.background_img_w, self.background_img_h =self.background_base_img.size  # need the size to resize while keeping proportion
 
         # to handle vertical and horizontal screens
         if int(self.window_height / self.background_img_h * self.background_img_w) < self.window_width:
-            self.background_img = ImageTk.PhotoImage(self.background_base_img.resize((self.window_width, int(self.window_width / self.background_img_w * self.background_img_h))))  # height is computed according to width to keep proportions
+            self.background_img = ImageTk.PhotoImage(assets.resized("./data/menus/background.png", (self.window_width, int(self.window_width / self.background_img_w * self.background_img_h)), None))  # height is computed according to width to keep proportions
         else:
-            self.background_img = ImageTk.PhotoImage(self.background_base_img.resize((int(self.window_height / self.background_img_h * self.background_img_w), self.window_height)))  # width is computed according to height
+            self.background_img = ImageTk.PhotoImage(assets.resized("./data/menus/background.png", (int(self.window_height / self.background_img_h * self.background_img_w), self.window_height), None))  # width is computed according to height
         self.background = self.canvas.create_image(0, 0, anchor="nw", image=self.background_img)
 
         # game title
-        self.title_base_img = Image.open("./data/menus/logo.png").convert("RGBA")   # RGBA for the alpha channel transparency
+        self.title_base_img = assets.image("./data/menus/logo.png")   # RGBA for the alpha channel transparency
         self.title_img_w, self.title_img_h = self.title_base_img.size
-        self.title_img = ImageTk.PhotoImage(self.title_base_img.resize((int(0.45 * self.window_width), int(0.45 * self.window_width / self.title_img_w * self.title_img_h))))  # height is computed according to width
+        self.title_img = ImageTk.PhotoImage(assets.resized("./data/menus/logo.png", (int(0.45 * self.window_width), int(0.45 * self.window_width / self.title_img_w * self.title_img_h))))  # height is computed according to width
         self.game_title = self.canvas.create_image(int(0.5 * self.window_width), int(0.2 * self.window_height), anchor='center', image=self.title_img)
 
 
         # buttons
         # new game button
-        self.new_game_base_img = Image.open("./data/menus/play_button.png").convert("RGBA")
+        self.new_game_base_img = assets.image("./data/menus/play_button.png")
         self.new_game_img_w, self.new_game_img_h = self.new_game_base_img.size
-        self.new_game_img = ImageTk.PhotoImage(self.new_game_base_img.resize((int(0.15 * self.window_width), int(0.15 * self.window_width / self.new_game_img_w * self.new_game_img_h))))
+        self.new_game_img = ImageTk.PhotoImage(assets.resized("./data/menus/play_button.png", (int(0.15 * self.window_width), int(0.15 * self.window_width / self.new_game_img_w * self.new_game_img_h))))
 
         self.new_game_btn = self.canvas.create_image(int(0.5 * self.window_width), int(0.5 * self.window_height), anchor='center', image=self.new_game_img)
         # to change size when the button is hovered
-        self.canvas.tag_bind(self.new_game_btn, "<Enter>", lambda e: self.on_hover(self.new_game_btn, self.new_game_base_img, self.new_game_img_w, self.new_game_img_h))
+        self.canvas.tag_bind(self.new_game_btn, "<Enter>", lambda e: self.on_hover(self.new_game_btn, "./data/menus/play_button.png", self.new_game_img_w, self.new_game_img_h))
         self.canvas.tag_bind(self.new_game_btn, "<Leave>", lambda e: self.on_leave(self.new_game_btn, self.new_game_img))
 
         self.canvas.tag_bind(self.new_game_btn, "<Button-1>", lambda e: self.set_clicked_button("New Game"))
 
         # continue button
-        self.continue_base_img = Image.open("./data/menus/continue_button.png").convert("RGBA")
+        self.continue_base_img = assets.image("./data/menus/continue_button.png")
         self.continue_img_w, self.continue_img_h = self.new_game_base_img.size
-        self.continue_img = ImageTk.PhotoImage(self.continue_base_img.resize((int(0.15 * self.window_width), int(0.15 * self.window_width / self.continue_img_w * self.continue_img_h))))
+        self.continue_img = ImageTk.PhotoImage(assets.resized("./data/menus/continue_button.png", (int(0.15 * self.window_width), int(0.15 * self.window_width / self.continue_img_w * self.continue_img_h))))
 
         self.continue_btn = self.canvas.create_image(int(0.5 * self.window_width), int(0.61 * self.window_height), anchor='center', image=self.continue_img)
         # to change size when the button is hovered
-        self.canvas.tag_bind(self.continue_btn, "<Enter>", lambda e: self.on_hover(self.continue_btn, self.continue_base_img, self.continue_img_w, self.continue_img_h))
+        self.canvas.tag_bind(self.continue_btn, "<Enter>", lambda e: self.on_hover(self.continue_btn, "./data/menus/continue_button.png", self.continue_img_w, self.continue_img_h))
         self.canvas.tag_bind(self.continue_btn, "<Leave>", lambda e: self.on_leave(self.continue_btn, self.continue_img))
 
-        self.canvas.tag_bind(self.continue_btn, "<Button-1>", lambda e: self.set_clicked_button("Continue"))
+        # an empty slot can't be continued, a new game is started in it
+        self.canvas.tag_bind(self.continue_btn, "<Button-1>", lambda e: self.set_clicked_button("Continue" if self.slot_saved(self.slot) else "New Game"))
 
         # quit button
-        self.quit_base_img = Image.open("./data/menus/quit_button.png").convert("RGBA")
+        self.quit_base_img = assets.image("./data/menus/quit_button.png")
         self.quit_img_w, self.quit_img_h = self.quit_base_img.size
-        self.quit_img = ImageTk.PhotoImage(self.quit_base_img.resize((int(0.15 * self.window_width), int(0.15 * self.window_width / self.quit_img_w * self.quit_img_h))))
+        self.quit_img = ImageTk.PhotoImage(assets.resized("./data/menus/quit_button.png", (int(0.15 * self.window_width), int(0.15 * self.window_width / self.quit_img_w * self.quit_img_h))))
         self.quit_btn = self.canvas.create_image(int(0.5 * self.window_width), int(0.72 * self.window_height), anchor='center', image=self.quit_img)
         # to change size when the button is hovered
-        self.canvas.tag_bind(self.quit_btn, "<Enter>", lambda e: self.on_hover(self.quit_btn, self.quit_base_img, self.quit_img_w, self.quit_img_h))
+        self.canvas.tag_bind(self.quit_btn, "<Enter>", lambda e: self.on_hover(self.quit_btn, "./data/menus/quit_button.png", self.quit_img_w, self.quit_img_h))
         self.canvas.tag_bind(self.quit_btn, "<Leave>", lambda e: self.on_leave(self.quit_btn, self.quit_img))
 
         self.canvas.tag_bind(self.quit_btn, "<Button-1>", lambda e: self.set_clicked_button("Quit"))
 
-    def on_hover(self, button, base_image, w, h):
+        self.draw_slots()
+
+    def slot_saved(self, slot):
+        """Check if a slot has a save, the saves of the old versions not being in the index.
+
+        Args:
+            slot (int): The slot
+
+        Returns:
+            (bool): True if the slot can be continued
+        """
+        if slot in self.slots_info:
+            return True
+        return slot == LEGACY_SLOT and (os.path.exists("./data/saves/savegame.sav") or os.path.exists("./data/saves/savegame.csv"))
+
+    def draw_slots(self):
+        """Draw the save slots on the right of the buttons, with the thumbnail and the information of every saved slot.
+        The selected slot is framed, clicking on a slot selects it."""
+        self.canvas.delete("slots")
+        self.slot_imgs = []
+
+        size = int(0.07 * self.window_width)  # size of the thumbnails
+        font_size = max(8, int(min(self.window_width, self.window_height) / 70))
+        for slot in range(1, NB_SLOTS + 1):
+            x, y = int(0.7 * self.window_width), int((0.45 + 0.14 * (slot - 1)) * self.window_height)
+            tags = ("slots", f"slot{slot}")
+            info = self.slots_info.get(slot)
+
+            if info is not None:
+                (thumbnail_w, thumbnail_h), pixels = info['thumbnail']
+                thumbnail = Image.frombytes('P', (thumbnail_w, thumbnail_h), pixels)
+                thumbnail.putpalette(THUMBNAIL_PALETTE)
+                scale = size / max(thumbnail_w, thumbnail_h)
+                self.slot_imgs.append(ImageTk.PhotoImage(thumbnail.resize((max(1, int(thumbnail_w * scale)), max(1, int(thumbnail_h * scale))), Image.NEAREST)))
+                self.canvas.create_image(x, y, anchor='center', image=self.slot_imgs[-1], tags=tags)
+
+                text = (f"Slot {slot}   Level {info['level']}   Lives {info['life']}\n"
+                        f"{info['maze_size'][0]}x{info['maze_size'][1]}   Time {round(info['score'])}s\n"
+                        f"{time.strftime('%d/%m/%Y %H:%M', time.localtime(info['timestamp']))}")
+            elif self.slot_saved(slot):
+                text = f"Slot {slot}\nSave of an older version"
+            else:
+                text = f"Slot {slot}\nEmpty"
+            self.canvas.create_text(x + size // 2 + 10, y, anchor='w', text=text, font=("Arial", font_size), fill="white", tags=tags)
+
+            if slot == self.slot:
+                self.canvas.create_rectangle(x - size // 2 - 6, y - size // 2 - 6, x + size // 2 + 22 * font_size, y + size // 2 + 6,
+                                             outline="gold", width=3, tags=tags)
+            self.canvas.tag_bind(f"slot{slot}", "<Button-1>", lambda e, slot=slot: self.select_slot(slot))
+
+    def select_slot(self, slot):
+        """ Select a save slot
+
+        Args:
+            slot (int): The clicked slot
+        """
+        self.slot = slot
+        self.draw_slots()
+
+    def on_hover(self, button, image_path, w, h):
         """ Resizes the button image when hovered
 
         Args:
             button (int): Canvas tag for the button being interacted with
-            base_image (Image): Image to be resized
+            image_path (str): Path of the image to be resized, see AssetCache
             w (int): Original width of the image. Needed to keep proportions
             h (int): Original height of the image. Needed to keep proportions
         """
@@ -950,7 +848,7 @@ class MainMenu(tk.Tk):
         new_height = int(0.15 * self.window_width / w * h * 1.05)
 
         # change image
-        self.new_img = ImageTk.PhotoImage(base_image.resize((new_width, new_height)))  # self because the canvas.itemconfig function needs it
+        self.new_img = ImageTk.PhotoImage(assets.resized(image_path, (new_width, new_height)))  # self because the canvas.itemconfig function needs it
         self.canvas.itemconfig(button, image=self.new_img)
 
     def on_leave(self, button, image):
@@ -969,38 +867,39 @@ class MainMenu(tk.Tk):
 
         # to handle vertical and horizontal screens
         if int(self.window_height / self.background_img_h * self.background_img_w) < self.window_width:
-            self.background_img = ImageTk.PhotoImage(self.background_base_img.resize((self.window_width,
-                                                                                      int(self.window_width / self.background_img_w * self.background_img_h))))  # height is computed according to width to keep proportions
+            self.background_img = ImageTk.PhotoImage(assets.resized("./data/menus/background.png", (self.window_width,
+                                                                                      int(self.window_width / self.background_img_w * self.background_img_h)), None))  # height is computed according to width to keep proportions
         else:
-            self.background_img = ImageTk.PhotoImage(self.background_base_img.resize((
+            self.background_img = ImageTk.PhotoImage(assets.resized("./data/menus/background.png", (
                                                                                      int(self.window_height / self.background_img_h * self.background_img_w),
-                                                                                     self.window_height)))  # width is computed according to height
+                                                                                     self.window_height), None))  # width is computed according to height
         self.canvas.itemconfig(self.background, image=self.background_img)
 
         # Resize and move title
-        self.title_img = ImageTk.PhotoImage(self.title_base_img.resize((int(0.45 * self.window_width), int(0.45 * self.window_width / self.title_img_w * self.title_img_h))))
+        self.title_img = ImageTk.PhotoImage(assets.resized("./data/menus/logo.png", (int(0.45 * self.window_width), int(0.45 * self.window_width / self.title_img_w * self.title_img_h))))
         self.canvas.itemconfig(self.game_title, image=self.title_img)
         self.canvas.coords(self.game_title, int(0.5 * self.window_width), int(0.2 * self.window_height))
 
         # Resize and move buttons
         # new game button
-        self.new_game_img = ImageTk.PhotoImage(self.new_game_base_img.resize(
+        self.new_game_img = ImageTk.PhotoImage(assets.resized("./data/menus/play_button.png", 
             (int(0.15 * self.window_width), int(0.15 * self.window_width / self.new_game_img_w * self.new_game_img_h))))
         self.canvas.itemconfig(self.new_game_btn, image=self.new_game_img)
         self.canvas.coords(self.new_game_btn, int(0.5 * self.window_width), int(0.5 * self.window_height))
 
         # continue button
-        self.continue_img = ImageTk.PhotoImage(self.continue_base_img.resize(
+        self.continue_img = ImageTk.PhotoImage(assets.resized("./data/menus/continue_button.png", 
             (int(0.15 * self.window_width), int(0.15 * self.window_width / self.continue_img_w * self.continue_img_h))))
         self.canvas.itemconfig(self.continue_btn, image=self.continue_img)
         self.canvas.coords(self.continue_btn, int(0.5 * self.window_width), int(0.6 * self.window_height))
 
         # quit button
-        self.quit_img = ImageTk.PhotoImage(self.quit_base_img.resize(
+        self.quit_img = ImageTk.PhotoImage(assets.resized("./data/menus/quit_button.png", 
             (int(0.15 * self.window_width), int(0.15 * self.window_width / self.quit_img_w * self.quit_img_h))))
         self.canvas.itemconfig(self.quit_btn, image=self.quit_img)
         self.canvas.coords(self.quit_btn, int(0.5 * self.window_width), int(0.7 * self.window_height))
 
+        self.draw_slots()
 
 
     def set_clicked_button(self, button_name):
@@ -0,0 +1,448 @@
+import random  # needed to generate the mazes
+import time  # needed to benchmark the generators
+import mmap  # to open streamed mazes without reading them
+import argparse  # for the command line
+
+from GameFiles.MazeGrid import MazeGrid, WALL, PATH, UNCHECKED
+
+
+def prim(maze_size, rng=random):
+    """Generate a maze with the randomized Prim's MST algorithm working directly on the cells of the grid.
+
+    Args:
+        maze_size (tuple): Dimensions of the maze (width, height)
+        rng (random.Random): The random number generator to use
+
+    Returns:
+        grid (MazeGrid): The generated maze
+    """
+    width, height = maze_size
+    grid = MazeGrid(maze_size, UNCHECKED)
+    cells = grid.cells
+
+    # choose a random cell from which the algorithm will start and set the cells around it to walls
+    start = rng.randint(1, width - 2) * height + rng.randint(1, height - 2)
+    cells[start] = PATH
+    walls = [start - height, start + height, start - 1, start + 1]
+    for wall in walls:
+        cells[wall] = WALL
+
+    # while there are walls still not checked
+    while walls:
+        # select a random wall, swapping it with the last one so that it is removed in O(1)
+        ind = rng.randrange(len(walls))
+        walls[ind], walls[-1] = walls[-1], walls[ind]
+        wall = walls.pop()
+        x, y = divmod(wall, height)
+
+        # the wall can be carved if it separates an unchecked cell from a path on the x or y axis
+        carve = False
+        if 0 < x < width - 1:
+            carve = {cells[wall - height], cells[wall + height]} == {UNCHECKED, PATH}
+        if not carve and 0 < y < height - 1:
+            carve = {cells[wall - 1], cells[wall + 1]} == {UNCHECKED, PATH}
+
+        # if the wall has less than 2 neighbouring paths, it becomes a path and its unchecked neighbours become walls
+        if carve:
+            neighbors = (wall - height, wall + height, wall - 1, wall + 1)
+            if sum(cells[neighbor] == PATH for neighbor in neighbors) < 2:
+                cells[wall] = PATH
+                for neighbor in neighbors:
+                    if cells[neighbor] == UNCHECKED:
+                        cells[neighbor] = WALL
+                        walls.append(neighbor)
+
+    # to remove the remaining unchecked cells, we convert them to walls
+    grid.replace(UNCHECKED, WALL)
+    return grid
+
+
+def lattice(maze_size):
+    """Create a grid full of walls where the cells of odd coordinates are paths. Used by the generators carving
+    passages between these cells.
+
+    Cells of the lattice are numbered column by column: the lattice cell c is at the coordinates
+    (2 * (c // rows) + 1, 2 * (c % rows) + 1) of the grid.
+
+    Args:
+        maze_size (tuple): Dimensions of the maze (width, height)
+
+    Returns:
+        grid (MazeGrid): The grid with the lattice cells set to paths
+        cols (int): Number of lattice cells on the x axis
+        rows (int): Number of lattice cells on the y axis
+    """
+    grid = MazeGrid(maze_size, WALL)
+    cols, rows = (maze_size[0] - 1) // 2, (maze_size[1] - 1) // 2
+    for c in range(cols * rows):
+        grid.cells[lattice_to_grid(c, rows, maze_size[1])] = PATH
+    return grid, cols, rows
+
+
+def lattice_to_grid(c, rows, height):
+    """Get the index in the grid of the lattice cell c."""
+    return (2 * (c // rows) + 1) * height + 2 * (c % rows) + 1
+
+
+def lattice_neighbors(c, cols, rows):
+    """Get the lattice cells next to the lattice cell c."""
+    i, j = divmod(c, rows)
+    neighbors = []
+    if j > 0:
+        neighbors.append(c - 1)
+    if i > 0:
+        neighbors.append(c - rows)
+    if j < rows - 1:
+        neighbors.append(c + 1)
+    if i < cols - 1:
+        neighbors.append(c + rows)
+    return neighbors
+
+
+def carve(grid, rows, a, b):
+    """Carve the wall between the two neighbouring lattice cells a and b."""
+    height = grid.maze_size[1]
+    grid.cells[(lattice_to_grid(a, rows, height) + lattice_to_grid(b, rows, height)) // 2] = PATH
+
+
+def kruskal(maze_size, rng=random):
+    """Generate a maze with the randomized Kruskal's algorithm using a union-find of the lattice cells.
+
+    Args:
+        maze_size (tuple): Dimensions of the maze (width, height)
+        rng (random.Random): The random number generator to use
+
+    Returns:
+        grid (MazeGrid): The generated maze
+    """
+    grid, cols, rows = lattice(maze_size)
+    nb_cells = cols * rows
+
+    # every wall between two lattice cells, in a random order
+    edges = [(c, c + rows) for c in range(nb_cells - rows)] + [(c, c + 1) for c in range(nb_cells) if c % rows != rows - 1]
+    rng.shuffle(edges)
+
+    parent = list(range(nb_cells))
+    set_size = [1] * nb_cells
+
+    def find(c):
+        # path halving keeps the trees flat
+        while parent[c] != c:
+            parent[c] = parent[parent[c]]
+            c = parent[c]
+        return c
+
+    for a, b in edges:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            # union by size
+            if set_size[root_a] < set_size[root_b]:
+                root_a, root_b = root_b, root_a
+            parent[root_b] = root_a
+            set_size[root_a] += set_size[root_b]
+            carve(grid, rows, a, b)
+
+    return grid
+
+
+def recursive_backtracker(maze_size, rng=random):
+    """Generate a maze with the recursive backtracker (randomized depth-first search), using an explicit stack.
+
+    Args:
+        maze_size (tuple): Dimensions of the maze (width, height)
+        rng (random.Random): The random number generator to use
+
+    Returns:
+        grid (MazeGrid): The generated maze
+    """
+    grid, cols, rows = lattice(maze_size)
+    visited = bytearray(cols * rows)
+
+    start = rng.randrange(cols * rows)
+    visited[start] = 1
+    stack = [start]
+    while stack:
+        c = stack[-1]
+        options = [neighbor for neighbor in lattice_neighbors(c, cols, rows) if not visited[neighbor]]
+        if options:
+            neighbor = rng.choice(options)
+            visited[neighbor] = 1
+            carve(grid, rows, c, neighbor)
+            stack.append(neighbor)
+        else:
+            stack.pop()  # dead end, go back
+
+    return grid
+
+
+def wilson(maze_size, rng=random):
+    """Generate a maze with Wilson's algorithm (loop-erased random walks), giving a uniform spanning tree.
+
+    Args:
+        maze_size (tuple): Dimensions of the maze (width, height)
+        rng (random.Random): The random number generator to use
+
+    Returns:
+        grid (MazeGrid): The generated maze
+    """
+    grid, cols, rows = lattice(maze_size)
+    nb_cells = cols * rows
+    in_tree = bytearray(nb_cells)
+    in_tree[rng.randrange(nb_cells)] = 1
+    next_cell = [0] * nb_cells
+
+    for start in range(nb_cells):
+        # random walk until the tree is reached, overwriting the direction taken erases the loops
+        c = start
+        while not in_tree[c]:
+            next_cell[c] = rng.choice(lattice_neighbors(c, cols, rows))
+            c = next_cell[c]
+
+        # add the loop-erased walk to the tree
+        c = start
+        while not in_tree[c]:
+            in_tree[c] = 1
+            carve(grid, rows, c, next_cell[c])
+            c = next_cell[c]
+
+    return grid
+
+
+def sidewinder(maze_size, rng=random):
+    """Generate a maze with the sidewinder algorithm, one row at a time.
+
+    Args:
+        maze_size (tuple): Dimensions of the maze (width, height)
+        rng (random.Random): The random number generator to use
+
+    Returns:
+        grid (MazeGrid): The generated maze
+    """
+    grid, cols, rows = lattice(maze_size)
+
+    for j in range(rows):
+        run_start = 0
+        for i in range(cols):
+            c = i * rows + j
+            # the first row is a single corridor, the other ones carve east until the run is closed
+            if i < cols - 1 and (j == 0 or rng.random() < 0.5):
+                carve(grid, rows, c, c + rows)
+            else:
+                if j > 0:
+                    # close the run by carving up from one of its cells
+                    k = rng.randint(run_start, i) * rows + j
+                    carve(grid, rows, k, k - 1)
+                run_start = i + 1
+
+    return grid
+
+
+def binary_tree(maze_size, rng=random):
+    """Generate a maze with the binary tree algorithm: every cell carves up or left.
+
+    Args:
+        maze_size (tuple): Dimensions of the maze (width, height)
+        rng (random.Random): The random number generator to use
+
+    Returns:
+        grid (MazeGrid): The generated maze
+    """
+    grid, cols, rows = lattice(maze_size)
+
+    for c in range(cols * rows):
+        i, j = divmod(c, rows)
+        options = []
+        if j > 0:
+            options.append(c - 1)
+        if i > 0:
+            options.append(c - rows)
+        if options:
+            carve(grid, rows, c, rng.choice(options))
+
+    return grid
+
+
+def eller_columns(maze_size, rng=random):
+    """Generate a maze with Eller's algorithm, streaming it one column of the grid at a time.
+
+    Only the sets of the lattice cells of the current column are kept in memory, so the memory used is proportional to
+    the height of the maze whatever its width. The columns are yielded in the order they are stored in a MazeGrid, so
+    they can be written directly into a file or a memory-mapped grid.
+
+    Args:
+        maze_size (tuple): Dimensions of the maze (width, height)
+        rng (random.Random): The random number generator to use
+
+    Yields:
+        column (bytes): The cell codes of the next column of the grid, from x = 0 to x = width - 1
+    """
+    width, height = maze_size
+    cols, rows = (width - 1) // 2, (height - 1) // 2
+    wall_column = bytes([WALL]) * height
+
+    if cols == 0 or rows == 0:
+        for x in range(width):
+            yield wall_column
+        return
+
+    yield wall_column
+
+    next_set = 0
+    line_sets = [None] * rows  # set of each cell of the current column, None if not connected to the previous column
+    for i in range(cols):
+        last = i == cols - 1
+
+        # cells not connected to the previous column start in their own set
+        members = {}
+        for j in range(rows):
+            if line_sets[j] is None:
+                line_sets[j] = next_set
+                next_set += 1
+            members.setdefault(line_sets[j], []).append(j)
+
+        column = bytearray(wall_column)
+        for j in range(rows):
+            column[2 * j + 1] = PATH
+
+        # randomly join neighbouring cells of different sets, all of them on the last column so that the maze is connected
+        for j in range(rows - 1):
+            kept, merged = line_sets[j], line_sets[j + 1]
+            if kept != merged and (last or rng.random() < 0.5):
+                column[2 * j + 2] = PATH
+                # relabel the smallest set
+                if len(members[kept]) < len(members[merged]):
+                    kept, merged = merged, kept
+                for k in members[merged]:
+                    line_sets[k] = kept
+                members[kept].extend(members.pop(merged))
+        yield bytes(column)
+
+        if not last:
+            # carve towards the next column, at least once per set so that no set is left behind
+            passages = bytearray(wall_column)
+            next_sets = [None] * rows
+            for set_id, set_cells in members.items():
+                carved = [j for j in set_cells if rng.random() < 0.5] or [rng.choice(set_cells)]
+                for j in carved:
+                    passages[2 * j + 1] = PATH
+                    next_sets[j] = set_id
+            yield bytes(passages)
+            line_sets = next_sets
+
+    # walls after the last column of the lattice
+    for x in range(2 * cols, width):
+        yield wall_column
+
+
+def eller(maze_size, rng=random):
+    """Generate a maze with Eller's algorithm, see eller_columns.
+
+    Args:
+        maze_size (tuple): Dimensions of the maze (width, height)
+        rng (random.Random): The random number generator to use
+
+    Returns:
+        grid (MazeGrid): The generated maze
+    """
+    cells = bytearray()
+    for column in eller_columns(maze_size, rng):
+        cells += column
+    return MazeGrid(maze_size, cells=cells)
+
+
+def stream_maze(file, maze_size, rng=random):
+    """Generate a maze with Eller's algorithm and write it column by column into a binary file, without ever holding
+    the whole maze in memory. The file then holds the cells of a MazeGrid, see open_streamed_maze.
+
+    Args:
+        file: A binary file object or a mmap.mmap object opened for writing
+        maze_size (tuple): Dimensions of the maze (width, height)
+        rng (random.Random): The random number generator to use
+
+    Returns:
+        written (int): The number of bytes written
+    """
+    written = 0
+    for column in eller_columns(maze_size, rng):
+        file.write(column)
+        written += len(column)
+    return written
+
+
+def open_streamed_maze(filename, maze_size):
+    """Open a maze written by stream_maze as a MazeGrid backed by a memory-mapped copy-on-write view of the file, so
+    that the cells are only read from the disk when they are used.
+
+    Args:
+        filename (str): The file written by stream_maze
+        maze_size (tuple): Dimensions of the maze (width, height)
+
+    Returns:
+        grid (MazeGrid): The maze, its changes are not written back to the file
+    """
+    with open(filename, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), maze_size[0] * maze_size[1], access=mmap.ACCESS_COPY)
+    return MazeGrid(maze_size, cells=memoryview(mapped))  # the cells are read from the file when they are accessed
+
+
+# registry of the maze generators, all of them return a MazeGrid of walls and paths surrounded by walls
+GENERATORS = {
+    'prim': prim,
+    'kruskal': kruskal,
+    'backtracker': recursive_backtracker,
+    'wilson': wilson,
+    'sidewinder': sidewinder,
+    'binary_tree': binary_tree,
+    'eller': eller,
+}
+
+
+def generate(maze_size, algorithm='prim', rng=random):
+    """Generate a maze with one of the registered generators.
+
+    Args:
+        maze_size (tuple): Dimensions of the maze (width, height)
+        algorithm (str): Name of the generator in GENERATORS
+        rng (random.Random): The random number generator to use
+
+    Returns:
+        grid (MazeGrid): The generated maze
+    """
+    if algorithm not in GENERATORS:
+        raise ValueError(f"Unknown maze generator '{algorithm}', choose one of {', '.join(GENERATORS)}")
+    return GENERATORS[algorithm](maze_size, rng)
+
+
+def benchmark(sizes=(51, 101, 201, 301), repeat=3):
+    """Print the best time taken by every generator to generate mazes of different sizes.
+
+    Args:
+        sizes (tuple): Width and height of the benchmarked mazes
+        repeat (int): Number of mazes generated per generator and size, the best time is kept
+    """
+    for size in sizes:
+        print(f'{size}x{size}')
+        for name, generator in GENERATORS.items():
+            best = float('inf')
+            for seed in range(repeat):
+                rng = random.Random(seed)
+                start = time.perf_counter()
+                generator((size, size), rng)
+                best = min(best, time.perf_counter() - start)
+            print(f'    {name:<12} {best * 1000:8.1f} ms')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the maze generators or stream a very large maze into a file.")
+    parser.add_argument('--stream', metavar='FILE', help="generate a maze with Eller's algorithm and write it into FILE")
+    parser.add_argument('--size', type=int, nargs=2, default=(10001, 10001), metavar=('WIDTH', 'HEIGHT'), help="size of the streamed maze")
+    parser.add_argument('--seed', type=int, default=None, help="seed of the streamed maze")
+    args = parser.parse_args()
+
+    if args.stream:
+        start = time.perf_counter()
+        with open(args.stream, 'wb') as file:
+            written = stream_maze(file, tuple(args.size), random.Random(args.seed))
+        print(f'{args.size[0]}x{args.size[1]} maze written to {args.stream} ({written / 1e6:.1f} MB) in {time.perf_counter() - start:.1f} s')
+    else:
+        benchmark()
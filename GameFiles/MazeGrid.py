@@ -0,0 +1,366 @@
+from array import array  # compact arrays of integers for the adjacency index
+import zlib  # to check the cells mapped from a save
+
+# cell codes stored in the grid, one byte per cell
+WALL = 0
+PATH = 1
+UNCHECKED = 2
+
+CELL_TYPES = ('wall', 'path', 'unchecked')  # cell code -> type name, index with the code
+CELL_CODES = {name: code for code, name in enumerate(CELL_TYPES)}  # type name -> cell code
+
+# bits of the neighbor masks, a bit is set if the neighbor in that direction is a path
+TOP = 1
+LEFT = 2
+BOTTOM = 4
+RIGHT = 8
+
+# codes of the 4 neighbors (top, left, bottom, right) of a cell inside the maze, indexed by its neighbor mask
+MASK_NEIGHBOR_CODES = tuple(tuple(PATH if mask & bit else WALL for bit in (TOP, LEFT, BOTTOM, RIGHT)) for mask in range(16))
+
+
+class MazeGrid:
+    """Compact representation of the maze: one byte per cell holding a small integer code (WALL, PATH or UNCHECKED).
+
+    The cell (x, y) is stored at the index x * maze_size[1] + y so that a column of the maze is contiguous, which keeps
+    the maze[x][y] indexing used everywhere in the game. Indexing the grid like the old 2D list returns lightweight
+    MazeCell views reading and writing the grid.
+
+    The cells of a grid loaded from a big save are a memoryview of the save file mapped in memory (see SaveFormat), read
+    from the disk only when they are accessed. Indexing them works the same, the bytes methods are reached with codes.
+    Their CRC32 is checked the first time they are all needed, see verify.
+
+    Attributes:
+        maze_size (tuple): Dimensions of the maze (width, height)
+        cells (bytearray): The cell codes of the maze, flattened column by column, or a memoryview of them
+        version (int): Incremented every time a cell is changed with set or replace, to invalidate the adjacency index
+        adjacency_index (MazeAdjacency): The adjacency index of the last version of the grid, see adjacency
+        checksum (int): The CRC32 the cells mapped from a save must have, None once checked or for other grids
+    """
+
+    __slots__ = ['maze_size', 'cells', 'version', 'adjacency_index', 'checksum']
+
+    def __init__(self, maze_size, fill=UNCHECKED, cells=None, checksum=None):
+        """Initialize the MazeGrid instance.
+
+        Args:
+            maze_size (tuple): Dimensions of the maze (width, height)
+            fill (int): Code of every cell when no cells are given. Defaults to UNCHECKED.
+            cells (bytearray): Already existing cell codes to wrap, flattened column by column, or a writable memoryview
+            checksum (int): The CRC32 of the cells mapped from a save, checked when they are first all needed
+        """
+        self.maze_size = tuple(maze_size)
+
+        if cells is None:
+            cells = bytearray([fill]) * (self.maze_size[0] * self.maze_size[1])
+        self.cells = cells
+
+        self.version = 0
+        self.adjacency_index = None
+        self.checksum = checksum
+
+    def index(self, x, y):
+        """Get the index of a cell in the flat cells array.
+
+        Args:
+            x (int): The x-coordinate of the cell.
+            y (int): The y-coordinate of the cell.
+
+        Returns:
+            (int): The index of the cell in the cells array
+        """
+        return x * self.maze_size[1] + y
+
+    def coord(self, index):
+        """Get the coordinates of a cell from its index in the flat cells array.
+
+        Args:
+            index (int): The index of the cell in the cells array
+
+        Returns:
+            (tuple): The (x, y) coordinates of the cell
+        """
+        return divmod(index, self.maze_size[1])
+
+    def codes(self):
+        """Get the cell codes with the methods of bytes (count, find, index, translate...).
+
+        Returns:
+            (bytearray): The cells, or a copy of them if they are mapped from a save file
+        """
+        return self.cells if isinstance(self.cells, bytearray) else bytearray(self.cells)
+
+    def verify(self):
+        """Check the cells mapped from a save file against the CRC32 of the save, only once. Not done when the save is
+        loaded so that the cells are read from the disk only when needed: the adjacency index and detach check them.
+
+        Raises:
+            ValueError: If the cells don't match the checksum of the save
+        """
+        if self.checksum is not None:
+            if zlib.crc32(self.cells) != self.checksum:
+                raise ValueError("the grid of the save is corrupted")
+            self.checksum = None
+
+    def detach(self):
+        """Copy the cells in memory if they are mapped from a save file, so that the file can be overwritten.
+
+        Raises:
+            ValueError: If the mapped cells don't match the checksum of the save, see verify
+        """
+        self.verify()
+        if not isinstance(self.cells, bytearray):
+            mapped = self.cells
+            self.cells = bytearray(mapped)
+            mapped.release()  # unmaps the file
+
+    def get(self, x, y):
+        """Get the code of a cell (WALL, PATH or UNCHECKED)."""
+        return self.cells[x * self.maze_size[1] + y]
+
+    def set(self, x, y, code):
+        """Set the code of a cell (WALL, PATH or UNCHECKED)."""
+        if self.checksum is not None:
+            self.verify()  # the cells of the save before they change
+        self.cells[x * self.maze_size[1] + y] = code
+        self.version += 1
+
+    def neighbors(self, x, y, code=None):
+        """Retrieve the coordinates of the neighbors of a cell, optionally only the ones of a certain code.
+        The neighbors are given in the same order as MazeCell.get_cell_neighbors (top, left, bottom, right).
+
+        Args:
+            x (int): The x-coordinate of the cell.
+            y (int): The y-coordinate of the cell.
+            code (int): The code of the searched neighbors, None to get every neighbor
+
+        Returns:
+            neighbors (list): The list of the coordinates of the neighbors
+        """
+        width, height = self.maze_size
+        cells = self.cells
+        neighbors = []
+        for offset in (-1, 1):
+            if 0 <= y + offset < height and (code is None or cells[x * height + y + offset] == code):
+                neighbors.append((x, y + offset))
+            if 0 <= x + offset < width and (code is None or cells[(x + offset) * height + y] == code):
+                neighbors.append((x + offset, y))
+        return neighbors
+
+    def neighbor_codes(self, x, y):
+        """Retrieve the codes of every neighbor of a cell, in the same order as MazeCell.get_cell_neighbors."""
+        height = self.maze_size[1]
+        return [self.cells[nx * height + ny] for nx, ny in self.neighbors(x, y)]
+
+    def count_neighbors(self, x, y, code):
+        """Count the neighbors of a cell having a certain code."""
+        return len(self.neighbors(x, y, code))
+
+    def replace(self, old_code, new_code):
+        """Replace every cell of a certain code by another code in place."""
+        table = bytearray(range(256))
+        table[old_code] = new_code
+        self.verify()
+        self.cells[:] = self.codes().translate(table)
+        self.version += 1
+
+    def adjacency(self):
+        """Get the adjacency index of the grid, built once and rebuilt only if the grid changed since.
+        The generators write the cells directly while generating, so the index must only be used once the maze is built.
+
+        Returns:
+            (MazeAdjacency): The adjacency index of the current version of the grid
+        """
+        if self.adjacency_index is None or self.adjacency_index.version != self.version:
+            self.verify()  # the first time every cell is read
+            self.adjacency_index = MazeAdjacency(self)
+        return self.adjacency_index
+
+    def __len__(self):
+        """Number of columns of the maze, like the old 2D list."""
+        return self.maze_size[0]
+
+    def __getitem__(self, x):
+        """Get a column of the maze so that maze[x][y] returns a MazeCell view like the old 2D list."""
+        if not 0 <= x < self.maze_size[0]:
+            raise IndexError('maze column out of range')
+        return MazeColumn(self, x)
+
+    def __iter__(self):
+        """Iterate over the columns of the maze."""
+        for x in range(self.maze_size[0]):
+            yield MazeColumn(self, x)
+
+    def __repr__(self):
+        """
+        Same representation as the old 2D list of MazeCell objects. Needed to keep the CSV save format.
+
+        Returns:
+            (string): A string of the form [[<x=0, y=0, type=wall>, ...], ...]
+        """
+        return repr([list(column) for column in self])
+
+
+class MazeAdjacency:
+    """Compressed (CSR) adjacency index of the paths of a grid: the path neighbors of the cell of index i are
+    targets[offsets[i]:offsets[i + 1]], in the order top, left, bottom, right. Every cell also gets a 4-bit mask of its
+    path neighbors (TOP, LEFT, BOTTOM and RIGHT bits).
+
+    Attributes:
+        version (int): The version of the grid the index was built from
+        offsets (array): Start of the neighbors of every cell in targets, with one more item at the end
+        targets (array): The indexes of the path neighbors of every path cell, one cell after the other
+        masks (bytearray): The neighbor mask of every cell, walls included
+    """
+
+    __slots__ = ['version', 'offsets', 'targets', 'masks']
+
+    def __init__(self, grid):
+        """Build the adjacency index of a grid.
+
+        Args:
+            grid (MazeGrid): The grid to index
+        """
+        width, height = grid.maze_size
+        cells = grid.cells
+        nb_cells = width * height
+
+        self.version = grid.version
+        self.offsets = array('i', [0]) * (nb_cells + 1)
+        self.targets = array('i')
+        self.masks = bytearray(nb_cells)
+
+        directions = ((TOP, -1), (LEFT, -height), (BOTTOM, 1), (RIGHT, height))
+        for ind in range(nb_cells):
+            x, y = divmod(ind, height)
+            mask = 0
+            if y > 0 and cells[ind - 1] == PATH:
+                mask |= TOP
+            if x > 0 and cells[ind - height] == PATH:
+                mask |= LEFT
+            if y < height - 1 and cells[ind + 1] == PATH:
+                mask |= BOTTOM
+            if x < width - 1 and cells[ind + height] == PATH:
+                mask |= RIGHT
+            self.masks[ind] = mask
+
+            # only the path cells can be walked from
+            if mask and cells[ind] == PATH:
+                for bit, step in directions:
+                    if mask & bit:
+                        self.targets.append(ind + step)
+            self.offsets[ind + 1] = len(self.targets)
+
+    def neighbors(self, ind):
+        """Get the indexes of the path neighbors of a path cell."""
+        return self.targets[self.offsets[ind]:self.offsets[ind + 1]]
+
+    def degree(self, ind):
+        """Get the number of path neighbors of a path cell."""
+        return self.offsets[ind + 1] - self.offsets[ind]
+
+
+class MazeColumn:
+    """A column of the maze grid, returned by MazeGrid[x] to keep the maze[x][y] indexing.
+
+    Attributes:
+        grid (MazeGrid): The grid the column belongs to
+        x (int): The x-coordinate of the column
+    """
+
+    __slots__ = ['grid', 'x']
+
+    def __init__(self, grid, x):
+        """Initialize the MazeColumn instance.
+
+        Args:
+            grid (MazeGrid): The grid the column belongs to
+            x (int): The x-coordinate of the column
+        """
+        self.grid = grid
+        self.x = x
+
+    def __len__(self):
+        """Number of cells in the column."""
+        return self.grid.maze_size[1]
+
+    def __getitem__(self, y):
+        """Get a MazeCell view of the cell (x, y)."""
+        if not 0 <= y < self.grid.maze_size[1]:
+            raise IndexError('maze row out of range')
+        return MazeCell(self.grid, self.x, y)
+
+
+class MazeCell:
+    """Lightweight view of a cell of the maze grid, kept for compatibility with the code reading cells as objects.
+
+    Attributes:
+        grid (MazeGrid): The grid storing the cell
+        coord (tuple): The (x, y) coordinates of the cell
+        type (str): The type of cell, which can be 'wall', 'path', or 'unchecked'. Reads and writes the grid.
+    """
+
+    __slots__ = ['grid', 'coord']
+
+    def __init__(self, grid, x, y):
+        """Initialize the MazeCell instance.
+
+        Args:
+            grid (MazeGrid): The grid storing the cell
+            x (int): The x-coordinate of the cell.
+            y (int): The y-coordinate of the cell.
+        """
+        self.grid = grid
+        self.coord = (x, y)
+
+    @property
+    def code(self):
+        """The code of the cell in the grid (WALL, PATH or UNCHECKED)."""
+        return self.grid.get(*self.coord)
+
+    @property
+    def type(self):
+        """The type name of the cell ('wall', 'path' or 'unchecked')."""
+        return CELL_TYPES[self.grid.get(*self.coord)]
+
+    @type.setter
+    def type(self, type):
+        self.grid.set(*self.coord, CELL_CODES[type])
+
+    def __eq__(self, other):
+        """Two views are equal if they look at the same cell of the same grid."""
+        return isinstance(other, MazeCell) and self.grid is other.grid and self.coord == other.coord
+
+    def __hash__(self):
+        return hash(self.coord)
+
+    def __str__(self):
+        """
+        make it easier to understand cell type when printing
+
+         Returns:
+            str: A single character representing the type of the cell ('w' for wall, 'p' for path, 'u' for unchecked).
+        """
+        return self.type[0]
+
+    def __repr__(self):
+        """
+        Custom string representation including the object's data. Needed to parse back it's data when loading a save.
+
+        Returns:
+            (string): A string representation of the object's data of the form: <x=<x coord>, y=<y coord>, type=<type>>
+        """
+        return f'<x={self.coord[0]}, y={self.coord[1]}, type={self.type}>'
+
+    def get_cell_neighbors(self, maze, maze_size, searched_type):
+        """ Retrieve the neighbors of a certain type of the cell in the maze.
+        Args:
+            maze (MazeGrid): The grid representing the maze layout.
+            maze_size (int): The size of the maze (number of cells in each dimension).
+            searched_type (string): A string containing describing the type of studied object.
+
+        Returns:
+            searched_cells_list (list): The list of the searched cells.
+        """
+        code = None if searched_type == "any" else CELL_CODES[searched_type]
+        return [MazeCell(maze, x, y) for x, y in maze.neighbors(*self.coord, code)]
@@ -0,0 +1,403 @@
+from PIL import Image
+
+from GameFiles.MazeGrid import MazeGrid, WALL, PATH, TOP, LEFT, BOTTOM, RIGHT, MASK_NEIGHBOR_CODES
+from GameFiles.AssetCache import assets
+
+TILES_DIRECTORY = "./data/Maze_assets/"
+CHUNK_CELLS = 32  # width and height of the pieces of the maze background, in cells
+
+# bits of the 8-neighbor masks of the autotiling, after the 4 bits of MazeGrid, a bit is set if the neighbor is a path
+TOP_LEFT = 16
+TOP_RIGHT = 32
+BOTTOM_LEFT = 64
+BOTTOM_RIGHT = 128
+NEIGHBOR_OFFSETS = ((TOP, 0, -1), (LEFT, -1, 0), (BOTTOM, 0, 1), (RIGHT, 1, 0),
+                    (TOP_LEFT, -1, -1), (TOP_RIGHT, 1, -1), (BOTTOM_LEFT, -1, 1), (BOTTOM_RIGHT, 1, 1))  # bit, dx, dy
+
+# the cells on the border have less neighbors and their own tiles: the border class of a cell is
+# 3 * column class + row class, the column (row) class being 0 on the first column (row), 1 inside and 2 on the last
+NB_BORDER_CLASSES = 9
+
+# tile ids of the cells without tile and of the paths, see build_tile_table
+NO_TILE = 0
+PATH_TILE = 1
+
+# translation tables of the cell codes, to find the paths (1) and the walls (0xFF) of the whole maze at once
+PATH_FILTER = bytes(1 if code == PATH else 0 for code in range(256))
+WALL_FILTER = bytes(0xFF if code == WALL else 0 for code in range(256))
+
+
+def choose_tile(maze, masks, i, j):
+    """Choose the tile of a cell, from its code and the codes of its neighbors (and diagonal neighbors for the walls).
+    These are the rules the autotiling table is built from (see build_tile_table), the maze is drawn with the table.
+
+    Args:
+        maze (MazeGrid): The maze
+        masks (bytearray): The neighbor masks of the cells of the maze, see MazeGrid.adjacency
+        i (int): The x-coordinate of the cell
+        j (int): The y-coordinate of the cell
+
+    Returns:
+        (str): The file of the tile in TILES_DIRECTORY, None if no tile fits and the cell is left black
+    """
+    width, height = maze.maze_size
+    cell = maze.get(i, j)
+
+    # get the neighbors to chose the correct image, the cells on the border have less neighbors
+    if 0 < i < width - 1 and 0 < j < height - 1:
+        neighbors = MASK_NEIGHBOR_CODES[masks[i * height + j]]
+    else:
+        neighbors = maze.neighbor_codes(i, j)
+
+    if cell == WALL:
+        if 0 < i < width - 1 and 0 < j < height - 1:
+            # vertical wall
+            if neighbors[0] == WALL and neighbors[1] == PATH and neighbors[2] == WALL and neighbors[3] == PATH:
+                return 'wall_vertical.png'
+            elif neighbors[0] == PATH and neighbors[1] == PATH and neighbors[2] == WALL and neighbors[3] == PATH:
+                return 'wall_vertical.png'
+            elif neighbors[0] == WALL and neighbors[1] == PATH and neighbors[2] == PATH and neighbors[3] == PATH:
+                return 'bottom_wall_vertical.png'
+
+            # horizontal wall
+            elif neighbors[0] == PATH and neighbors[1] == WALL and neighbors[2] == PATH and neighbors[3] == WALL:
+                return 'wall_horizontal.png'
+            elif neighbors[0] == PATH and neighbors[1] == PATH and neighbors[2] == PATH and neighbors[3] == WALL:
+                return 'wall_horizontal.png'
+            elif neighbors[0] == PATH and neighbors[1] == WALL and neighbors[2] == PATH and neighbors[3] == PATH:
+                return 'wall_horizontal.png'
+
+            # corners
+            elif neighbors[0] == PATH and neighbors[1] == PATH and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i+1, j+1) == PATH:
+                return 'top_left_corner.png'
+            elif neighbors[0] == PATH and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == PATH and maze.get(i-1, j+1) == PATH:
+                return 'top_right_corner.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == PATH and neighbors[3] == PATH and maze.get(i-1, j-1) == PATH:
+                return 'bottom_right_corner.png'
+            elif neighbors[0] == WALL and neighbors[1] == PATH and neighbors[2] == PATH and neighbors[3] == WALL and maze.get(i+1, j-1) == PATH:
+                return 'bottom_left_corner.png'
+
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == PATH and maze.get(i-1, j+1) == PATH and maze.get(i-1, j-1) == PATH:
+                return 'right_mid_wall.png'
+            elif neighbors[0] == WALL and neighbors[1] == PATH and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i+1, j-1) == PATH and maze.get(i+1, j+1) == PATH:
+                return 'left_mid_wall.png'
+            elif neighbors[0] == PATH and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i-1, j+1) == PATH and maze.get(i+1, j+1) == PATH:
+                return 'top_mid_wall.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == PATH and neighbors[3] == WALL and maze.get(i-1, j-1) == PATH and maze.get(i+1, j-1) == PATH:
+                return 'bottom_mid_wall.png'
+
+            # filled horizontal
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == PATH and neighbors[3] == WALL and maze.get(i-1, j-1) == PATH:
+                return 'filled_top_right_wall_horizontal.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == PATH and neighbors[3] == WALL and maze.get(i+1, j-1) == PATH:
+                return 'filled_top_left_wall_horizontal.png'
+            elif neighbors[0] == PATH and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i-1, j+1) == PATH:
+                return 'filled_bot_right_wall_horizontal.png'
+            elif neighbors[0] == PATH and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i+1, j+1) == PATH:
+                return 'filled_bot_left_wall_horizontal.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == PATH and neighbors[3] == WALL:
+                return 'filled_top_wall_horizontal.png'
+            elif neighbors[0] == PATH and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL:
+                return 'filled_bot_wall_horizontal.png'
+
+            # filled corners
+            elif neighbors[0] == PATH and neighbors[1] == PATH and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i+1, j+1) == WALL:
+                return 'filled_top_left_corner.png'
+            elif neighbors[0] == PATH and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == PATH and maze.get(i-1, j+1) == WALL:
+                return 'filled_top_right_corner.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == PATH and neighbors[3] == PATH and maze.get(i-1, j-1) == WALL:
+                return 'filled_bottom_right_corner.png'
+            elif neighbors[0] == WALL and neighbors[1] == PATH and neighbors[2] == PATH and neighbors[3] == WALL and maze.get(i+1, j-1) == WALL:
+                return 'filled_bottom_left_corner.png'
+
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == PATH and maze.get(i-1, j+1) == PATH and maze.get(i-1, j-1) == WALL:
+                return 'filled_top_right_mid_wall.png'
+            elif neighbors[0] == WALL and neighbors[1] == PATH and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i+1, j-1) == WALL and maze.get(i+1, j+1) == PATH:
+                return 'filled_top_left_mid_wall.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == PATH and maze.get(i-1, j+1) == WALL and maze.get(i-1, j-1) == PATH:
+                return 'filled_bot_right_mid_wall.png'
+            elif neighbors[0] == WALL and neighbors[1] == PATH and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i+1, j-1) == PATH and maze.get(i+1, j+1) == WALL:
+                return 'filled_bot_left_mid_wall.png'
+
+            # surrounded by walls
+            # no walls in the corners
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i-1, j-1) == PATH and maze.get(i+1, j-1) == PATH and maze.get(i-1, j+1) == PATH and maze.get(i+1, j+1) == PATH:
+                return 'wall_top_left_right_bot_left_right_hole.png'
+
+            # one wall in the corner
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i-1, j-1) == PATH and maze.get(i+1, j-1) == PATH and maze.get(i+1, j+1) == PATH:
+                return 'wall_top_left_right_bot_right_hole.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i-1, j-1) == PATH and maze.get(i+1, j-1) == PATH and maze.get(i-1, j+1) == PATH:
+                return 'wall_top_left_right_bot_left_hole.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i-1, j-1) == PATH and maze.get(i-1, j+1) == PATH and maze.get(i+1, j+1) == PATH:
+                return 'wall_top_left_bot_left_right_hole.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i+1, j-1) == PATH and maze.get(i-1, j+1) == PATH and maze.get(i+1, j+1) == PATH:
+                return 'wall_top_right_bot_left_right_hole.png'
+
+            # 2 walls in the corners
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i-1, j-1) == PATH and maze.get(i+1, j-1) == PATH:
+                return 'wall_top_left_right_hole.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i-1, j+1) == PATH and maze.get(i+1, j+1) == PATH:
+                return 'wall_bot_left_right_hole.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i-1, j-1) == PATH and maze.get(i+1, j+1) == PATH:
+                return 'wall_top_left_bot_right_hole.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i+1, j-1) == PATH and maze.get(i+1, j+1) == PATH:
+                return 'wall_top_right_bot_right_hole.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i-1, j-1) == PATH and maze.get(i-1, j+1) == PATH:
+                return 'wall_top_left_bot_left_hole.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i-1, j+1) == PATH and maze.get(i+1, j-1) == PATH:
+                return 'wall_top_right_bot_left_hole.png'
+
+            # 3 walls in the corners
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i-1, j-1) == PATH:
+                return 'wall_top_left_hole.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i+1, j-1) == PATH:
+                return 'wall_top_right_hole.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i-1, j+1) == PATH:
+                return 'wall_bot_left_hole.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i+1, j+1) == PATH:
+                return 'wall_bot_right_hole.png'
+
+            # 4 walls in the corners
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == WALL:
+                return 'wall.png'
+
+            # filled vertical
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == PATH and maze.get(i-1, j+1) == PATH:
+                return 'filled_top_left_mid_wall.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == PATH and maze.get(i-1, j-1) == PATH:
+                return 'filled_bot_left_mid_wall.png'
+            elif neighbors[0] == WALL and neighbors[1] == PATH and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i+1, j+1) == PATH:
+                return 'filled_top_right_mid_wall.png'
+            elif neighbors[0] == WALL and neighbors[1] == PATH and neighbors[2] == WALL and neighbors[3] == WALL and maze.get(i+1, j-1) == PATH:
+                return 'filled_bot_right_mid_wall.png'
+            elif neighbors[0] == WALL and neighbors[1] == WALL and neighbors[2] == WALL and neighbors[3] == PATH:
+                return 'left_wall.png'
+            elif neighbors[0] == WALL and neighbors[1] == PATH and neighbors[2] == WALL and neighbors[3] == WALL:
+                return 'right_wall.png'
+
+            else:
+                return None  # in case I forgot a possible case
+        else:
+            if (i, j) != (0, 0) and (i, j) != (width - 1, 0) and (i, j) != (0, height - 1) and (i, j) != (width - 1, height - 1):
+                # bottom line
+                if j == height - 1 and neighbors[0] == WALL and maze.get(i-1, j-1) == WALL and maze.get(i+1, j-1) == WALL:
+                    return 'full_bbottom_wall.png'
+                elif j == height - 1 and neighbors[0] == WALL and maze.get(i-1, j-1) == WALL and maze.get(i+1, j-1) == PATH:
+                    return 'filled_left_bbottom_wall.png'
+                elif j == height - 1 and neighbors[0] == WALL and maze.get(i-1, j-1) == PATH and maze.get(i+1, j-1) == WALL:
+                    return 'filled_right_bbottom_wall.png'
+                elif j == height - 1 and neighbors[0] == WALL and maze.get(i-1, j-1) == PATH and maze.get(i+1, j-1) == PATH:
+                    return 'bbottom_mid_wall.png'
+                elif j == height - 1:
+                    return 'bbottom_wall.png'
+
+                # top line
+                elif j == 0 and neighbors[1] == WALL and maze.get(i-1, j+1) == WALL and maze.get(i+1, j+1) == WALL:
+                    return 'wall.png'
+                elif j == 0 and neighbors[1] == WALL and maze.get(i-1, j+1) == WALL and maze.get(i+1, j+1) == PATH:
+                    return 'filled_left_ttop_wall.png'
+                elif j == 0 and neighbors[1] == WALL and maze.get(i-1, j+1) == PATH and maze.get(i+1, j+1) == WALL:
+                    return 'filled_right_ttop_wall.png'
+                elif j == 0 and neighbors[1] == WALL and maze.get(i-1, j+1) == PATH and maze.get(i+1, j+1) == PATH:
+                    return 'ttop_mid_wall.png'
+                elif j == 0:
+                    return 'ttop_wall.png'
+
+                # left side
+                elif i == 0 and neighbors[2] == WALL and maze.get(i+1, j+1) == WALL and maze.get(i+1, j-1) == WALL:
+                    return 'wall.png'
+                elif i == 0 and neighbors[2] == WALL and maze.get(i+1, j+1) == PATH and maze.get(i+1, j-1) == WALL:
+                    return 'filled_top_lleft_wall.png'
+                elif i == 0 and neighbors[2] == WALL and maze.get(i+1, j+1) == WALL and maze.get(i+1, j-1) == PATH:
+                    return 'filled_bot_lleft_wall.png'
+                elif i == 0 and neighbors[2] == WALL and maze.get(i+1, j+1) == PATH and maze.get(i+1, j-1) == PATH:
+                    return 'lleft_mid_wall.png'
+                elif i == 0:
+                    return 'lleft_wall.png'
+
+                # right side
+                elif i == width - 1 and neighbors[1] == WALL and maze.get(i-1, j+1) == WALL and maze.get(i-1, j-1) == WALL:
+                    return 'wall.png'
+                elif i == width - 1 and neighbors[1] == WALL and maze.get(i-1, j+1) == PATH and maze.get(i-1, j-1) == WALL:
+                    return 'filled_top_rright_wall.png'
+                elif i == width - 1 and neighbors[1] == WALL and maze.get(i-1, j+1) == WALL and maze.get(i-1, j-1) == PATH:
+                    return 'filled_bot_rright_wall.png'
+                elif i == width - 1 and neighbors[1] == WALL and maze.get(i-1, j+1) == PATH and maze.get(i-1, j-1) == PATH:
+                    return 'rright_mid_wall.png'
+                elif i == width - 1:
+                    return 'rright_wall.png'
+                else:
+                    return None
+            else:
+                # top left corner
+                if (i, j) == (0, 0):
+                    if maze.get(i+1, j+1) == WALL:
+                        return 'wall.png'
+                    else:
+                        return 'ttop_lleft_corner.png'
+                # bottom left corner
+                elif (i, j) == (0, height - 1):
+                    if maze.get(i+1, j-1) == WALL:
+                        return 'full_bbottom_wall.png'
+                    else:
+                        return 'bbot_lleft_corner.png'
+                # top right corner
+                elif (i, j) == (width - 1, 0):
+                    if maze.get(i-1, j+1) == WALL:
+                        return 'wall.png'
+                    else:
+                        return 'ttop_rright_corner.png'
+                # bottom right corner
+                elif (i, j) == (width - 1, height - 1):
+                    if maze.get(i-1, j-1) == WALL:
+                        return 'full_bbottom_wall.png'
+                    else:
+                        return 'bbot_rright_corner.png'
+
+    else:
+        return 'path.png'
+
+
+def build_tile_table():
+    """Build the autotiling table from the rules of choose_tile, by choosing the tile of a wall in a 3x3 maze for every
+    border class and every 8-neighbor mask. The tile of a wall only depends on them.
+
+    Returns:
+        tiles (list): The tile files in TILES_DIRECTORY, indexed by tile id, None for the cells left black
+        table (list): For every border class, the 256 tile ids of a wall indexed by its 8-neighbor mask. The bits of the
+            neighbors outside of the maze don't change the tile.
+    """
+    tiles = [None, 'path.png']  # NO_TILE and PATH_TILE
+    ids = {tile: tile_id for tile_id, tile in enumerate(tiles)}
+    table = []
+    for border_class in range(NB_BORDER_CLASSES):
+        i, j = divmod(border_class, 3)  # the cell of the 3x3 maze having this border class
+        tile_ids = bytearray(256)
+        for mask in range(256):
+            maze = MazeGrid((3, 3), WALL)
+            for bit, dx, dy in NEIGHBOR_OFFSETS:
+                if mask & bit and 0 <= i + dx < 3 and 0 <= j + dy < 3:
+                    maze.set(i + dx, j + dy, PATH)
+
+            tile = choose_tile(maze, maze.adjacency().masks, i, j)
+            if tile not in ids:
+                ids[tile] = len(tiles)
+                tiles.append(tile)
+            tile_ids[mask] = ids[tile]
+        table.append(bytes(tile_ids))
+    return tiles, table
+
+
+TILES, TILE_TABLE = build_tile_table()
+
+
+def tile_ids(maze):
+    """Choose the tiles of every cell of the maze with the autotiling table. The 8-neighbor masks of all the cells are
+    computed at once on the whole maze, seen as a big integer with a byte per cell, then translated into tile ids
+    column by column.
+
+    Args:
+        maze (MazeGrid): The maze
+
+    Returns:
+        (bytes): The tile id of every cell (see TILES), flattened like the cells of the maze
+    """
+    width, height = maze.maze_size
+    nb_cells = width * height
+    codes = maze.codes()
+
+    paths = int.from_bytes(codes.translate(PATH_FILTER), 'little')
+    masks = 0
+    for bit, dx, dy in NEIGHBOR_OFFSETS:
+        offset = 8 * (dx * height + dy)  # the neighbor (x + dx, y + dy) is dx * height + dy cells further
+        masks += (paths >> offset if offset > 0 else paths << -offset) * bit  # the bits of a byte never carry
+    # the neighbors of a first or last row wrap to the next or previous column, their bits are ignored by the table
+    masks = (masks & ((1 << 8 * nb_cells) - 1)).to_bytes(nb_cells, 'little')
+
+    ids = bytearray(nb_cells)
+    for x in range(width):
+        column_class = 3 * ((x > 0) + (x == width - 1))
+        start, end = x * height, (x + 1) * height
+        ids[start:end] = masks[start:end].translate(TILE_TABLE[column_class + 1])
+        ids[start] = TILE_TABLE[column_class][masks[start]]
+        ids[end - 1] = TILE_TABLE[column_class + 2][masks[end - 1]]
+
+    # every cell which isn't a wall is a path
+    walls = int.from_bytes(codes.translate(WALL_FILTER), 'little')
+    path_ids = int.from_bytes(bytes([PATH_TILE]) * nb_cells, 'little')
+    return (int.from_bytes(ids, 'little') & walls | path_ids & ~walls).to_bytes(nb_cells, 'little')
+
+
+def verify_tiles(maze):
+    """Compare the tiles chosen with the autotiling table to the ones chosen by the rules of choose_tile, to check the
+    table on real mazes without displaying them.
+
+    Args:
+        maze (MazeGrid): The maze
+
+    Returns:
+        differences (list): The (x, y, tile of the rules, tile of the table) of every cell where they differ
+    """
+    height = maze.maze_size[1]
+    masks = maze.adjacency().masks
+    ids = tile_ids(maze)
+    differences = []
+    for ind, tile_id in enumerate(ids):
+        x, y = divmod(ind, height)
+        tile = choose_tile(maze, masks, x, y)
+        if tile != TILES[tile_id]:
+            differences.append((x, y, tile, TILES[tile_id]))
+    return differences
+
+
+def compose_background(maze, cell_size, x, y, nb_x, nb_y, ids=None):
+    """Composite off-screen the tiles of a rectangle of cells of the maze into a single image, so that the static layer
+    of the maze is displayed with a few canvas items instead of one per cell.
+
+    Args:
+        maze (MazeGrid): The maze
+        cell_size (int): The size of a cell, in pixels
+        x (int): The x-coordinate of the top left cell of the rectangle
+        y (int): The y-coordinate of the top left cell of the rectangle
+        nb_x (int): The width of the rectangle, in cells
+        nb_y (int): The height of the rectangle, in cells
+        ids (bytes): The tile ids of the cells, computed if None, see tile_ids
+
+    Returns:
+        (Image): The image of the rectangle of cells, black where no tile fits
+    """
+    if ids is None:
+        ids = tile_ids(maze)
+
+    height = maze.maze_size[1]
+    image = Image.new('RGB', (nb_x * cell_size, nb_y * cell_size))  # the tiles are opaque, no need for transparency
+    for i in range(x, x + nb_x):
+        for j in range(y, y + nb_y):
+            tile_id = ids[i * height + j]
+            if tile_id != NO_TILE:
+                image.paste(assets.resized(TILES_DIRECTORY + TILES[tile_id], (cell_size, cell_size), 'RGB'),
+                            ((i - x) * cell_size, (j - y) * cell_size))
+    return image
+
+
+def background_chunks(maze, cell_size, chunk_cells=CHUNK_CELLS):
+    """Composite the whole background of the maze, in square chunks of cells (see compose_background) to keep the
+    images small enough for Tk on big mazes.
+
+    Args:
+        maze (MazeGrid): The maze
+        cell_size (int): The size of a cell, in pixels
+        chunk_cells (int): The width and height of a chunk, in cells
+
+    Returns:
+        chunks (list): The (x, y, image) of every chunk, (x, y) being the position of its top left corner in pixels
+    """
+    width, height = maze.maze_size
+    ids = tile_ids(maze)  # computed once for every chunk
+    chunks = []
+    for x in range(0, width, chunk_cells):
+        for y in range(0, height, chunk_cells):
+            image = compose_background(maze, cell_size, x, y, min(chunk_cells, width - x), min(chunk_cells, height - y), ids)
+            chunks.append((x * cell_size, y * cell_size, image))
+    return chunks
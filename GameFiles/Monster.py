@@ -1,22 +1,31 @@
-import math   # to compute euclidian distance
 from GameFiles.Observer_Observable_logic import Observable
+from GameFiles.Pathfinding import make_pathfinder, DistanceField, ChunkGraph
 
 class Monster(Observable):
     """Class representing a monster in the maze game.
 
     Attributes:
         game_state (dict): Dictionary containing all necessary game state information
-        maze (list): 2D list representing the maze
+        maze (MazeGrid): grid representing the maze
         maze_size (tuple): Dimensions of the maze
+        pathfinder (TreeIndex, JunctionGraph or ChunkGraph): Paths toward the player, can be shared by several
+            monsters, built on the first move if not given
+        distance_field (DistanceField): Walking distances of every cell to the player, to spawn the monster far from
+            the player, kept up to date at every step of the player, can be shared with the other features needing them
+        occupancy (Occupancy): The occupancy of the level, updated when the monster moves, None if not tracked
     """
 
-    __slots__ = ['game_state', 'maze', 'maze_size']
+    __slots__ = ['game_state', 'maze', 'maze_size', 'pathfinder', 'distance_field', 'occupancy']
 
-    def __init__(self, game_state):
+    def __init__(self, game_state, pathfinder=None, distance_field=None, occupancy=None):
         """Initialize the Monster instance.
 
         Args:
             game_state (dict): Dictionary containing all necessary game state information
+            pathfinder (TreeIndex, JunctionGraph or ChunkGraph): Pathfinder shared with other monsters, the one
+                chosen by make_pathfinder if None
+            distance_field (DistanceField): Distances to the player shared with other features, a new one if None
+            occupancy (Occupancy): The occupancy of the level to keep up to date with the monster position
         """
         super().__init__()
         self.game_state = game_state
@@ -24,42 +33,59 @@ class Monster(Observable):
         self.maze = game_state['maze']
         self.maze_size = game_state['maze_size']
 
+        self.pathfinder = pathfinder
+        self.distance_field = distance_field if distance_field is not None else DistanceField(self.maze)
+        self.occupancy = occupancy
+
         if game_state['monster_position'] is None:
             game_state['monster_position'] = self.init_monster_pos()
 
     def init_monster_pos(self):
-        """initialise position of the monster, taking care that it doesn't choose wall coordinates.
+        """initialise position of the monster at the cell the farthest from the player in walking distance, so never
+        on a wall. The distance field follows every step of the player (see Player.move_player), so respawning the
+        monster doesn't compute it again, and the farthest cell is only searched if the player moved since then.
 
         Returns:
-            max_position (tuple): The initial position of the monster.
+            (tuple): The initial position of the monster.
         """
-        max_distance = 0
-        max_position = None
-        player_position = self.game_state['player_position']
-    
-        for i in range(len(self.maze)):
-            for j in range(len(self.maze[0])):
-                # monster position inside maze 
-                if self.maze[i][j].type != 'wall':
-                    # find randomly genrated position in maze not on walls!
-                    distance = math.sqrt((i - player_position[0]) ** 2 + (j - player_position[1]) ** 2)
-                    if distance > max_distance:
-                        max_distance = distance
-                        max_position = (i, j)
-
-        return max_position
+        self.distance_field.update(self.game_state['player_position'])  # nothing to do if it follows the player
+        return self.distance_field.farthest()
 
     def reset_position(self):
         """ Reset monster position """
         self.game_state['monster_position'] = self.init_monster_pos()
+        if self.occupancy is not None:
+            self.occupancy.place('monster', self.game_state['monster_position'])
     
+    def set_cell(self, cell, code):
+        """Open or close a cell of the maze while the level is played, updating only the distances to the player
+        depending on it. A ChunkGraph pathfinder only builds again the chunks around the cell, the other pathfinders
+        are chosen again as the maze may not be perfect anymore. Every change of the maze during a level goes through
+        here. Traps never block the way, so activating one changes no cell.
+
+        Args:
+            cell (tuple): The coordinates of the cell
+            code (int): The new code of the cell (WALL or PATH)
+        """
+        chunks = isinstance(self.pathfinder, ChunkGraph)
+        up_to_date = chunks and self.pathfinder.version == self.maze.version
+
+        self.distance_field.set_cell(cell, code)  # changes the grid
+        if up_to_date:
+            self.pathfinder.invalidate_cell(cell)
+        elif not chunks:
+            self.pathfinder = None  # chosen again on the next move
+
     def move(self):  
         """ Determines the movement direction of the monster based on its new position relative to the previous one """
-        path = self.shortest_path()
         prev_pos = self.game_state['monster_position']
-        if len(path) > 1:
-            # Move the monster along the shortest path
-            self.game_state['monster_position'] = path[1]  # Move to the next position in the path
+
+        next_pos = self.get_pathfinder().next_step(prev_pos)
+        if next_pos is not None:
+            # Move the monster one step along the shortest path
+            self.game_state['monster_position'] = next_pos
+            if self.occupancy is not None:
+                self.occupancy.place('monster', next_pos)
 
         if prev_pos[0] < self.game_state['monster_position'][0]:
             direction = 'Right'
@@ -71,38 +97,21 @@ class Monster(Observable):
             direction = 'Down'
         self.notify_observer("monster", direction)
 
-    def shortest_path(self):
-        """Compute the shortest path between the monster and the player using a BFS algo.
+    def get_pathfinder(self):
+        """Get the pathfinder of the maze targeting the player, built the first time it is needed.
 
         Returns:
-            path (list): The shortest path from the monster to the player.
+            pathfinder (TreeIndex, JunctionGraph or ChunkGraph): The pathfinder, up to date with the player position
         """
+        if self.pathfinder is None:
+            self.pathfinder = make_pathfinder(self.maze)
+        self.pathfinder.update(self.game_state['player_position'])  # nothing to do if the player didn't move
+        return self.pathfinder
 
-        done = set()  # use a set to get a O(1) time complexity in average for lookups
-        queue = [self.game_state['monster_position']]
-        parents = {self.game_state['monster_position']: self.game_state['monster_position']}
-
-        while self.game_state['player_position'] not in done:
-            cell = queue.pop(0)
-            cell_obj = self.maze[cell[0]][cell[1]]
-
-            done.add(cell)
-
-            neighbors = cell_obj.get_cell_neighbors(self.maze, self.maze_size, "path")
-            for neighbor in neighbors:
-                if neighbor.coord not in done and neighbor.coord not in queue:
-                    queue.append(neighbor.coord)
-                    parents[neighbor.coord] = cell
-
-        # Reconstruct the path from the player to the monster
-        path = []
-        cell = self.game_state['player_position']
-        while cell != self.game_state['monster_position']:
-            path.append(cell)
-            cell = parents[cell]
-        path.append(self.game_state['monster_position'])
-
-        # reverse to get from the monster to the player
-        path.reverse()
+    def shortest_path(self):
+        """Get the shortest path between the monster and the player.
 
-        return path
\ No newline at end of file
+        Returns:
+            path (list): The shortest path from the monster to the player.
+        """
+        return self.get_pathfinder().path(self.game_state['monster_position'])
@@ -0,0 +1,83 @@
+EMPTY = frozenset()  # entities of a cell nobody is on
+
+
+class Occupancy:
+    """Spatial hash of the entities of a level by cell index, so that a collision check only looks at the cells
+    involved instead of every element of the level.
+
+    The entities are 'player', 'monster', 'treasure' and ('trap', (x, y)) for every trap not activated yet. Each entity
+    is on a single cell, placing it again moves it.
+
+    Attributes:
+        grid (MazeGrid): The grid of the maze
+        cells (dict): The set of the entities on every occupied cell, by cell index
+        positions (dict): The cell index of every entity
+    """
+
+    __slots__ = ['grid', 'cells', 'positions']
+
+    def __init__(self, grid):
+        """Initialize the Occupancy instance, empty.
+
+        Args:
+            grid (MazeGrid): The grid of the maze
+        """
+        self.grid = grid
+        self.cells = {}
+        self.positions = {}
+
+    def place(self, entity, cell):
+        """Put an entity on a cell, removing it from the cell it was on.
+
+        Args:
+            entity (hashable): The entity
+            cell (tuple): The coordinates of the cell
+        """
+        self.remove(entity)
+        ind = self.grid.index(*cell)
+        self.positions[entity] = ind
+        self.cells.setdefault(ind, set()).add(entity)
+
+    def remove(self, entity):
+        """Remove an entity from the cell it is on, if any.
+
+        Args:
+            entity (hashable): The entity
+        """
+        ind = self.positions.pop(entity, None)
+        if ind is not None:
+            entities = self.cells[ind]
+            entities.discard(entity)
+            if not entities:
+                del self.cells[ind]
+
+    def at(self, cell):
+        """Get the entities on a cell.
+
+        Args:
+            cell (tuple): The coordinates of the cell
+
+        Returns:
+            (set): The entities on the cell, not to be modified
+        """
+        return self.cells.get(self.grid.index(*cell), EMPTY)
+
+
+def level_occupancy(game_state):
+    """Build the occupancy of a level from the positions in its game_state.
+
+    Args:
+        game_state (dict): The game_state of the level
+
+    Returns:
+        occupancy (Occupancy): The occupancy of the level
+    """
+    occupancy = Occupancy(game_state['maze'])
+    for entity in ('player', 'monster', 'treasure'):
+        if game_state[entity + '_position'] is not None:
+            occupancy.place(entity, game_state[entity + '_position'])
+
+    for trap_coord, [activated, type] in game_state['traps'].items():
+        if not activated:
+            occupancy.place(('trap', trap_coord), trap_coord)
+    return occupancy
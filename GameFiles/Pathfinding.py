@@ -0,0 +1,1190 @@
+from abc import ABC, abstractmethod  # base of the pathfinders searching on demand
+from array import array  # compact arrays of distances
+from collections import deque  # O(1) queue for the BFS
+import heapq  # priority queues of the searches
+import random  # to choose the benchmarked paths
+import time  # to measure the searches
+import argparse  # for the command line
+
+from GameFiles.MazeGrid import PATH
+from GameFiles import MazeGenerators
+
+UNREACHABLE = -1  # distance of the cells that can't be reached from the target
+UNSET = -2**31  # value stored for the unreachable cells, lower than any stored distance
+MAX_OFFSET = 2**24  # the field is computed again when the offset gets this large, to stay far from the array limits
+CHUNK_GRAPH_CELLS = 160 * 160  # number of cells from which a maze with loops is searched with a ChunkGraph
+
+
+def make_pathfinder(grid):
+    """Choose the fastest pathfinder for a maze: a TreeIndex if the maze is perfect (a single path between any two
+    cells, like the ones built by MazeGenerators), otherwise a JunctionGraph, or a ChunkGraph for the mazes of at least
+    CHUNK_GRAPH_CELLS cells. With loops, following a moving target costs a search over the junctions or the chunks at
+    every move of the target, cheaper than updating a DistanceField of the whole maze.
+
+    Every pathfinder (DistanceField included) gives the same interface: update(target), then distance(cell),
+    next_step(cell) and path(cell) toward the target.
+
+    Args:
+        grid (MazeGrid): The grid of the maze, fully generated
+
+    Returns:
+        (TreeIndex, JunctionGraph or ChunkGraph): The pathfinder of the maze
+    """
+    try:
+        return TreeIndex(grid)
+    except ValueError:
+        pass  # the maze has loops, or parts not connected to each other
+
+    if grid.maze_size[0] * grid.maze_size[1] >= CHUNK_GRAPH_CELLS:
+        return ChunkGraph(grid)
+    return JunctionGraph(grid)
+
+
+def path_neighbors(grid, ind):
+    """Get the indexes of the path neighbors of a cell, in the same order as the adjacency index. Reads the grid
+    directly so that the adjacency index doesn't have to be built again after a cell is changed.
+
+    Args:
+        grid (MazeGrid): The grid of the maze
+        ind (int): The index of the cell
+
+    Returns:
+        neighbors (list): The indexes of the path neighbors of the cell
+    """
+    cells = grid.cells
+    height = grid.maze_size[1]
+    y = ind % height
+
+    neighbors = []
+    if y > 0 and cells[ind - 1] == PATH:
+        neighbors.append(ind - 1)
+    if ind >= height and cells[ind - height] == PATH:
+        neighbors.append(ind - height)
+    if y < height - 1 and cells[ind + 1] == PATH:
+        neighbors.append(ind + 1)
+    if ind + height < len(cells) and cells[ind + height] == PATH:
+        neighbors.append(ind + height)
+    return neighbors
+
+
+def manhattan(grid, first, second):
+    """Get the Manhattan distance between two cells, never more than the length of a path between them.
+
+    Args:
+        grid (MazeGrid): The grid of the maze
+        first (int): The index of the first cell
+        second (int): The index of the second cell
+
+    Returns:
+        (int): The Manhattan distance between the cells
+    """
+    first_x, first_y = divmod(first, grid.maze_size[1])
+    second_x, second_y = divmod(second, grid.maze_size[1])
+    return abs(first_x - second_x) + abs(first_y - second_y)
+
+
+def walk_back(parents, cell):
+    """Get the cells from a cell back to the start of a BFS.
+
+    Args:
+        parents (dict): The previous cell of every cell reached by the BFS, None for the start
+        cell (int): The cell index of the cell to start from
+
+    Returns:
+        cells (list): The cell indexes from the cell to the start of the BFS
+    """
+    cells = [cell]
+    while parents[cells[-1]] is not None:
+        cells.append(parents[cells[-1]])
+    return cells
+
+
+class DistanceField:
+    """Distance of every cell of the maze to a target cell (the player), computed with a BFS from the target.
+
+    Any number of chasers can share the same field: the next step of a chaser toward the target is its neighbor one
+    step closer, found in O(1).
+
+    The field is kept up to date incrementally. When the target moves to a neighbor cell, every distance changes by
+    exactly one (the maze is a grid, so the distances of two neighbors don't have the same parity): the cells whose
+    shortest path to the old target goes through the new one get one step closer, all the others one step further.
+    The distances are stored relative to an offset, so only the cells of one side are written and the offset is
+    changed for all the others. When the maze has no loop, both sides are searched at the same time and the smallest
+    one is written, so moving back and forth in a perfect maze only costs the size of the smallest side.
+
+    When a cell is opened or closed with set_cell, only the distances depending on it are updated. The field is only
+    computed again from scratch when the target jumps or the grid is changed elsewhere.
+
+    Attributes:
+        grid (MazeGrid): The grid of the maze
+        target (tuple): The coordinates of the cell the distances are computed to
+        version (int): The version of the grid the field is up to date with
+        distances (array): The distance of every cell to the target minus offset by cell index, UNSET for walls and
+            cells not connected to the target
+        offset (int): The offset added to the stored distances
+        tree (bool): True if the part of the maze connected to the target has no loop
+        farthest_cell (tuple): The (target, grid version) of the last farthest cell found and the cell, see farthest
+        checked (bool): If True, every incremental update is checked against a full BFS, see verify
+    """
+
+    __slots__ = ['grid', 'target', 'version', 'distances', 'offset', 'tree', 'farthest_cell', 'checked']
+
+    def __init__(self, grid, checked=False):
+        """Initialize the DistanceField instance. The distances are computed on the first update.
+
+        Args:
+            grid (MazeGrid): The grid of the maze
+            checked (bool): Check every incremental update against a full BFS, much slower, for debugging
+        """
+        self.grid = grid
+        self.target = None
+        self.version = None
+        self.distances = None
+        self.offset = 0
+        self.tree = False
+        self.farthest_cell = None
+        self.checked = checked
+
+    def update(self, target):
+        """Make the field hold the distances to a target, updating them only if the target or the grid changed.
+
+        Args:
+            target (tuple): The coordinates of the target cell
+
+        Returns:
+            (bool): True if the distances were updated
+        """
+        target = tuple(target)
+        if target == self.target and self.version == self.grid.version:
+            return False
+
+        if self.version == self.grid.version and abs(self.offset) < MAX_OFFSET and abs(target[0] - self.target[0]) + \
+                abs(target[1] - self.target[1]) == 1 and self.distance(target) == 1:
+            self.move(target)
+        else:
+            self.compute(target)
+        return True
+
+    def compute(self, target):
+        """Compute the distances of every cell to the target with a BFS over the adjacency index.
+
+        Args:
+            target (tuple): The coordinates of the target cell
+        """
+        adjacency = self.grid.adjacency()
+        offsets, targets = adjacency.offsets, adjacency.targets
+        distances = array('i', [UNSET]) * len(self.grid.cells)
+
+        start = self.grid.index(*target)
+        distances[start] = 0
+        queue = deque([start])
+        reached, edges = 0, 0
+        while queue:
+            cell = queue.popleft()
+            reached += 1
+            edges += offsets[cell + 1] - offsets[cell]  # every edge is counted from both ends
+            distance = distances[cell] + 1
+            for ind in range(offsets[cell], offsets[cell + 1]):
+                neighbor = targets[ind]
+                if distances[neighbor] == UNSET:
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+
+        self.target = tuple(target)
+        self.version = self.grid.version
+        self.distances = distances
+        self.offset = 0
+        self.tree = edges == 2 * (reached - 1)
+
+    def move(self, target):
+        """Update the distances after the target moved to a neighbor cell, one step closer to every cell of the region
+        behind it and one step further from all the others.
+
+        The region behind the new target is the set of cells whose shortest path to the old target goes through it.
+        It is found by climbing the field from the new target: a cell is in the region if it is one step further
+        than a cell of the region.
+
+        Args:
+            target (tuple): The coordinates of the new target, a path neighbor of the current target
+        """
+        distances = self.distances
+        start = self.grid.index(*target)
+
+        if self.tree:
+            # without loop the other side is found the same way from the old target, the smallest one is written
+            regions = ([start], [self.grid.index(*self.target)])
+            queues = (deque(regions[0]), deque(regions[1]))
+            while queues[0] and queues[1]:
+                for side in (0, 1):
+                    cell = queues[side].popleft()
+                    uphill = distances[cell] + 1
+                    for neighbor in path_neighbors(self.grid, cell):
+                        if distances[neighbor] == uphill and neighbor != start:
+                            regions[side].append(neighbor)
+                            queues[side].append(neighbor)
+
+            if not queues[0]:
+                for cell in regions[0]:
+                    distances[cell] -= 2
+                self.offset += 1
+            else:
+                for cell in regions[1]:
+                    distances[cell] += 2
+                self.offset -= 1
+        else:
+            # every cell gets one step further with the offset, the ones of the region are written one step closer
+            distances[start] -= 2
+            queue = deque([start])
+            while queue:
+                cell = queue.popleft()
+                uphill = distances[cell] + 3  # the stored distance of the cell before the update, plus one
+                for neighbor in path_neighbors(self.grid, cell):
+                    if distances[neighbor] == uphill:
+                        distances[neighbor] -= 2
+                        queue.append(neighbor)
+            self.offset += 1
+
+        self.target = target
+
+        if self.checked:
+            assert self.verify(), f"wrong distances after moving the target to {target}"
+
+    def set_cell(self, cell, code):
+        """Change the code of a cell of the grid and update the distances depending on it.
+
+        Args:
+            cell (tuple): The coordinates of the cell
+            code (int): The new code of the cell (WALL, PATH or UNCHECKED)
+        """
+        ind = self.grid.index(*cell)
+        was_path = self.grid.cells[ind] == PATH
+        up_to_date = self.target is not None and self.version == self.grid.version
+
+        self.grid.set(*cell, code)
+        if not up_to_date:
+            return  # computed from scratch on the next update anyway
+
+        if (code == PATH) != was_path:
+            if ind == self.grid.index(*self.target):
+                self.compute(self.target)
+                return
+            if code == PATH:
+                self.open(ind)
+            else:
+                self.close(ind)
+        self.version = self.grid.version
+
+        if self.checked:
+            assert self.verify(), f"wrong distances after setting the cell {cell} to {code}"
+
+    def open(self, ind):
+        """Update the distances after a cell became a path: only decrease, from the new cell outward.
+
+        Args:
+            ind (int): The index of the opened cell
+        """
+        distances = self.distances
+        reached = [distances[neighbor] for neighbor in path_neighbors(self.grid, ind) if distances[neighbor] != UNSET]
+        if not reached:
+            return  # not connected to the target, stays unreachable
+        if len(path_neighbors(self.grid, ind)) > 1:
+            self.tree = False  # the cell may close a loop or connect a part of the maze having loops
+
+        distances[ind] = min(reached) + 1
+        queue = deque([ind])
+        while queue:
+            cell = queue.popleft()
+            distance = distances[cell] + 1
+            for neighbor in path_neighbors(self.grid, cell):
+                if distances[neighbor] == UNSET or distances[neighbor] > distance:
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+
+    def close(self, ind):
+        """Update the distances after a cell stopped being a path: only the cells whose every shortest path went
+        through it get further, they are found by climbing the field from the closed cell then computed again in
+        order from their unaffected neighbors.
+
+        Args:
+            ind (int): The index of the closed cell
+        """
+        distances = self.distances
+        if distances[ind] == UNSET:
+            return
+
+        # cells left without any neighbor one step closer, level by level from the closed cell
+        affected = {ind}
+        queued = {ind}
+        queue = deque([ind])
+        while queue:
+            cell = queue.popleft()
+            distance = distances[cell]
+            if cell != ind:
+                if any(distances[neighbor] == distance - 1 and neighbor not in affected
+                       for neighbor in path_neighbors(self.grid, cell)):
+                    continue
+                affected.add(cell)
+            for neighbor in path_neighbors(self.grid, cell):
+                if distances[neighbor] == distance + 1 and neighbor not in queued:
+                    queued.add(neighbor)
+                    queue.append(neighbor)
+
+        distances[ind] = UNSET
+        affected.discard(ind)
+        for cell in affected:
+            distances[cell] = UNSET
+
+        # distances of the affected cells from their unaffected neighbors, then between them in increasing order
+        heap = []
+        for cell in affected:
+            reached = [distances[neighbor] for neighbor in path_neighbors(self.grid, cell) if distances[neighbor] != UNSET]
+            if reached:
+                heap.append((min(reached) + 1, cell))
+        heapq.heapify(heap)
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            if distances[cell] != UNSET:
+                continue
+            distances[cell] = distance
+            for neighbor in path_neighbors(self.grid, cell):
+                if neighbor in affected and distances[neighbor] == UNSET:
+                    heapq.heappush(heap, (distance + 1, neighbor))
+
+    def verify(self):
+        """Check the field against the distances computed from scratch with a full BFS.
+
+        Returns:
+            (bool): True if every distance is right
+        """
+        reference = DistanceField(self.grid)
+        reference.compute(self.target)
+        return all(self.distance(self.grid.coord(ind)) == reference.distance(self.grid.coord(ind))
+                   for ind in range(len(self.grid.cells)))
+
+    def farthest(self):
+        """Get the cell the farthest from the target in walking distance, the first one in index order if several are
+        as far. Only searched again when the target or the grid changed since the last call.
+
+        Returns:
+            (tuple): The coordinates of the farthest cell reachable from the target
+        """
+        key = (self.target, self.grid.version)
+        if self.farthest_cell is None or self.farthest_cell[0] != key:
+            farthest = self.grid.coord(self.distances.index(max(self.distances)))  # UNSET is the lowest
+            self.farthest_cell = (key, farthest)
+        return self.farthest_cell[1]
+
+    def distance(self, cell):
+        """Get the distance of a cell to the target, UNREACHABLE if it can't be reached."""
+        distance = self.distances[self.grid.index(*cell)]
+        return UNREACHABLE if distance == UNSET else distance + self.offset
+
+    def next_step(self, cell):
+        """Get the neighbor of a cell one step closer to the target.
+
+        Args:
+            cell (tuple): The coordinates of the cell
+
+        Returns:
+            (tuple): The coordinates of the next cell toward the target, None if the cell is the target or can't reach it
+        """
+        ind = self.grid.index(*cell)
+        distance = self.distances[ind]
+        if distance == UNSET or distance + self.offset == 0:
+            return None
+
+        for neighbor in path_neighbors(self.grid, ind):
+            if self.distances[neighbor] == distance - 1:
+                return self.grid.coord(neighbor)
+
+    def path(self, cell):
+        """Get the shortest path from a cell to the target by descending the field.
+
+        Args:
+            cell (tuple): The coordinates of the start of the path
+
+        Returns:
+            path (list): The coordinates of the cells from the cell to the target, only the cell if it can't reach it
+        """
+        path = [tuple(cell)]
+        step = self.next_step(cell)
+        while step is not None:
+            path.append(step)
+            step = self.next_step(step)
+        return path
+
+
+class TreeIndex:
+    """Index answering path queries between any two cells of a perfect maze, where the paths form a tree and the path
+    between two cells is unique. Built once per level, then every query takes O(log n) with no search at all.
+
+    The tree is rooted at the first path cell and every cell gets a node number in BFS order, its depth and its
+    ancestors 1, 2, 4, ... levels up (binary lifting). The path between two cells goes through their lowest common
+    ancestor, found by lifting both cells to the same depth then up together.
+
+    Like DistanceField it has a target, so that the monster can use either of them. The index is built again if the
+    grid changes, which fails if the maze is not perfect anymore.
+
+    Attributes:
+        grid (MazeGrid): The grid of the maze
+        target (tuple): The coordinates of the cell the distance, next_step and path queries go to
+        version (int): The version of the grid the index was built from
+        nodes (array): The node number of every cell by cell index, -1 for walls
+        cells (array): The cell index of every node
+        depths (array): The depth of every node, the root being at depth 0
+        ancestors (list): ancestors[k][node] is the ancestor of the node 2**k levels up, the root for the ones above it
+    """
+
+    __slots__ = ['grid', 'target', 'version', 'nodes', 'cells', 'depths', 'ancestors']
+
+    def __init__(self, grid):
+        """Initialize the TreeIndex instance and build the index.
+
+        Args:
+            grid (MazeGrid): The grid of the maze, fully generated
+
+        Raises:
+            ValueError: If the maze is not perfect
+        """
+        self.grid = grid
+        self.target = None
+        self.build()
+
+    def build(self):
+        """Build the index from the grid.
+
+        Raises:
+            ValueError: If the maze has loops or parts not connected to each other
+        """
+        adjacency = self.grid.adjacency()
+        offsets, targets = adjacency.offsets, adjacency.targets
+        codes = self.grid.codes()
+        nb_nodes = codes.count(PATH)
+
+        # a connected graph is a tree if and only if it has one edge less than nodes, every edge being stored twice
+        if nb_nodes == 0 or len(targets) != 2 * (nb_nodes - 1):
+            raise ValueError("the maze is not perfect")
+
+        nodes = array('i', [-1]) * len(self.grid.cells)
+        cells = array('i', [codes.index(PATH)])
+        parents = array('i', [0])
+        depths = array('i', [0])
+        nodes[cells[0]] = 0
+
+        # BFS from the root, the nodes being numbered in the order they are reached
+        node = 0
+        while node < len(cells):
+            cell = cells[node]
+            for ind in range(offsets[cell], offsets[cell + 1]):
+                neighbor = targets[ind]
+                if nodes[neighbor] == -1:
+                    nodes[neighbor] = len(cells)
+                    cells.append(neighbor)
+                    parents.append(node)
+                    depths.append(depths[node] + 1)
+            node += 1
+
+        if len(cells) != nb_nodes:
+            raise ValueError("the maze is not perfect")
+
+        ancestors = [parents]
+        while 1 << len(ancestors) <= depths[-1]:  # the last node is one of the deepest
+            previous = ancestors[-1]
+            ancestors.append(array('i', [previous[up] for up in previous]))
+
+        self.version = self.grid.version
+        self.nodes = nodes
+        self.cells = cells
+        self.depths = depths
+        self.ancestors = ancestors
+
+    def lift(self, node, height):
+        """Get the ancestor of a node some levels up.
+
+        Args:
+            node (int): The node number
+            height (int): The number of levels to go up, at most the depth of the node
+
+        Returns:
+            node (int): The node number of the ancestor
+        """
+        level = 0
+        while height:
+            if height & 1:
+                node = self.ancestors[level][node]
+            height >>= 1
+            level += 1
+        return node
+
+    def common_ancestor(self, first, second):
+        """Get the lowest common ancestor of two nodes, where the path between them turns back down.
+
+        Args:
+            first (int): The node number of the first node
+            second (int): The node number of the second node
+
+        Returns:
+            node (int): The node number of their lowest common ancestor
+        """
+        if self.depths[first] < self.depths[second]:
+            first, second = second, first
+        first = self.lift(first, self.depths[first] - self.depths[second])
+        if first == second:
+            return first
+
+        for level in reversed(range(len(self.ancestors))):
+            if self.ancestors[level][first] != self.ancestors[level][second]:
+                first = self.ancestors[level][first]
+                second = self.ancestors[level][second]
+        return self.ancestors[0][first]
+
+    def distance_between(self, start, end):
+        """Get the length of the path between two cells.
+
+        Args:
+            start (tuple): The coordinates of the first cell
+            end (tuple): The coordinates of the second cell
+
+        Returns:
+            (int): The number of steps between the cells, UNREACHABLE if one of them is a wall
+        """
+        first, second = self.nodes[self.grid.index(*start)], self.nodes[self.grid.index(*end)]
+        if first == -1 or second == -1:
+            return UNREACHABLE
+        ancestor = self.common_ancestor(first, second)
+        return self.depths[first] + self.depths[second] - 2 * self.depths[ancestor]
+
+    def step_between(self, start, end):
+        """Get the neighbor of a cell on the path to another cell.
+
+        Args:
+            start (tuple): The coordinates of the cell to start from
+            end (tuple): The coordinates of the cell to go to
+
+        Returns:
+            (tuple): The coordinates of the next cell of the path, None if the cells are the same or one is a wall
+        """
+        first, second = self.nodes[self.grid.index(*start)], self.nodes[self.grid.index(*end)]
+        if first == -1 or second == -1 or first == second:
+            return None
+
+        ancestor = self.common_ancestor(first, second)
+        if ancestor != first:
+            step = self.ancestors[0][first]  # the path goes up toward the common ancestor
+        else:
+            step = self.lift(second, self.depths[second] - self.depths[first] - 1)  # down toward the end
+        return self.grid.coord(self.cells[step])
+
+    def update(self, target):
+        """Set the target of the distance, next_step and path queries, building the index again if the grid changed.
+
+        Args:
+            target (tuple): The coordinates of the target cell
+
+        Returns:
+            (bool): True if the target or the index changed
+        """
+        target = tuple(target)
+        if target == self.target and self.version == self.grid.version:
+            return False
+        if self.version != self.grid.version:
+            self.build()
+        self.target = target
+        return True
+
+    def distance(self, cell):
+        """Get the distance of a cell to the target, UNREACHABLE if it can't be reached."""
+        return self.distance_between(cell, self.target)
+
+    def next_step(self, cell):
+        """Get the neighbor of a cell one step closer to the target.
+
+        Args:
+            cell (tuple): The coordinates of the cell
+
+        Returns:
+            (tuple): The coordinates of the next cell toward the target, None if the cell is the target or can't reach it
+        """
+        return self.step_between(cell, self.target)
+
+    def path(self, cell):
+        """Get the path from a cell to the target.
+
+        Args:
+            cell (tuple): The coordinates of the start of the path
+
+        Returns:
+            path (list): The coordinates of the cells from the cell to the target, only the cell if it can't reach it
+        """
+        path = [tuple(cell)]
+        step = self.next_step(cell)
+        while step is not None:
+            path.append(step)
+            step = self.next_step(step)
+        return path
+
+
+class PathSearch(ABC):
+    """Base of the pathfinders searching the path between two cells on demand (JunctionGraph and ChunkGraph), giving
+    the same queries toward a target as DistanceField. The last paths found are kept so that a chaser walking along
+    one doesn't search again until the target moves.
+
+    Attributes:
+        grid (MazeGrid): The grid of the maze
+        version (int): The version of the grid the pathfinder was built from
+        target (tuple): The coordinates of the cell the distance, next_step and path queries go to
+        steps (dict): The next cell toward the target of the cells on the paths already found, by cell index
+    """
+
+    __slots__ = ['grid', 'version', 'target', 'steps']
+
+    def __init__(self, grid):
+        """Initialize the pathfinder and build it.
+
+        Args:
+            grid (MazeGrid): The grid of the maze, fully generated
+        """
+        self.grid = grid
+        self.target = None
+        self.steps = {}
+        self.build()
+
+    @abstractmethod
+    def build(self):
+        """Build the pathfinder from the grid, setting version."""
+
+    @abstractmethod
+    def search(self, start, goal):
+        """Find the shortest path between two cells.
+
+        Args:
+            start (int): The cell index of the start of the path
+            goal (int): The cell index of the end of the path
+
+        Returns:
+            path (list): The indexes of the cells of the path, from start to goal, None if the goal can't be reached
+        """
+
+    def update(self, target):
+        """Set the target of the distance, next_step and path queries, building the pathfinder again if the grid
+        changed.
+
+        Args:
+            target (tuple): The coordinates of the target cell
+
+        Returns:
+            (bool): True if the target or the pathfinder changed
+        """
+        target = tuple(target)
+        if target == self.target and self.version == self.grid.version:
+            return False
+        if self.version != self.grid.version:
+            self.build()
+        self.target = target
+        self.steps = {}
+        return True
+
+    def path(self, cell):
+        """Get the shortest path from a cell to the target.
+
+        Args:
+            cell (tuple): The coordinates of the start of the path
+
+        Returns:
+            path (list): The coordinates of the cells from the cell to the target, only the cell if it can't reach it
+        """
+        path = self.search(self.grid.index(*cell), self.grid.index(*self.target))
+        if path is None:
+            return [tuple(cell)]
+
+        for ind in range(len(path) - 1):
+            self.steps[path[ind]] = path[ind + 1]
+        return [self.grid.coord(ind) for ind in path]
+
+    def distance(self, cell):
+        """Get the distance of a cell to the target, UNREACHABLE if it can't be reached."""
+        path = self.search(self.grid.index(*cell), self.grid.index(*self.target))
+        return UNREACHABLE if path is None else len(path) - 1
+
+    def next_step(self, cell):
+        """Get the neighbor of a cell one step closer to the target, searching only if the cell is not on a path
+        already found.
+
+        Args:
+            cell (tuple): The coordinates of the cell
+
+        Returns:
+            (tuple): The coordinates of the next cell toward the target, None if the cell is the target or can't reach it
+        """
+        step = self.steps.get(self.grid.index(*cell))
+        if step is None:
+            path = self.path(cell)
+            return path[1] if len(path) > 1 else None
+        return self.grid.coord(step)
+
+
+class JunctionGraph(PathSearch):
+    """Graph of the maze where the corridors are contracted: its nodes are the junctions and dead ends (path cells not
+    having exactly two path neighbors), its edges the corridors between them, weighted by their length. The cells of
+    every corridor are kept to give back the full path. Searches with A* only touch junctions and dead ends, most path
+    cells being inside corridors.
+
+    Attributes:
+        links (dict): The (neighbor node, length, edge) of every corridor leaving a node, by node cell index
+        edges (list): The (first node, second node, cells) of every corridor, cells being the array of the indexes of
+            the cells inside it from the first to the second node
+        edge_of (array): The edge of every cell inside a corridor by cell index, -1 for the other cells
+        position (array): The position of every cell inside its corridor by cell index
+    """
+
+    __slots__ = ['links', 'edges', 'edge_of', 'position']
+
+    def build(self):
+        """Build the graph from the adjacency index of the grid."""
+        adjacency = self.grid.adjacency()
+        offsets, targets = adjacency.offsets, adjacency.targets
+        nb_cells = len(self.grid.cells)
+
+        self.version = self.grid.version
+        self.links = {}
+        self.edges = []
+        self.edge_of = array('i', [-1]) * nb_cells
+        self.position = array('i', [0]) * nb_cells
+
+        corridors = []  # path cells with exactly two path neighbors
+        for ind in range(nb_cells):
+            degree = offsets[ind + 1] - offsets[ind]
+            if degree == 2:
+                corridors.append(ind)
+            elif degree or self.grid.cells[ind] == PATH:
+                self.links[ind] = []
+
+        for node in list(self.links):
+            self.trace(node)
+
+        # a loop made only of corridor cells has no junction, one of its cells becomes a node
+        for ind in corridors:
+            if self.edge_of[ind] == -1 and ind not in self.links:
+                self.links[ind] = []
+                self.trace(ind)
+
+    def trace(self, node):
+        """Follow every corridor leaving a node up to the next node and add it to the graph if it is new.
+
+        Args:
+            node (int): The cell index of the node
+        """
+        adjacency = self.grid.adjacency()
+        for first in adjacency.neighbors(node):
+            if first in self.links:
+                # two nodes next to each other, the edge is added once from the smallest one
+                if node <= first:
+                    self.add_edge(node, first, array('i'))
+                continue
+            if self.edge_of[first] != -1:
+                continue  # already traced from its other end
+
+            cells = array('i', [first])
+            self.edge_of[first] = len(self.edges)  # marked now so that a loop doesn't come back to it
+            previous, cell = node, first
+            while cell not in self.links:
+                a, b = adjacency.neighbors(cell)
+                previous, cell = cell, b if a == previous else a
+                if cell not in self.links:
+                    if self.edge_of[cell] != -1:
+                        break  # can only happen on a loop of corridor cells, closed on the node
+                    cells.append(cell)
+            self.add_edge(node, cell if cell in self.links else node, cells)
+
+    def add_edge(self, first, second, cells):
+        """Add a corridor to the graph.
+
+        Args:
+            first (int): The cell index of the node at the start of the corridor
+            second (int): The cell index of the node at the end of the corridor
+            cells (array): The indexes of the cells inside the corridor, from the first to the second node
+        """
+        edge = len(self.edges)
+        self.edges.append((first, second, cells))
+        for position, cell in enumerate(cells):
+            self.edge_of[cell] = edge
+            self.position[cell] = position
+
+        length = len(cells) + 1
+        self.links[first].append((second, length, edge))
+        if second != first:
+            self.links[second].append((first, length, edge))
+
+    def entries(self, cell):
+        """Get the nodes a cell can directly go to, with the cells walked on the way.
+
+        Args:
+            cell (int): The cell index of the cell
+
+        Returns:
+            entries (list): The (node, cells) of every node reachable without crossing another one, cells being the
+                list of the cells walked from the cell to the node, without the node itself
+        """
+        if cell in self.links:
+            return [(cell, [])]
+
+        first, second, cells = self.edges[self.edge_of[cell]]
+        position = self.position[cell]
+        return [(first, list(reversed(cells[:position + 1]))), (second, list(cells[position:]))]
+
+    def search(self, start, goal):
+        """Find the shortest path between two cells with A* over the junctions and dead ends.
+
+        Args:
+            start (int): The cell index of the start of the path
+            goal (int): The cell index of the end of the path
+
+        Returns:
+            path (list): The indexes of the cells of the path, from start to goal, None if the goal can't be reached
+        """
+        if start == goal:
+            return [start]
+        if self.grid.cells[start] != PATH or self.grid.cells[goal] != PATH:
+            return None
+
+        # the goal is reached from the nodes at the ends of its corridor
+        exits = {}
+        for node, cells in self.entries(goal):
+            cells.reverse()  # from the node to the goal, without the node
+            if node not in exits or len(cells) < len(exits[node]):
+                exits[node] = cells
+
+        best, best_path = float('inf'), None
+        if self.edge_of[start] != -1 and self.edge_of[start] == self.edge_of[goal]:
+            # on the same corridor, straight along it
+            first, second, cells = self.edges[self.edge_of[start]]
+            a, b = self.position[start], self.position[goal]
+            best_path = list(cells[a:b + 1] if a < b else reversed(cells[b:a + 1]))
+            best = len(best_path) - 1
+
+        distances = {}
+        parents = {}
+        heap = []
+        for node, cells in self.entries(start):
+            if len(cells) < distances.get(node, float('inf')):
+                distances[node] = len(cells)
+                parents[node] = (None, cells)
+                heapq.heappush(heap, (len(cells) + manhattan(self.grid, node, goal), len(cells), node))
+
+        end = None
+        while heap:
+            estimate, distance, node = heapq.heappop(heap)
+            if estimate >= best:
+                break
+            if distance > distances[node]:
+                continue
+            if node in exits and distance + len(exits[node]) < best:
+                best, end = distance + len(exits[node]), node
+
+            for neighbor, length, edge in self.links[node]:
+                new_distance = distance + length
+                if new_distance < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = new_distance
+                    parents[neighbor] = (node, edge)
+                    heapq.heappush(heap, (new_distance + manhattan(self.grid, neighbor, goal), new_distance, neighbor))
+
+        if end is None:
+            return best_path
+
+        # walk back the corridors from the last node to the start
+        segments = [[end] + exits[end]]
+        node = end
+        while True:
+            previous, link = parents[node]
+            if previous is None:
+                segments.append(link)  # the cells from the start to the first node
+                break
+            first, second, cells = self.edges[link]
+            segments.append([previous] + list(cells if first == previous else reversed(cells)))
+            node = previous
+
+        path = []
+        for segment in reversed(segments):
+            path.extend(segment)
+        return path
+
+
+class ChunkGraph(PathSearch):
+    """Hierarchical pathfinder for huge mazes (HPA*): the maze is divided into square chunks, and the path cells of a
+    chunk having a path neighbor in another chunk are its entrances. The distances between the entrances of every
+    chunk are computed once with a BFS inside the chunk, which makes an abstract graph of the entrances, linked to
+    the entrances of the other chunks they touch.
+
+    A search only runs a BFS inside the chunks of the start and the goal, then A* over the abstract graph, and the
+    abstract path is refined into cells with a BFS inside each chunk it crosses. Every crossing of a chunk border is an
+    entrance, so the paths found are shortest paths.
+
+    When a cell is changed with set_cell, only the chunk of the cell (and the chunks next to it if it is on a border) is
+    built again, see invalidate_cell.
+
+    Attributes:
+        chunk_size (int): Width and height of the chunks, in cells
+        chunks (tuple): Number of chunks in width and in height
+        entrances (dict): The cell indexes of the entrances of every chunk, by chunk number
+        links (dict): The (entrance, distance) of the other entrances reachable inside the chunk, by entrance
+    """
+
+    __slots__ = ['chunk_size', 'chunks', 'entrances', 'links']
+
+    def __init__(self, grid, chunk_size=16):
+        """Initialize the ChunkGraph instance and build the abstract graph.
+
+        Args:
+            grid (MazeGrid): The grid of the maze, fully generated
+            chunk_size (int): Width and height of the chunks, in cells
+        """
+        self.chunk_size = chunk_size
+        super().__init__(grid)
+
+    def build(self):
+        """Build the abstract graph of every chunk."""
+        width, height = self.grid.maze_size
+        self.chunks = (-(-width // self.chunk_size), -(-height // self.chunk_size))
+        self.entrances = {}
+        self.links = {}
+        for chunk in range(self.chunks[0] * self.chunks[1]):
+            self.build_chunk(chunk)
+        self.version = self.grid.version
+
+    def chunk_of(self, ind):
+        """Get the number of the chunk of a cell."""
+        x, y = divmod(ind, self.grid.maze_size[1])
+        return (x // self.chunk_size) * self.chunks[1] + y // self.chunk_size
+
+    def bounds(self, chunk):
+        """Get the cells covered by a chunk.
+
+        Args:
+            chunk (int): The number of the chunk
+
+        Returns:
+            (tuple): The first x, first y, last x + 1 and last y + 1 of the cells of the chunk
+        """
+        column, row = divmod(chunk, self.chunks[1])
+        x, y = column * self.chunk_size, row * self.chunk_size
+        return x, y, min(x + self.chunk_size, self.grid.maze_size[0]), min(y + self.chunk_size, self.grid.maze_size[1])
+
+    def build_chunk(self, chunk):
+        """Find the entrances of a chunk and the distances between them.
+
+        Args:
+            chunk (int): The number of the chunk
+        """
+        for entrance in self.entrances.get(chunk, ()):
+            del self.links[entrance]
+
+        # only the cells on the border of the chunk can touch another chunk
+        left, top, right, bottom = self.bounds(chunk)
+        border = set()
+        for x in range(left, right):
+            border.add((x, top))
+            border.add((x, bottom - 1))
+        for y in range(top, bottom):
+            border.add((left, y))
+            border.add((right - 1, y))
+
+        entrances = []
+        for x, y in sorted(border):
+            ind = self.grid.index(x, y)
+            if self.grid.cells[ind] == PATH and \
+                    any(self.chunk_of(neighbor) != chunk for neighbor in path_neighbors(self.grid, ind)):
+                entrances.append(ind)
+        self.entrances[chunk] = entrances
+
+        for entrance in entrances:
+            distances = self.explore(entrance, chunk)[0]
+            self.links[entrance] = [(other, distances[other]) for other in entrances
+                                    if other != entrance and other in distances]
+
+    def explore(self, start, chunk, goal=None):
+        """BFS from a cell without leaving its chunk.
+
+        Args:
+            start (int): The cell index of the start
+            chunk (int): The number of the chunk of the start
+            goal (int): The cell index where to stop, None to reach every cell of the chunk
+
+        Returns:
+            distances (dict): The distance of the cells reached from the start, by cell index
+            parents (dict): The previous cell on the path from the start of the cells reached, by cell index
+        """
+        left, top, right, bottom = self.bounds(chunk)
+        height = self.grid.maze_size[1]
+
+        distances = {start: 0}
+        parents = {start: None}
+        queue = deque([start])
+        while queue and goal not in distances:
+            cell = queue.popleft()
+            for neighbor in path_neighbors(self.grid, cell):
+                x, y = divmod(neighbor, height)
+                if neighbor not in distances and left <= x < right and top <= y < bottom:
+                    distances[neighbor] = distances[cell] + 1
+                    parents[neighbor] = cell
+                    queue.append(neighbor)
+        return distances, parents
+
+    def set_cell(self, cell, code):
+        """Change the code of a cell of the grid and build again only the chunks depending on it, see invalidate_cell.
+        The whole graph is built again on the next update if the grid was changed elsewhere since it was built.
+
+        Args:
+            cell (tuple): The coordinates of the cell
+            code (int): The new code of the cell (WALL, PATH or UNCHECKED)
+        """
+        up_to_date = self.version == self.grid.version
+        self.grid.set(*cell, code)
+        if up_to_date:
+            self.invalidate_cell(cell)
+
+    def invalidate_cell(self, cell):
+        """Build again the parts of the abstract graph depending on a cell, after it was changed in the grid.
+
+        Args:
+            cell (tuple): The coordinates of the changed cell
+        """
+        ind = self.grid.index(*cell)
+        chunks = {self.chunk_of(ind)}
+        x, y = cell
+        for neighbor in ((x, y - 1), (x - 1, y), (x, y + 1), (x + 1, y)):
+            if 0 <= neighbor[0] < self.grid.maze_size[0] and 0 <= neighbor[1] < self.grid.maze_size[1]:
+                chunks.add(self.chunk_of(self.grid.index(*neighbor)))  # its entrances may have changed
+
+        for chunk in chunks:
+            self.build_chunk(chunk)
+        self.version = self.grid.version
+        self.steps = {}
+
+    def search(self, start, goal):
+        """Find the shortest path between two cells with A* over the abstract graph, then refine it into cells.
+
+        Args:
+            start (int): The cell index of the start of the path
+            goal (int): The cell index of the end of the path
+
+        Returns:
+            path (list): The indexes of the cells of the path, from start to goal, None if the goal can't be reached
+        """
+        if start == goal:
+            return [start]
+        if self.grid.cells[start] != PATH or self.grid.cells[goal] != PATH:
+            return None
+
+        start_chunk, goal_chunk = self.chunk_of(start), self.chunk_of(goal)
+        start_distances, start_parents = self.explore(start, start_chunk)
+        goal_distances, goal_parents = self.explore(goal, goal_chunk)
+
+        best, end = float('inf'), None
+        if goal in start_distances:
+            best = start_distances[goal]  # in the same chunk, without leaving it
+
+        # the goal is reached from the entrances of its chunk connected to it
+        exits = {entrance: goal_distances[entrance] for entrance in self.entrances[goal_chunk]
+                 if entrance in goal_distances}
+
+        distances = {}
+        parents = {}
+        heap = []
+        for entrance in self.entrances[start_chunk]:
+            if entrance in start_distances:
+                distances[entrance] = start_distances[entrance]
+                parents[entrance] = None
+                estimate = distances[entrance] + manhattan(self.grid, entrance, goal)
+                heapq.heappush(heap, (estimate, distances[entrance], entrance))
+
+        while heap:
+            estimate, distance, node = heapq.heappop(heap)
+            if estimate >= best:
+                break
+            if distance > distances[node]:
+                continue
+            if node in exits and distance + exits[node] < best:
+                best, end = distance + exits[node], node
+
+            # the entrances of the same chunk, then the ones of the chunks next to it
+            neighbors = list(self.links[node])
+            for neighbor in path_neighbors(self.grid, node):
+                if neighbor in self.links and self.chunk_of(neighbor) != self.chunk_of(node):
+                    neighbors.append((neighbor, 1))
+
+            for neighbor, length in neighbors:
+                new_distance = distance + length
+                if new_distance < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = new_distance
+                    parents[neighbor] = node
+                    heapq.heappush(heap, (new_distance + manhattan(self.grid, neighbor, goal), new_distance, neighbor))
+
+        if best == float('inf'):
+            return None
+        if end is None:
+            return walk_back(start_parents, goal)[::-1]
+
+        # abstract path from the first entrance to the last one
+        nodes = [end]
+        while parents[nodes[-1]] is not None:
+            nodes.append(parents[nodes[-1]])
+        nodes.reverse()
+
+        path = walk_back(start_parents, nodes[0])[::-1]
+        for previous, node in zip(nodes, nodes[1:]):
+            chunk = self.chunk_of(previous)
+            if chunk != self.chunk_of(node):
+                path.append(node)  # crossing the border
+            else:
+                path.extend(walk_back(self.explore(previous, chunk, node)[1], node)[-2::-1])
+        path.extend(walk_back(goal_parents, nodes[-1])[1:])
+        return path
+
+
+def benchmark(size=501, chunk_size=16, queries=50, seed=0):
+    """Print the time taken to build the pathfinders of a maze and to find paths between random cells, compared to
+    a flat BFS over the whole maze.
+
+    Args:
+        size (int): Width and height of the maze
+        chunk_size (int): Width and height of the chunks of the ChunkGraph
+        queries (int): Number of paths searched
+        seed (int): Seed of the maze and of the searched paths
+    """
+    rng = random.Random(seed)
+    grid = MazeGenerators.generate((size, size), 'prim', rng)
+    grid.adjacency()
+    cells = [ind for ind in range(len(grid.cells)) if grid.cells[ind] == PATH]
+    pairs = [(rng.choice(cells), rng.choice(cells)) for _ in range(queries)]
+    print(f'{size}x{size}, {len(cells)} path cells, {queries} paths')
+
+    field = DistanceField(grid)
+    start = time.perf_counter()
+    lengths = []
+    for first, second in pairs:
+        field.compute(grid.coord(second))
+        lengths.append(field.distance(grid.coord(first)))
+    print(f'    {"flat BFS":<16} {"":>10} {(time.perf_counter() - start) * 1000 / queries:8.2f} ms/path')
+
+    pathfinders = (('junction graph', JunctionGraph), (f'chunks of {chunk_size}', lambda grid: ChunkGraph(grid, chunk_size)))
+    for name, build in pathfinders:
+        start = time.perf_counter()
+        pathfinder = build(grid)
+        built = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for (first, second), length in zip(pairs, lengths):
+            if len(pathfinder.search(first, second)) - 1 != length:
+                raise ValueError(f'{name} found a longer path from {grid.coord(first)} to {grid.coord(second)}')
+        print(f'    {name:<16} {built * 1000:7.0f} ms {(time.perf_counter() - start) * 1000 / queries:8.2f} ms/path')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pathfinders on a large maze.")
+    parser.add_argument('--size', type=int, default=501, help="width and height of the maze")
+    parser.add_argument('--chunk', type=int, default=16, help="width and height of the chunks")
+    parser.add_argument('--queries', type=int, default=50, help="number of paths searched")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the maze")
+    args = parser.parse_args()
+
+    benchmark(args.size, args.chunk, args.queries, args.seed)
@@ -1,6 +1,7 @@
-import random  # to randomly choose player's position
 import math  # to compute euclidian distance
 from GameFiles.Observer_Observable_logic import Observable
+from GameFiles.MazeGrid import WALL
+from GameFiles.SaveJournal import PLAYER_MOVED, MONSTER_MOVED, TRAP_CHANGED, LIFE_CHANGED
 
 class Player(Observable):
     """Class representing the player in the maze game. Inherits from Observable to manage the gui accoring to player's actions.
@@ -9,7 +10,7 @@ class Player(Observable):
         game_state (dict): Contains the state of the game
         monster (Monster): The monster object that interacts with the player
         mazeGame (MazeGame):the mazeGame object
-        maze (list): 2D list representing the maze
+        maze (MazeGrid): grid representing the maze
         maze_size (tuple): Dimensions of the maze
     """
 
@@ -42,28 +43,27 @@ class Player(Observable):
             coord (Tuple): the initial coordinates of the player chosen randomly in the maze's border.
         """
         border = 1 / 10
-        coord = [0, 0]
 
-        while self.maze[coord[0]][coord[1]].type == "wall":
-            coord = []
+        # coordinates of the border band along each axis, computed once for the level
+        bands = []
+        for j in range(2):
+            list_border = list(range(1, math.ceil(self.maze_size[j] * border)))
+            list_border += list(range(math.floor(self.maze_size[j] * (1 - border)), self.maze_size[j]))
+            bands.append(set(list_border[:math.floor(2*(self.maze_size[j]-1) * border)]))
 
-            for j in range(2):
-                pos_init = random.randint(0, math.floor(2*(self.maze_size[j]-1) * border) - 1)
-                list_border = []
-
-                for i in range(1, math.ceil(self.maze_size[j] * border)):
-                    list_border += [i]
-
-                for i in range(math.floor(self.maze_size[j] * (1 - border)), (self.maze_size[j])):
-                    list_border += [i]
-
-                coord += [list_border[pos_init]]
-
-        return tuple(coord)
+        allocator = self.mazeGame.spawn_allocator()
+        coord = allocator.draw('border', lambda x, y: x in bands[0] and y in bands[1])
+        if coord is None:
+            coord = allocator.draw()  # no free path in the border band
+        return coord
 
     def reset_position(self):
         """ Reset player position """
+        previous = self.game_state['player_position']
         self.game_state['player_position'] = self.init_player_pos()
+        if previous is not None:
+            self.mazeGame.spawn_allocator().release(previous)
+        self.mazeGame.occupancy_grid().place('player', self.game_state['player_position'])
 
     def move_player(self, event):
         """Change the player's character's coordinates depending on the player's input.
@@ -87,44 +87,65 @@ class Player(Observable):
             else:
                 new_position = self.game_state['player_position']
 
-            if self.maze[new_position[0]][new_position[1]].type != 'wall':
+            if self.maze.get(new_position[0], new_position[1]) != WALL:
                 self.game_state['player_position'] = new_position
+                self.monster.distance_field.update(new_position)  # a single step, see DistanceField.move
+                self.mazeGame.occupancy_grid().place('player', new_position)
 
                 self.notify_observer("move", event.keysym)  # tell the observer that the player moved
                 self.check_collision()  # check collision with the future position of the player
 
             self.monster.move()  # because the monster move at the same time as the player
 
-    def check_collision(self):
-        """ Check for collision of the player with game elements (traps, treasure or monsters) """
-        if self.game_state['player_position'] == self.game_state['monster_position']:
-            self.lose_life()
+            # save the positions at the end of the turn
+            self.mazeGame.log_event(PLAYER_MOVED, *self.game_state['player_position'])
+            self.mazeGame.log_event(MONSTER_MOVED, *self.game_state['monster_position'])
 
-            self.game_state['monster_position'] = self.monster.init_monster_pos()
+    def check_collision(self):
+        """ Check for collision of the player with game elements (traps, treasure or monsters), only looking at the
+        entities on the cells of the player and of the monster """
+        occupancy = self.mazeGame.occupancy_grid()
+        player_position = self.game_state['player_position']
+        on_player = occupancy.at(player_position)
 
-        for trap_coord, [activated, type] in self.game_state['traps'].items():
-            if self.game_state['player_position'] == trap_coord and not activated:
-                self.lose_life()
+        if 'monster' in on_player:
+            self.lose_life()
 
-                self.notify_observer("trap", trap_coord)  # tell the observer the trap is at the same position as the player
-                self.game_state['traps'][trap_coord] = [True, type]
+            self.monster.reset_position()
 
-            # traps can kill the monster
-            elif self.game_state['monster_position'] == trap_coord and not activated:
-                self.game_state['monster_position'] = self.monster.init_monster_pos()
+        if ('trap', player_position) in on_player:
+            self.lose_life()
 
-                self.notify_observer("trap", trap_coord)  # tell the observer the trap is at the same position as the monster
-                self.game_state['traps'][trap_coord] = [True, type]
+            self.notify_observer("trap", player_position)  # tell the observer the trap is at the same position as the player
+            self.activate_trap(player_position)
 
+        # traps can kill the monster, and the respawned monster can land on another trap
+        monster_position = self.game_state['monster_position']
+        while ('trap', monster_position) in occupancy.at(monster_position):
+            self.monster.reset_position()
 
+            self.notify_observer("trap", monster_position)  # tell the observer the trap is at the same position as the monster
+            self.activate_trap(monster_position)
+            monster_position = self.game_state['monster_position']
 
-        if self.game_state['player_position'] == self.game_state['treasure_position']:
+        if 'treasure' in on_player:
             self.notify_observer("treasure")  # tell the observer the treasure is reached
             self.mazeGame.win_game()
 
+    def activate_trap(self, trap_coord):
+        """Activate a trap so that it can't be activated a second time.
+
+        Args:
+            trap_coord (tuple): The coordinates of the trap
+        """
+        self.game_state['traps'][trap_coord] = [True, self.game_state['traps'][trap_coord][1]]
+        self.mazeGame.occupancy_grid().remove(('trap', trap_coord))
+        self.mazeGame.log_event(TRAP_CHANGED, *trap_coord, 1)
+
     def lose_life(self):
         """ Decrease the player's life by one and check for game over """
         self.game_state['life'] -= 1
+        self.mazeGame.log_event(LIFE_CHANGED, value=self.game_state['life'])
         self.notify_observer("life")  # tell the observer the player lost life
         if self.game_state['life'] <= 0:
             self.mazeGame.lose_game()
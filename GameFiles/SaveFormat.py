@@ -0,0 +1,322 @@
+import os  # for file gestion
+import mmap  # to read the grid of the big saves lazily
+import struct  # to pack the header and the traps
+import zlib  # to compress the saves and checksum them
+import time  # to measure the save and load times
+import argparse  # for the command line
+
+from GameFiles.MazeGrid import MazeGrid, WALL, PATH
+
+# a save is the header then the payload: the name of the maze generator, the grid and the traps, optionally compressed.
+# The grid of a big maze is stored raw right after the header instead, at a fixed offset, so that it can be mapped in
+# memory and used as the grid without reading it, the payload after it only having the CRC32 of the grid in its place
+SAVE_MAGIC = b'DMZS'
+SAVE_VERSION = 1  # to increase when the format changes, the saves of other versions are refused
+SAVE_HEADER = struct.Struct('<4sHHIIIiidq6iIBII')  # see encode_save
+SAVE_TRAP = struct.Struct('<IIB')  # x, y, type in the 7 low bits and activated in the high bit
+
+# flags of the header
+COMPRESSED = 1  # the payload is compressed with zlib
+BYTE_GRID = 2  # the grid has a byte per cell instead of a bit, when it has other cells than walls and paths
+MAPPED_GRID = 4  # the grid is stored raw between the header and the payload
+
+MAPPED_CELLS = 256 * 256  # number of cells from which the grid is stored raw to be mapped
+GRID_CHECKSUM = struct.Struct('<I')  # CRC32 of a raw grid, at the start of the payload
+
+NO_SEED = -1  # seed stored for the old levels that have none
+NO_POSITION = (-1, -1)  # position stored for the elements not placed
+
+# to convert between the cell codes and the characters of a binary number
+CODES_TO_BITS = bytes.maketrans(bytes([WALL, PATH]), b'01')
+BITS_TO_CODES = bytes.maketrans(b'01', bytes([WALL, PATH]))
+
+
+def pack_grid(cells):
+    """Pack a grid of walls and paths with one bit per cell, the first cell being the highest bit.
+
+    Args:
+        cells (bytearray): The cell codes of the grid, only WALL or PATH
+
+    Returns:
+        (bytes): The packed grid, padded with zeros to a whole number of bytes
+    """
+    bits = bytes(cells).translate(CODES_TO_BITS) + b'0' * (-len(cells) % 8)
+    return int(bits, 2).to_bytes(len(bits) // 8, 'big') if bits else b''
+
+
+def unpack_grid(data, nb_cells):
+    """Unpack a grid packed by pack_grid.
+
+    Args:
+        data (bytes): The packed grid
+        nb_cells (int): The number of cells of the grid
+
+    Returns:
+        (bytearray): The cell codes of the grid
+    """
+    if not nb_cells:
+        return bytearray()
+    bits = bin(int.from_bytes(data, 'big'))[2:].zfill(len(data) * 8)
+    return bytearray(bits[:nb_cells].encode().translate(BITS_TO_CODES))
+
+
+def encode_save(game_state, generation=0, compress=True, mapped=None):
+    """Serialize a game_state in the binary save format.
+
+    The header holds every scalar of the game_state: magic, format version, flags, generation, maze width and height,
+    life, level, score, seed, positions of the player, the monster and the treasure, number of traps, length of the
+    name of the maze generator, length of the payload, and the CRC32 of the header and payload. The payload holds the
+    name of the maze generator, the grid (or its CRC32 if the grid is stored raw before the payload) and the table of
+    the traps.
+
+    Args:
+        game_state (dict): The game_state to save
+        generation (int): The number of the save, increased at every save of the game
+        compress (bool): Compress the payload with zlib
+        mapped (bool): Store the grid raw so that it can be mapped when loading, by default only for the big mazes
+
+    Returns:
+        (bytes): The save
+    """
+    maze = game_state['maze']
+    codes = maze.codes()
+    flags = COMPRESSED if compress else 0
+    if mapped is None:
+        mapped = len(codes) >= MAPPED_CELLS
+
+    raw_grid = b''
+    if mapped:
+        flags |= MAPPED_GRID
+        raw_grid = bytes(codes)
+        grid = GRID_CHECKSUM.pack(zlib.crc32(raw_grid))
+    elif codes.translate(None, bytes([WALL, PATH])):
+        flags |= BYTE_GRID  # the grid is not fully generated
+        grid = bytes(codes)
+    else:
+        grid = pack_grid(codes)
+
+    traps = b''.join(SAVE_TRAP.pack(x, y, type | (activated << 7))
+                     for (x, y), [activated, type] in game_state['traps'].items())
+
+    algorithm = game_state['algorithm'].encode()
+    payload = algorithm + grid + traps
+    if compress:
+        payload = zlib.compress(payload)
+
+    positions = []
+    for element in ('player_position', 'monster_position', 'treasure_position'):
+        positions += game_state[element] if game_state[element] is not None else NO_POSITION
+
+    seed = game_state['seed'] if game_state['seed'] is not None else NO_SEED
+    header = [SAVE_MAGIC, SAVE_VERSION, flags, generation, *maze.maze_size, game_state['life'], game_state['level'],
+              game_state['score'], seed, *positions, len(game_state['traps']), len(algorithm), len(payload)]
+
+    checksum = zlib.crc32(payload, zlib.crc32(SAVE_HEADER.pack(*header, 0)))
+    return SAVE_HEADER.pack(*header, checksum) + raw_grid + payload
+
+
+def decode_save(data):
+    """Deserialize a save written by encode_save.
+
+    If the grid is stored raw and the data is writable (a save file mapped with read_save), the grid of the game_state
+    directly uses the data, the cells being read only when accessed. The CRC32 of the grid is then checked the first
+    time every cell is needed, see MazeGrid.verify.
+
+    Args:
+        data (bytes): The save, or a writable buffer of it like a mmap
+
+    Returns:
+        game_state (dict): The saved game_state
+        generation (int): The number of the save
+
+    Raises:
+        ValueError: If the data is not a save of this version, or is corrupted
+    """
+    if len(data) < SAVE_HEADER.size:
+        raise ValueError("the save is truncated")
+
+    (magic, version, flags, generation, width, height, life, level, score, seed, *positions, nb_traps,
+     algorithm_length, payload_length, checksum) = SAVE_HEADER.unpack_from(data)
+    if magic != SAVE_MAGIC:
+        raise ValueError("not a save")
+    if version != SAVE_VERSION:
+        raise ValueError(f"save of version {version}, only version {SAVE_VERSION} can be read")
+
+    nb_cells = width * height
+    start = SAVE_HEADER.size + (nb_cells if flags & MAPPED_GRID else 0)  # start of the payload
+    payload = data[start:start + payload_length]
+    header = SAVE_HEADER.pack(*SAVE_HEADER.unpack_from(data)[:-1], 0)
+    if len(payload) != payload_length or zlib.crc32(payload, zlib.crc32(header)) != checksum:
+        raise ValueError("the save is corrupted")
+
+    if flags & COMPRESSED:
+        payload = zlib.decompress(payload)
+
+    if flags & MAPPED_GRID:
+        grid_length = GRID_CHECKSUM.size  # only the checksum of the grid is in the payload
+    elif flags & BYTE_GRID:
+        grid_length = nb_cells
+    else:
+        grid_length = (nb_cells + 7) // 8
+
+    algorithm = payload[:algorithm_length].decode()
+    grid = payload[algorithm_length:algorithm_length + grid_length]
+    grid_checksum = None
+    if flags & MAPPED_GRID:
+        view = memoryview(data)
+        cells = view[SAVE_HEADER.size:start]
+        if len(cells) != nb_cells:
+            raise ValueError("the save is truncated")
+        grid_checksum = GRID_CHECKSUM.unpack(grid)[0]
+        if view.readonly:
+            # the grid can't be used in place, it is copied and checked
+            cells = bytearray(cells)
+            if zlib.crc32(cells) != grid_checksum:
+                raise ValueError("the save is corrupted")
+            grid_checksum = None
+    elif flags & BYTE_GRID:
+        cells = bytearray(grid)
+    else:
+        cells = unpack_grid(grid, nb_cells)
+
+    traps = {}
+    for x, y, packed in SAVE_TRAP.iter_unpack(payload[algorithm_length + grid_length:]):
+        traps[(x, y)] = [bool(packed >> 7), packed & 0x7f]
+    if len(traps) != nb_traps:
+        raise ValueError("the save is corrupted")
+
+    def position(ind):
+        """Get back a position of the header"""
+        coord = tuple(positions[2 * ind:2 * ind + 2])
+        return None if coord == NO_POSITION else coord
+
+    game_state = {
+        'maze': MazeGrid((width, height), cells=cells, checksum=grid_checksum),
+        'maze_size': (width, height),
+        'life': life,
+        'level': level,
+        'score': score,
+        'player_position': position(0),
+        'monster_position': position(1),
+        'traps': traps,
+        'treasure_position': position(2),
+        'seed': seed if seed != NO_SEED else None,
+        'algorithm': algorithm
+    }
+    return game_state, generation
+
+
+def write_save(filename, game_state, generation=0, compress=True, mapped=None):
+    """Write a save file, never leaving a partially written save if the game stops while writing.
+    The grid of the game_state must not be mapped from the same file, see MazeGrid.detach.
+
+    Args:
+        filename (str): The save file
+        game_state (dict): The game_state to save
+        generation (int): The number of the save
+        compress (bool): Compress the payload with zlib
+        mapped (bool): Store the grid raw so that it can be mapped when loading, by default only for the big mazes
+
+    Returns:
+        (int): The checksum of the save, see save_checksum
+    """
+    data = encode_save(game_state, generation, compress, mapped)
+    with open(filename + '.tmp', 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())  # the save is on the disk before replacing the previous one
+    os.replace(filename + '.tmp', filename)
+    return SAVE_HEADER.unpack_from(data)[-1]
+
+
+def read_save(filename, lazy=True):
+    """Read a save file. If its grid is stored raw, the file is mapped in memory and the grid of the game_state uses it
+    directly: the loading doesn't depend on the size of the maze, the cells being read from the disk when accessed.
+    The mapping is copy-on-write, changing the grid never changes the file.
+
+    Args:
+        filename (str): The save file
+        lazy (bool): Map the grid when it is stored raw, instead of reading and checking it
+
+    Returns:
+        game_state (dict): The saved game_state
+        generation (int): The number of the save
+
+    Raises:
+        ValueError: If the file is not a save of this version, or is corrupted
+    """
+    with open(filename, 'rb') as file:
+        header = file.read(SAVE_HEADER.size)
+        if lazy and len(header) == SAVE_HEADER.size and SAVE_HEADER.unpack(header)[2] & MAPPED_GRID:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        else:
+            data = header + file.read()
+    return decode_save(data)
+
+
+def save_checksum(filename):
+    """Get the checksum of a save file, which identifies the save without reading it entirely.
+
+    Args:
+        filename (str): The save file
+
+    Returns:
+        (int): The CRC32 of the header and payload of the save, None if the file is not a save
+    """
+    with open(filename, 'rb') as file:
+        header = file.read(SAVE_HEADER.size)
+    if len(header) < SAVE_HEADER.size or SAVE_HEADER.unpack(header)[0] != SAVE_MAGIC:
+        return None
+    return SAVE_HEADER.unpack(header)[-1]
+
+
+def benchmark(sizes=(12, 51, 101, 201, 401)):
+    """Print the size and the time taken to save and load levels of different sizes, in the old CSV format and in
+    the binary format with and without compression, and with the grid mapped.
+
+    Args:
+        sizes (tuple): Width and height of the mazes of the benchmarked levels, the saves are written in the saves
+            directory then removed
+    """
+    from GameFiles.MazeGame import MazeGame  # not needed by the game to read and write saves
+    from GameFiles.Player import Player
+    from GameFiles.Monster import Monster
+    from GameFiles.GameElements import GameElements
+
+    for size in sizes:
+        game = MazeGame((size, size), seed=size)
+        game.generate_maze()
+        Player(game.game_state, game)
+        Monster(game.game_state)
+        GameElements(game.game_state, size, game.rng, game.spawn_allocator())
+        print(f'{size}x{size}')
+
+        filename = './data/saves/benchmark.csv'
+        start = time.perf_counter()
+        game.save_csv_game('benchmark.csv')
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        game.load_csv_game('benchmark.csv')
+        loaded = time.perf_counter() - start
+        print(f'    {"csv":<12} {os.path.getsize(filename) / 1000:9.1f} kB   save {saved * 1000:8.2f} ms   load {loaded * 1000:8.2f} ms')
+        os.remove(filename)
+
+        filename = './data/saves/benchmark.sav'
+        for name, compress, mapped in (('binary', False, False), ('binary+zlib', True, False), ('mapped', True, True)):
+            start = time.perf_counter()
+            write_save(filename, game.game_state, 0, compress, mapped)
+            saved = time.perf_counter() - start
+            start = time.perf_counter()
+            game_state, _ = read_save(filename)
+            loaded = time.perf_counter() - start
+            game_state['maze'].detach()  # to remove the file
+            print(f'    {name:<12} {os.path.getsize(filename) / 1000:9.1f} kB   save {saved * 1000:8.2f} ms   load {loaded * 1000:8.2f} ms')
+        os.remove(filename)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the save formats.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=(12, 51, 101, 201, 401), help="maze sizes of the benchmarked levels")
+    args = parser.parse_args()
+
+    benchmark(args.sizes)
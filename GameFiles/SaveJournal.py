@@ -0,0 +1,211 @@
+import os  # for file gestion
+import struct  # to pack the events
+import zlib  # to checksum the events
+
+# the journal is the header then the events, one record per event appended as the game is played
+JOURNAL_MAGIC = b'DMZJ'
+JOURNAL_HEADER = struct.Struct('<4sI')  # magic, checksum of the snapshot the events apply to
+JOURNAL_RECORD = struct.Struct('<BiidI')  # kind of event, x, y, value, CRC32 of the record before it
+
+# kinds of events
+PLAYER_MOVED = 1  # the player is at (x, y)
+MONSTER_MOVED = 2  # the monster is at (x, y)
+TRAP_CHANGED = 3  # the trap at (x, y) is activated if value is 1, not activated if value is 0
+LIFE_CHANGED = 4  # the player has value lives
+SCORE_CHANGED = 5  # the score is value
+
+BATCH_SIZE = 32  # number of events kept in memory before being written
+COMPACT_RECORDS = 4096  # number of events in the journal from which a new snapshot should be saved
+
+
+class SaveJournal:
+    """Append-only journal of the events of a game since its last snapshot (the save written by SaveFormat). The events
+    are small fixed-size records written in batches, so that the game is saved continuously without rewriting the
+    whole save. Loading the game is loading the snapshot then replaying the journal over it, see replay_journal.
+
+    The journal starts with the checksum of its snapshot, see SaveFormat.save_checksum. Saving a new snapshot (the
+    compaction) starts a new empty journal, the events being in the snapshot: a journal left from an older snapshot,
+    if the game stopped in between, is ignored when replaying. When the snapshot is written in the background (see
+    SaveWriter), the events keep being written in the old journal until it is saved, then the ones logged since it was
+    requested are written in the new journal.
+
+    Attributes:
+        filename (str): The journal file
+        snapshot (int): The checksum of the snapshot the events apply to
+        pending (list): The packed events not written yet
+        nb_records (int): The number of events in the journal, written or not
+        file (file): The journal file opened to append, None before start
+        rotation (Future): The snapshot being written in the background, giving its checksum, None if there is none
+        carried (list): The packed events logged since the snapshot being written was requested
+    """
+
+    __slots__ = ['filename', 'snapshot', 'pending', 'nb_records', 'file', 'rotation', 'carried']
+
+    def __init__(self, filename):
+        """Initialize the SaveJournal instance, the journal file is only written by start.
+
+        Args:
+            filename (str): The journal file
+        """
+        self.filename = filename
+        self.snapshot = None
+        self.pending = []
+        self.nb_records = 0
+        self.file = None
+        self.rotation = None
+        self.carried = []
+
+    def start(self, snapshot, records=()):
+        """Start a new journal for a snapshot just saved, replacing the previous journal.
+
+        Args:
+            snapshot (int): The checksum of the snapshot
+            records (list): The packed events already logged after the snapshot
+        """
+        self.close()  # the open journal can't be replaced on every system
+        with open(self.filename + '.tmp', 'wb') as file:
+            file.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, snapshot))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(self.filename + '.tmp', self.filename)
+
+        self.snapshot = snapshot
+        self.pending = list(records)
+        self.nb_records = len(self.pending)
+        self.file = open(self.filename, 'ab')
+
+    def resume(self, snapshot, nb_records):
+        """Go on with the journal of a snapshot just loaded, after its events replayed, instead of saving the snapshot
+        again. What follows the replayed events (an event partially written when the game stopped) is cut off. A
+        journal missing or of another snapshot is replaced by a new one, see start.
+
+        Args:
+            snapshot (int): The checksum of the snapshot
+            nb_records (int): The number of events replayed from the journal, see replay_journal
+        """
+        self.close()
+        try:
+            with open(self.filename, 'rb') as file:
+                header = file.read(JOURNAL_HEADER.size)
+        except FileNotFoundError:
+            header = b''
+        if header != JOURNAL_HEADER.pack(JOURNAL_MAGIC, snapshot):
+            self.start(snapshot)
+            return
+
+        self.snapshot = snapshot
+        self.pending = []
+        self.nb_records = nb_records
+        self.file = open(self.filename, 'r+b')
+        self.file.truncate(JOURNAL_HEADER.size + nb_records * JOURNAL_RECORD.size)
+        self.file.seek(0, os.SEEK_END)
+
+    def rotate(self, future):
+        """Start a new journal once the snapshot being written in the background is saved, see poll.
+
+        Args:
+            future (Future): The result of the write of the snapshot, giving its checksum
+        """
+        if self.rotation is not None and self.rotation is not future:
+            self.poll(wait=True)  # the new journal of the previous snapshot has to be started first
+        self.rotation = future
+        self.carried = []  # the snapshot has every event logged until now
+
+    def poll(self, wait=False):
+        """Start the new journal if the snapshot being written in the background is saved.
+
+        Args:
+            wait (bool): Wait until the snapshot is saved
+        """
+        if self.rotation is None or not (wait or self.rotation.done()):
+            return
+
+        rotation, carried = self.rotation, self.carried
+        self.rotation, self.carried = None, []
+        try:
+            snapshot = rotation.result()
+        except Exception as error:
+            print(f"The game could not be saved: {error}")  # the old journal still completes the old snapshot
+        else:
+            self.start(snapshot, carried)
+
+    def log(self, kind, x=0, y=0, value=0):
+        """Add an event to the journal, writing the pending events if there are enough of them.
+
+        Args:
+            kind (int): The kind of event (PLAYER_MOVED, MONSTER_MOVED, TRAP_CHANGED, LIFE_CHANGED or SCORE_CHANGED)
+            x (int): The x-coordinate of the event
+            y (int): The y-coordinate of the event
+            value (float): The value of the event
+
+        Returns:
+            (bool): True if the journal is long enough to be compacted into a new snapshot, and none is being written
+        """
+        self.poll()
+
+        record = JOURNAL_RECORD.pack(kind, x, y, value, 0)[:-4]
+        record += zlib.crc32(record).to_bytes(4, 'little')
+        self.pending.append(record)
+        if self.rotation is not None:
+            self.carried.append(record)
+        self.nb_records += 1
+        if len(self.pending) >= BATCH_SIZE:
+            self.flush()
+        return self.nb_records >= COMPACT_RECORDS and self.rotation is None
+
+    def flush(self):
+        """Write the pending events to the disk."""
+        if self.pending and self.file is not None:
+            self.file.write(b''.join(self.pending))
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        self.pending = []
+
+    def close(self):
+        """Wait for the snapshot being written, write the pending events and close the journal file."""
+        self.poll(wait=True)
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def replay_journal(filename, game_state, snapshot):
+    """Apply to a game_state the events of the journal of its snapshot. The events after a partially written one are
+    ignored, as the game stopped while writing it.
+
+    Args:
+        filename (str): The journal file
+        game_state (dict): The game_state loaded from the snapshot, updated in place
+        snapshot (int): The checksum of the snapshot
+
+    Returns:
+        nb_events (int): The number of events replayed, 0 if the journal is missing or belongs to another snapshot
+    """
+    try:
+        with open(filename, 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        return 0
+
+    if len(data) < JOURNAL_HEADER.size or JOURNAL_HEADER.unpack_from(data) != (JOURNAL_MAGIC, snapshot):
+        return 0
+
+    nb_events = 0
+    for start in range(JOURNAL_HEADER.size, len(data) - JOURNAL_RECORD.size + 1, JOURNAL_RECORD.size):
+        kind, x, y, value, checksum = JOURNAL_RECORD.unpack_from(data, start)
+        if zlib.crc32(data[start:start + JOURNAL_RECORD.size - 4]) != checksum:
+            break
+
+        if kind == PLAYER_MOVED:
+            game_state['player_position'] = (x, y)
+        elif kind == MONSTER_MOVED:
+            game_state['monster_position'] = (x, y)
+        elif kind == TRAP_CHANGED and (x, y) in game_state['traps']:
+            game_state['traps'][(x, y)][0] = bool(value)
+        elif kind == LIFE_CHANGED:
+            game_state['life'] = int(value)
+        elif kind == SCORE_CHANGED:
+            game_state['score'] = value
+        nb_events += 1
+    return nb_events
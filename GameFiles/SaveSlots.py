@@ -0,0 +1,177 @@
+import os  # for file gestion
+import struct  # to pack the index
+import threading  # the index is updated by the save writer thread
+import time  # to date the saves
+
+from GameFiles.SaveFormat import write_save
+
+NB_SLOTS = 3
+LEGACY_SLOT = 1  # slot of the save of the versions before the slots, the old CSV save is imported in it
+
+# the index is the header, an entry per slot, then the thumbnails of the slots
+INDEX_FILE = './data/saves/slots.index'
+INDEX_MAGIC = b'DMZI'
+INDEX_VERSION = 1  # to increase when the format of the index changes, an index of another version is ignored
+INDEX_HEADER = struct.Struct('<4sHH')  # magic, version, number of entries
+INDEX_ENTRY = struct.Struct('<BIidIIdIHH')  # slot, level, life, score, width, height, timestamp, thumbnail offset, thumbnail width and height
+
+THUMBNAIL_SIZE = 48  # maximum width and height of the thumbnails, in pixels
+# pixel codes of the thumbnails, the cells of the maze being WALL or PATH
+THUMBNAIL_PLAYER = 2
+THUMBNAIL_TREASURE = 3
+
+index_lock = threading.Lock()
+
+
+def slot_filename(slot):
+    """Get the name of the save file of a slot, in the saves directory.
+
+    Args:
+        slot (int): The slot, from 1 to NB_SLOTS
+
+    Returns:
+        (str): The name of the save file
+    """
+    return 'savegame.sav' if slot == LEGACY_SLOT else f'savegame{slot}.sav'
+
+
+def file_slot(filename):
+    """Get the slot of a save file.
+
+    Args:
+        filename (str): The path or name of the save file
+
+    Returns:
+        (int): The slot, None if the file is not the save of a slot
+    """
+    for slot in range(1, NB_SLOTS + 1):
+        if os.path.basename(filename) == slot_filename(slot):
+            return slot
+    return None
+
+
+def load_slot(game, slot):
+    """Load the save of a slot in a game.
+
+    Args:
+        game (MazeGame): The game to load the save in
+        slot (int): The slot
+    """
+    game.load_game(slot_filename(slot), 'savegame.csv' if slot == LEGACY_SLOT else None)
+
+
+def make_thumbnail(game_state):
+    """Make a small picture of a level by sampling its maze, with the player and the treasure.
+
+    Args:
+        game_state (dict): The game_state of the level
+
+    Returns:
+        size (tuple): The width and height of the thumbnail
+        pixels (bytes): The pixel codes (WALL, PATH, THUMBNAIL_PLAYER or THUMBNAIL_TREASURE), row by row
+    """
+    width, height = game_state['maze_size']
+    thumbnail_w, thumbnail_h = min(width, THUMBNAIL_SIZE), min(height, THUMBNAIL_SIZE)
+    cells = game_state['maze'].cells
+
+    pixels = bytearray(thumbnail_w * thumbnail_h)
+    for j in range(thumbnail_h):
+        y = j * height // thumbnail_h
+        for i in range(thumbnail_w):
+            pixels[j * thumbnail_w + i] = cells[(i * width // thumbnail_w) * height + y]
+
+    for element, code in (('player_position', THUMBNAIL_PLAYER), ('treasure_position', THUMBNAIL_TREASURE)):
+        if game_state[element] is not None:
+            x, y = game_state[element]
+            pixels[(y * thumbnail_h // height) * thumbnail_w + x * thumbnail_w // width] = code
+    return (thumbnail_w, thumbnail_h), bytes(pixels)
+
+
+def read_index(filename=INDEX_FILE):
+    """Read the index of the slots, in a single read of a small file, without opening any save.
+
+    Args:
+        filename (str): The index file
+
+    Returns:
+        slots (dict): For every saved slot, a dictionary with its level, life, score, maze_size, timestamp and
+            thumbnail (see make_thumbnail)
+    """
+    try:
+        with open(filename, 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        return {}
+
+    if len(data) < INDEX_HEADER.size:
+        return {}
+    magic, version, nb_entries = INDEX_HEADER.unpack_from(data)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION:
+        return {}
+
+    slots = {}
+    for ind in range(nb_entries):
+        slot, level, life, score, width, height, timestamp, offset, thumbnail_w, thumbnail_h = \
+            INDEX_ENTRY.unpack_from(data, INDEX_HEADER.size + ind * INDEX_ENTRY.size)
+        slots[slot] = {
+            'level': level,
+            'life': life,
+            'score': score,
+            'maze_size': (width, height),
+            'timestamp': timestamp,
+            'thumbnail': ((thumbnail_w, thumbnail_h), data[offset:offset + thumbnail_w * thumbnail_h])
+        }
+    return slots
+
+
+def write_index(slots, filename=INDEX_FILE):
+    """Write the index of the slots, replacing the previous one.
+
+    Args:
+        slots (dict): The information of every saved slot, see read_index
+        filename (str): The index file
+    """
+    entries = []
+    thumbnails = []
+    offset = INDEX_HEADER.size + len(slots) * INDEX_ENTRY.size
+    for slot, info in sorted(slots.items()):
+        (thumbnail_w, thumbnail_h), pixels = info['thumbnail']
+        entries.append(INDEX_ENTRY.pack(slot, info['level'], info['life'], info['score'], *info['maze_size'],
+                                        info['timestamp'], offset, thumbnail_w, thumbnail_h))
+        thumbnails.append(pixels)
+        offset += len(pixels)
+
+    with open(filename + '.tmp', 'wb') as file:
+        file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(slots)) + b''.join(entries) + b''.join(thumbnails))
+    os.replace(filename + '.tmp', filename)
+
+
+def write_slot_save(filename, game_state, generation=0):
+    """Write a save file (see SaveFormat.write_save), then update the index if it is the save of a slot.
+
+    Args:
+        filename (str): The save file
+        game_state (dict): The game_state to save
+        generation (int): The number of the save
+
+    Returns:
+        (int): The checksum of the save
+    """
+    checksum = write_save(filename, game_state, generation)
+
+    slot = file_slot(filename)
+    if slot is not None:
+        info = {
+            'level': game_state['level'],
+            'life': game_state['life'],
+            'score': game_state['score'],
+            'maze_size': game_state['maze_size'],
+            'timestamp': time.time(),
+            'thumbnail': make_thumbnail(game_state)
+        }
+        index_filename = os.path.join(os.path.dirname(filename), os.path.basename(INDEX_FILE))
+        with index_lock:
+            slots = read_index(index_filename)
+            slots[slot] = info
+            write_index(slots, index_filename)
+    return checksum
@@ -0,0 +1,89 @@
+import threading  # to share the save requests with the worker thread
+from concurrent.futures import ThreadPoolExecutor, wait  # to write the saves in a worker thread
+
+from GameFiles.SaveFormat import write_save
+
+
+def freeze(game_state):
+    """Copy a game_state so that the game can go on while it is being saved. The maze is shared and not copied, it
+    doesn't change once the level is generated.
+
+    Args:
+        game_state (dict): The game_state to copy
+
+    Returns:
+        (dict): The copy of the game_state
+    """
+    snapshot = dict(game_state)
+    snapshot['traps'] = {coord: list(trap) for coord, trap in game_state['traps'].items()}
+    return snapshot
+
+
+class SaveWriter:
+    """Writes the saves in a worker thread, so that serializing the game_state and writing it to the disk never block
+    the event loop of the game. A save requested while an older request for the same file is still waiting replaces it,
+    only the latest state is written.
+
+    Attributes:
+        write_function (function): The function writing a save from (filename, game_state, generation) and returning
+            its checksum
+        executor (ThreadPoolExecutor): The executor writing the saves in a single worker thread, one after the other
+        lock (Lock): The lock protecting the waiting requests
+        requests (dict): The (game_state, generation) waiting to be written, by filename
+        futures (dict): The result of the last write of every file, giving the checksum of the save
+    """
+
+    __slots__ = ['write_function', 'executor', 'lock', 'requests', 'futures']
+
+    def __init__(self, write_function=write_save):
+        """Initialize the SaveWriter instance.
+
+        Args:
+            write_function (function): The function writing a save from (filename, game_state, generation) and
+                returning its checksum, see SaveFormat.write_save
+        """
+        self.write_function = write_function
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='save-writer')
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.futures = {}
+
+    def save(self, filename, game_state, generation=0):
+        """Request a save of a game_state. A copy of the game_state is taken so that it can change while being saved.
+
+        Args:
+            filename (str): The save file
+            game_state (dict): The game_state to save
+            generation (int): The number of the save
+
+        Returns:
+            (Future): The result of the write, giving the checksum of the save, see SaveFormat.write_save
+        """
+        with self.lock:
+            waiting = filename in self.requests
+            self.requests[filename] = (freeze(game_state), generation)
+        if not waiting:
+            self.futures[filename] = self.executor.submit(self.write, filename)
+        return self.futures[filename]
+
+    def write(self, filename):
+        """Write the latest requested save of a file, in the worker thread.
+
+        Args:
+            filename (str): The save file
+
+        Returns:
+            (int): The checksum of the save
+        """
+        with self.lock:
+            game_state, generation = self.requests.pop(filename)
+        return self.write_function(filename, game_state, generation)
+
+    def flush(self):
+        """Wait until every requested save is written, before the game stops or loads a save."""
+        wait(list(self.futures.values()))
+
+    def shutdown(self):
+        """Write the requested saves then stop the worker thread."""
+        self.flush()
+        self.executor.shutdown(wait=True)
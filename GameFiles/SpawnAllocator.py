@@ -0,0 +1,169 @@
+import random  # default random number generator
+
+from GameFiles.MazeGrid import PATH
+
+
+class CellPool:
+    """Indexable set of cells: adding, removing and drawing a random cell are all O(1).
+    A removed cell is swapped with the last one of the list, so that the list never has holes.
+
+    Attributes:
+        cells (list): The cell indexes of the pool, in no particular order
+        positions (dict): The position of every cell in the cells list, by cell index
+    """
+
+    __slots__ = ['cells', 'positions']
+
+    def __init__(self, cells=()):
+        """Initialize the CellPool instance.
+
+        Args:
+            cells (iterable): The cell indexes initially in the pool
+        """
+        self.cells = list(cells)
+        self.positions = {cell: position for position, cell in enumerate(self.cells)}
+
+    def add(self, cell):
+        """Add a cell to the pool if it is not already in it."""
+        if cell not in self.positions:
+            self.positions[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell):
+        """Remove a cell from the pool if it is in it."""
+        position = self.positions.pop(cell, None)
+        if position is not None:
+            last = self.cells.pop()
+            if last != cell:
+                # the last cell takes the place of the removed one
+                self.cells[position] = last
+                self.positions[last] = position
+
+    def draw(self, rng=random):
+        """Get a random cell of the pool, without removing it.
+
+        Args:
+            rng (random.Random): The random number generator to use
+
+        Returns:
+            (int): The cell index of the drawn cell, None if the pool is empty
+        """
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.positions
+
+
+class SpawnAllocator:
+    """Spawn positions of the elements of a level (player, treasure, traps), built once per level. It keeps the free
+    path cells in pools: every spawn is a constant-time draw in a pool, the drawn cell being removed from every pool
+    so that two elements never spawn on the same cell.
+
+    The 'free' pool has every free path cell. Other pools only keep the free cells of a region, like the border band
+    of the player or the cells far enough from the player for the traps, they are filled the first time they are used.
+
+    Attributes:
+        grid (MazeGrid): The grid of the maze
+        rng (random.Random): The random number generator of the level
+        pools (dict): The CellPool of every region, by name
+        filters (dict): The function telling if a cell (x, y) is in the region, by pool name
+        occupied (set): The cell indexes already taken by an element
+    """
+
+    __slots__ = ['grid', 'rng', 'pools', 'filters', 'occupied']
+
+    def __init__(self, grid, rng=random):
+        """Initialize the SpawnAllocator instance.
+
+        Args:
+            grid (MazeGrid): The grid of the maze, fully generated
+            rng (random.Random): The random number generator of the level
+        """
+        self.grid = grid
+        self.rng = rng
+        self.pools = {'free': CellPool(ind for ind, code in enumerate(grid.cells) if code == PATH)}
+        self.filters = {'free': None}
+        self.occupied = set()
+
+    def pool(self, name, accept=None):
+        """Get a pool, filling it the first time with the free cells of its region.
+
+        Args:
+            name (hashable): The name of the pool
+            accept (function): The function telling if a cell (x, y) is in the region, only needed the first time
+
+        Returns:
+            (CellPool): The pool
+        """
+        if name not in self.pools:
+            coord = self.grid.coord
+            self.pools[name] = CellPool(ind for ind in self.pools['free'].cells if accept(*coord(ind)))
+            self.filters[name] = accept
+        return self.pools[name]
+
+    def draw(self, name='free', accept=None):
+        """Take a random free cell of a region.
+
+        Args:
+            name (hashable): The name of the pool of the region
+            accept (function): The function telling if a cell (x, y) is in the region, only needed the first time
+
+        Returns:
+            (tuple): The coordinates of the cell, now occupied, None if there is no free cell left in the region
+        """
+        ind = self.pool(name, accept).draw(self.rng)
+        if ind is None:
+            return None
+
+        cell = self.grid.coord(ind)
+        self.occupy(cell)
+        return cell
+
+    def occupy(self, cell):
+        """Mark a cell as taken, removing it from every pool.
+
+        Args:
+            cell (tuple): The coordinates of the cell
+        """
+        ind = self.grid.index(*cell)
+        self.occupied.add(ind)
+        for pool in self.pools.values():
+            pool.remove(ind)
+
+    def release(self, cell):
+        """Mark a cell as free again, adding it back to the pools of the regions it is in.
+
+        Args:
+            cell (tuple): The coordinates of the cell
+        """
+        ind = self.grid.index(*cell)
+        if ind not in self.occupied or self.grid.cells[ind] != PATH:
+            return
+        self.occupied.discard(ind)
+        for name, pool in self.pools.items():
+            accept = self.filters[name]
+            if accept is None or accept(*cell):
+                pool.add(ind)
+
+
+def level_allocator(game_state, rng=random):
+    """Build the spawn allocator of a level, the cells of the elements already placed being occupied.
+
+    Args:
+        game_state (dict): The game_state of the level
+        rng (random.Random): The random number generator of the level
+
+    Returns:
+        allocator (SpawnAllocator): The spawn allocator of the level
+    """
+    allocator = SpawnAllocator(game_state['maze'], rng)
+    for cell in (game_state['player_position'], game_state['monster_position'], game_state['treasure_position'],
+                 *game_state['traps']):
+        if cell is not None:
+            allocator.occupy(cell)
+    return allocator
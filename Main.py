@@ -3,9 +3,48 @@ from GameFiles.MazeGameGUI import MazeGUI, MainMenu
 from GameFiles.Monster import Monster
 from GameFiles.Player import Player
 from GameFiles.GameElements import GameElements
+from GameFiles.LevelCache import LevelCache, level_key
+from GameFiles.LevelPregenerator import LevelPregenerator
+from GameFiles.SaveWriter import SaveWriter
+from GameFiles.SaveSlots import write_slot_save, load_slot, slot_filename, LEGACY_SLOT
 
+level_cache = LevelCache()  # levels already generated, shared by every level of the session
 
-def generate_level(maze_size, nb_traps, level, save, retry):
+
+def build_level(maze_size, nb_traps, level, seed=None, algorithm='prim'):
+    """
+    Build a new level (maze, player, monster, treasure and traps) entirely defined by its seed and parameters. The level
+    is taken from the level cache if it was already generated, otherwise it is generated and stored in the cache.
+
+    Args:
+        maze_size (tuple): Dimensions of the maze (width, height).
+        nb_traps (int): Number of traps to place in the maze.
+        level (int): Current game level.
+        seed (int): seed of the level, a random one is chosen if None.
+        algorithm (str): name of the maze generator, see MazeGenerators.GENERATORS
+
+    Returns:
+        The game object with the initial state of the level
+    """
+    game = MazeGame(maze_size, seed)  # maze has to be at least 12 in height and length because the maze is surrounded by walls and needs to generate at least a path inside
+    game.game_state["level"] = level
+    game.game_state["algorithm"] = algorithm
+
+    key = level_key(game.game_state["seed"], maze_size, nb_traps, algorithm)
+    cached_level = level_cache.load(key)
+    if cached_level is not None:
+        game.game_state.update(cached_level)
+        game.maze = game.game_state['maze']
+    else:
+        game.create_level(nb_traps, algorithm)
+        level_cache.store(key, game.game_state)
+
+    return game
+
+pregenerator = LevelPregenerator(build_level)  # generates the next level while the current one is played
+save_writer = SaveWriter(write_slot_save)  # writes the saves without blocking the game
+
+def generate_level(maze_size, nb_traps, level, save, retry, algorithm='prim', seed=None, slot=LEGACY_SLOT):
     """
     Generate and initialize a game level, configuring the game_state based on input parameters
 
@@ -15,36 +54,43 @@ def generate_level(maze_size, nb_traps, level, save, retry):
         level (int): Current game level.
         save (bool): indicate if a saved game_state should be loaded.
         retry (bool): indicate if the player is retrying the level.
+        algorithm (str): name of the maze generator used for a new level, see MazeGenerators.GENERATORS
+        seed (int): seed of a new level, a random one is chosen if None.
+        slot (int): save slot the game is loaded from and saved to, see SaveSlots
 
     Returns:
         The game and GUI objects
     """
+    resumed = False  # a loaded save goes on in its journal, without being saved again as the level starts
     if retry:
         game = MazeGame()
-        game.load_game()
+        load_slot(game, slot)
         player, monster = reset_level(game, level)
     else:
         if save:
             game = MazeGame(maze_size)
-            game.load_game()
+            load_slot(game, slot)
             if game.game_state['life'] == 0:
                 player, monster = reset_level(game, level)
             else:
                 player = Player(game.game_state, game)
 
                 monster = Monster(game.game_state)
+                resumed = game.journal is not None
         else:
-            game = MazeGame(maze_size)  # maze has to be at least 12 in height and length because the maze is surrounded by walls and needs to generate at least a path inside
-            game.generate_maze()
-
-            game.game_state["level"] = level  # because if we load a game, the level is already saved
+            game = None
+            if seed is None:
+                game = pregenerator.take(maze_size, nb_traps, level, algorithm)  # generated while the previous level was played
+            if game is None:
+                game = build_level(maze_size, nb_traps, level, seed, algorithm)
 
             player = Player(game.game_state, game)
 
             monster = Monster(game.game_state)
 
-    # Initialize the game elements
-    GameElements(game.game_state, nb_traps)
+    # Initialize the game elements, if they are not placed yet (the spawn allocator scans every path of the maze)
+    if game.game_state['treasure_position'] is None or not game.game_state['traps']:
+        GameElements(game.game_state, nb_traps, game.rng, game.spawn_allocator())
 
     # Observer
     Gui = MazeGUI(game.game_state, monster, player)
@@ -54,8 +100,22 @@ def generate_level(maze_size, nb_traps, level, save, retry):
 
     player.monster = monster
 
+    # entities by cell for the collision checks, built once every element is in place
+    monster.occupancy = game.occupancy_grid(rebuild=True)
+
+    # generate the next level (see handle_level) while this one is played
+    pregenerator.start((maze_size[0] + 1, maze_size[1] + 1), nb_traps + 2, game.game_state["level"] + 1, algorithm)
+
+    # save the level as it starts, its events are then saved continuously in the journal of the save. A loaded save
+    # keeps its grid mapped from the file until the journal is compacted into a new save (see MazeGame.save_game)
+    game.writer = save_writer
+    if not resumed:
+        game.save_game(slot_filename(slot))
+
     Gui.mainloop()  # Start the GUI event loop, blocking until the window closes
-    game.save_game()  # Save game state after window is closed
+    game.save_game(slot_filename(slot))  # Compact the journal into a new save after window is closed
+    game.close_journal()
+    save_writer.flush()  # the save has to be written before it can be loaded again
 
     return game, Gui
 
@@ -73,21 +133,32 @@ def reset_level(game, level):
     game.game_state["life"] = 3  # reset life
     game.game_state["level"] = level
 
-    # reset the player's position
-    player = Player(game.game_state, game)
-    player.reset_position()
+    if game.game_state["seed"] is not None:
+        # the level is defined by its seed, so it restarts exactly as it started the first time
+        start = build_level(game.game_state["maze_size"], len(game.game_state["traps"]), level, game.game_state["seed"], game.game_state["algorithm"])
+        for element in ('player_position', 'monster_position', 'treasure_position', 'traps'):
+            game.game_state[element] = start.game_state[element]
+
+        player = Player(game.game_state, game)
+        monster = Monster(game.game_state)
+
+    else:
+        # old saves have no seed
+        # reset the player's position
+        player = Player(game.game_state, game)
+        player.reset_position()
 
-    # reset the monster's position
-    monster = Monster(game.game_state)
-    monster.reset_position()
+        # reset the monster's position
+        monster = Monster(game.game_state)
+        monster.reset_position()
 
-    # reset every trap
-    for trap in game.game_state['traps']:
-        game.game_state['traps'][trap][0] = False
+        # reset every trap
+        for trap in game.game_state['traps']:
+            game.game_state['traps'][trap][0] = False
 
     return player, monster
 
-def handle_level(maze_size=(12, 12), nb_traps=3, level=1, save=False, retry=False):
+def handle_level(maze_size=(12, 12), nb_traps=3, level=1, save=False, retry=False, algorithm='prim', seed=None, slot=LEGACY_SLOT):
     """
     Handle the setup and continuation of game levels based on user interactions.
 
@@ -97,14 +168,17 @@ def handle_level(maze_size=(12, 12), nb_traps=3, level=1, save=False, retry=Fals
         level (int): Current game level.
         save (bool): indicate if a saved game_state should be loaded.
         retry (bool): indicate if the player is retrying the level.
+        algorithm (str): name of the maze generator used for the new levels, see MazeGenerators.GENERATORS
+        seed (int): seed of the level if it is a new one, to play a shared level. A random one is chosen if None.
+        slot (int): save slot the game is loaded from and saved to, see SaveSlots
     """
     # generate the level with the wanted parameters
-    game, gui = generate_level(maze_size, nb_traps, level, save, retry)
+    game, gui = generate_level(maze_size, nb_traps, level, save, retry, algorithm, seed, slot)
 
     # Respond to player interactions in the GUI
     if gui.clicked_button == 'retry':
         gui.destroy()  # destroy the window because the mainloop is at the end of generate_level
-        handle_level(maze_size, nb_traps, game.game_state["level"], False, True)
+        handle_level(maze_size, nb_traps, game.game_state["level"], False, True, algorithm, slot=slot)
 
     elif gui.clicked_button == 'nextlvl':
         gui.destroy()
@@ -113,20 +187,21 @@ def handle_level(maze_size=(12, 12), nb_traps=3, level=1, save=False, retry=Fals
         nb_traps += 2  # the number of traps increase by 2
         game.game_state["level"] = game.game_state["level"] + 1  # the level increase
 
-        handle_level(maze_size, nb_traps, game.game_state["level"], False)
+        handle_level(maze_size, nb_traps, game.game_state["level"], False, algorithm=algorithm, slot=slot)
 
     elif gui.clicked_button == 'home':
         gui.destroy()
-        handle_main_menu(game.game_state["level"])
+        handle_main_menu(game.game_state["level"], slot)
 
-def handle_main_menu(level):
+def handle_main_menu(level, slot=LEGACY_SLOT):
     """
     Handle the main menu actions based on user choice.
 
     Args:
         level (int): Current level for gameplay continuation.
+        slot (int): Save slot selected when the menu opens.
     """
-    main_menu = MainMenu()
+    main_menu = MainMenu(slot)
     main_menu.mainloop()
     if main_menu.clicked_button != "Quit":
         if main_menu.clicked_button == "Continue":
@@ -134,7 +209,7 @@ def handle_main_menu(level):
         else:
             save = False
             level = 1  # reset the level to 1 if the player clicks on play
-        handle_level(save=save, level=level)
+        handle_level(save=save, level=level, slot=main_menu.slot)
 
 def main():
     """ Entry point of the game. Manages the initial game menu """
@@ -145,7 +220,10 @@ def main():
             save = True
         else:
             save = False
-        handle_level(save=save)
+        handle_level(save=save, slot=main_menu.slot)
+
+    pregenerator.shutdown()
+    save_writer.shutdown()
 
 
 
@@ -0,0 +1,91 @@
+import os  # to find the root of the repository
+import random  # for the random mazes
+import sys  # to import the game from the tests
+from collections import deque  # queue of the BFS
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GameFiles.MazeGrid import MazeGrid, WALL, PATH  # noqa: E402
+
+
+def bfs(grid, start):
+    """Distance of every path cell to a cell, computed with a plain BFS over the grid, to check the game against.
+
+    Args:
+        grid (MazeGrid): The maze
+        start (tuple): The coordinates of the cell
+
+    Returns:
+        distances (dict): The distance of every path cell connected to the start, by coordinates
+    """
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        for neighbor in grid.neighbors(*cell, PATH):
+            if neighbor not in distances:
+                distances[neighbor] = distances[cell] + 1
+                queue.append(neighbor)
+    return distances
+
+
+@pytest.fixture
+def rng():
+    """Random number generator with a fixed seed, so that a failing test fails again."""
+    return random.Random(2024)
+
+
+@pytest.fixture
+def saves(tmp_path, monkeypatch):
+    """Run the test in a temporary directory with an empty saves directory, where the game reads and writes saves."""
+    monkeypatch.chdir(tmp_path)
+    directory = tmp_path / 'data' / 'saves'
+    directory.mkdir(parents=True)
+    return directory
+
+
+def random_grid(maze_size, rng, path_ratio=0.6):
+    """Grid of random walls and paths, with no structure at all.
+
+    Args:
+        maze_size (tuple): Dimensions of the grid (width, height)
+        rng (random.Random): The random number generator to use
+        path_ratio (float): The probability of a cell to be a path
+
+    Returns:
+        grid (MazeGrid): The grid
+    """
+    cells = bytearray(PATH if rng.random() < path_ratio else WALL for _ in range(maze_size[0] * maze_size[1]))
+    return MazeGrid(maze_size, cells=cells)
+
+
+def open_walls(grid, rng, nb_walls):
+    """Open inner walls separating two paths to add loops to a maze, the border is left closed.
+
+    Args:
+        grid (MazeGrid): The maze, changed in place
+        rng (random.Random): The random number generator to use
+        nb_walls (int): The number of walls to open
+    """
+    width, height = grid.maze_size
+    walls = [(x, y) for x in range(1, width - 1) for y in range(1, height - 1)
+             if grid.get(x, y) != PATH and grid.count_neighbors(x, y, PATH) >= 2]
+    for x, y in rng.sample(walls, min(nb_walls, len(walls))):
+        grid.set(x, y, PATH)
+
+
+def paths_of(grid):
+    """Coordinates of every path cell of a grid."""
+    return [grid.coord(ind) for ind, code in enumerate(grid.cells) if code == PATH]
+
+
+class Recorder:
+    """Observer recording the notifications of the game objects instead of drawing them."""
+
+    def __init__(self):
+        self.messages = []
+
+    def update_observer(self, message, *args):
+        self.messages.append((message, *args))
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from conftest import bfs
+from GameFiles.MazeGenerators import GENERATORS, generate, eller, stream_maze, open_streamed_maze
+from GameFiles.MazeGrid import WALL, PATH
+
+SIZES = [(12, 12), (13, 13), (21, 14), (15, 30)]  # square and not, odd and even
+
+
+def check_maze(grid, maze_size):
+    """Check that a grid is a perfect maze of walls and paths surrounded by walls."""
+    width, height = maze_size
+    assert grid.maze_size == maze_size
+    assert set(grid.cells) <= {WALL, PATH}
+
+    # surrounded by walls
+    border = [(x, y) for x in range(width) for y in (0, height - 1)] + \
+             [(x, y) for x in (0, width - 1) for y in range(height)]
+    assert all(grid.get(x, y) == WALL for x, y in border)
+
+    # every path is reachable from every other one
+    paths = [grid.coord(ind) for ind, code in enumerate(grid.cells) if code == PATH]
+    assert paths
+    assert len(bfs(grid, paths[0])) == len(paths)
+
+    # connected and without loop: a tree of paths has one edge less than cells
+    nb_edges = sum(grid.count_neighbors(x, y, PATH) for x, y in paths) // 2
+    assert nb_edges == len(paths) - 1
+
+
+@pytest.mark.parametrize('algorithm', GENERATORS)
+@pytest.mark.parametrize('maze_size', SIZES)
+@pytest.mark.parametrize('seed', range(3))
+def test_generator_invariants(algorithm, maze_size, seed):
+    check_maze(generate(maze_size, algorithm, random.Random(seed)), maze_size)
+
+
+@pytest.mark.parametrize('algorithm', GENERATORS)
+def test_same_seed_same_maze(algorithm):
+    first = generate((25, 19), algorithm, random.Random(11))
+    second = generate((25, 19), algorithm, random.Random(11))
+    assert first.cells == second.cells
+
+
+def test_unknown_generator():
+    with pytest.raises(ValueError):
+        generate((12, 12), 'unknown')
+
+
+@pytest.mark.parametrize('maze_size', [(12, 12), (40, 17)])
+def test_streamed_maze(maze_size, tmp_path):
+    filename = str(tmp_path / 'maze.bin')
+    with open(filename, 'wb') as file:
+        assert stream_maze(file, maze_size, random.Random(4)) == maze_size[0] * maze_size[1]
+
+    grid = open_streamed_maze(filename, maze_size)
+    check_maze(grid, maze_size)
+    assert bytes(grid.cells) == bytes(eller(maze_size, random.Random(4)).cells)
+
+    # the changes stay in memory
+    grid.set(1, 1, WALL if grid.get(1, 1) == PATH else PATH)
+    assert open_streamed_maze(filename, maze_size).cells != grid.cells
@@ -0,0 +1,131 @@
+import os
+
+import pytest
+
+import Main
+from GameFiles import LevelCache as level_cache_module
+from GameFiles.LevelCache import LevelCache, level_key, encode_level, decode_level, LEVEL_FIELDS
+from GameFiles.LevelPack import pack_parameters, write_pack, read_pack_level, PACK_HEADER, PACK_ENTRY, PACK_MAGIC
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Empty level cache in a temporary directory, used by Main.build_level."""
+    cache = LevelCache(str(tmp_path / 'cache'), max_levels=3)
+    monkeypatch.setattr(Main, 'level_cache', cache)
+    return cache
+
+
+def assert_same_level(level, game_state):
+    """Compare a level to the game_state it was made from."""
+    assert bytes(level['maze'].cells) == bytes(game_state['maze'].cells)
+    for field in LEVEL_FIELDS:
+        assert level[field] == game_state[field], field
+
+
+def test_seeded_levels_are_reproduced(cache, monkeypatch):
+    first = Main.build_level((21, 21), 5, 1, seed=9)
+    monkeypatch.setattr(Main, 'level_cache', LevelCache(cache.directory + '2'))
+    second = Main.build_level((21, 21), 5, 1, seed=9)
+    assert_same_level(second.game_state, first.game_state)
+
+    other = Main.build_level((21, 21), 5, 1, seed=10)
+    assert bytes(other.maze.cells) != bytes(first.maze.cells)
+
+
+def test_cache_hit(cache):
+    game = Main.build_level((15, 15), 3, 1, seed=1)
+    key = level_key(1, (15, 15), 3, 'prim')
+    assert_same_level(cache.load(key), game.game_state)
+
+    # every load is a new copy, the cached level is never modified
+    level = cache.load(key)
+    level['maze'].set(1, 1, 1 - level['maze'].get(1, 1))
+    level['traps'].clear()
+    assert_same_level(cache.load(key), game.game_state)
+
+    # read from the disk by another session
+    assert_same_level(LevelCache(cache.directory).load(key), game.game_state)
+    assert cache.load(level_key(2, (15, 15), 3, 'prim')) is None
+
+
+def test_key_depends_on_every_parameter(monkeypatch):
+    keys = {level_key(1, (15, 15), 3, 'prim'), level_key(2, (15, 15), 3, 'prim'), level_key(1, (16, 15), 3, 'prim'),
+            level_key(1, (15, 15), 4, 'prim'), level_key(1, (15, 15), 3, 'kruskal')}
+    assert len(keys) == 5
+
+    key = level_key(1, (15, 15), 3, 'prim')
+    monkeypatch.setattr(level_cache_module, 'CACHE_VERSION', level_cache_module.CACHE_VERSION + 1)
+    assert level_key(1, (15, 15), 3, 'prim') != key  # the levels of an older generation are not used
+
+
+def test_prune_keeps_the_newest_levels(cache):
+    keys = []
+    for seed in range(5):
+        Main.build_level((12, 12), 3, 1, seed=seed)
+        keys.append(level_key(seed, (12, 12), 3, 'prim'))
+        # the levels are written in the same second, set their age explicitly
+        for age, key in enumerate(reversed(keys)):
+            filename = os.path.join(cache.directory, key + '.level')
+            if os.path.exists(filename):
+                os.utime(filename, (1000000 - age, 1000000 - age))
+
+    assert sorted(os.listdir(cache.directory)) == sorted(key + '.level' for key in keys[-3:])
+
+
+def test_corrupted_level_is_ignored(cache):
+    Main.build_level((12, 12), 3, 1, seed=3)
+    key = level_key(3, (12, 12), 3, 'prim')
+    filename = os.path.join(cache.directory, key + '.level')
+    with open(filename, 'r+b') as file:
+        file.seek(-1, 2)
+        file.write(b'\x07')
+
+    assert LevelCache(cache.directory).load(key) is None
+
+
+@pytest.mark.parametrize('data', [b'', b'DMZS', b'\x80\x04\x95\x05\x00\x00\x00\x00\x00\x00\x00}\x94.'])
+def test_decode_refuses_other_data(data):
+    with pytest.raises(ValueError):
+        decode_level(data)
+
+
+def test_encode_decode(cache):
+    game = Main.build_level((13, 17), 4, 1, seed=5)
+    assert_same_level(decode_level(encode_level(game.game_state)), game.game_state)
+
+
+def test_level_pack(cache, tmp_path):
+    parameters = pack_parameters(4, (12, 20), (3, 9), seed=8, algorithm='eller')
+    assert [(size, traps, level) for size, traps, level, _, _ in parameters] == \
+           [((12, 12), 3, 1), ((15, 15), 5, 2), ((17, 17), 7, 3), ((20, 20), 9, 4)]
+
+    filename = str(tmp_path / 'levels.pack')
+    write_pack(filename, parameters, workers=2)
+    for ind, (maze_size, nb_traps, level, seed, algorithm) in enumerate(parameters):
+        game = Main.build_level(maze_size, nb_traps, level, seed, algorithm)
+        assert_same_level(read_pack_level(filename, ind), game.game_state)
+
+    # the same pack whatever the number of workers
+    write_pack(str(tmp_path / 'single.pack'), parameters, workers=1)
+    with open(filename, 'rb') as first, open(str(tmp_path / 'single.pack'), 'rb') as second:
+        assert first.read() == second.read()
+
+    with pytest.raises(IndexError):
+        read_pack_level(filename, 4)
+
+
+def test_pack_refuses_other_files(tmp_path):
+    filename = str(tmp_path / 'other.pack')
+    with open(filename, 'wb') as file:
+        file.write(b'not a pack at all')
+    with pytest.raises(ValueError):
+        read_pack_level(filename, 0)
+
+    # a pack whose level isn't a level, here a pickle, is never run
+    payload = b'\x80\x04\x95\x05\x00\x00\x00\x00\x00\x00\x00}\x94.'
+    with open(filename, 'wb') as file:
+        file.write(PACK_HEADER.pack(PACK_MAGIC, 1) + PACK_ENTRY.pack(PACK_HEADER.size + PACK_ENTRY.size, len(payload)))
+        file.write(payload)
+    with pytest.raises(ValueError):
+        read_pack_level(filename, 0)
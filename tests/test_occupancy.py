@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import paths_of, Recorder
+from GameFiles.MazeGame import MazeGame
+from GameFiles.Monster import Monster
+from GameFiles.Occupancy import Occupancy, level_occupancy, EMPTY
+from GameFiles.Player import Player
+
+
+def start_level(seed, maze_size=(21, 21), nb_traps=15):
+    """Build a seeded level with its player and monster set up like in Main.generate_level."""
+    game = MazeGame(maze_size, seed)
+    game.create_level(nb_traps)
+    player = Player(game.game_state, game)
+    monster = Monster(game.game_state)
+    for observable in (game, player, monster):
+        observable.add_observer(Recorder())
+    player.monster = monster
+    monster.occupancy = game.occupancy_grid(rebuild=True)
+    return game, player, monster
+
+
+def test_place_and_remove(rng):
+    game = MazeGame((12, 12), seed=1)
+    game.generate_maze()
+    occupancy = Occupancy(game.maze)
+    first, second = rng.sample(paths_of(game.maze), 2)
+
+    occupancy.place('player', first)
+    occupancy.place('monster', first)
+    assert occupancy.at(first) == {'player', 'monster'}
+    occupancy.place('player', second)  # placing again moves the entity
+    assert occupancy.at(first) == {'monster'} and occupancy.at(second) == {'player'}
+    occupancy.remove('monster')
+    occupancy.remove('monster')
+    assert occupancy.at(first) is EMPTY and list(occupancy.cells) == [game.maze.index(*second)]
+
+
+def test_level_occupancy_skips_activated_traps():
+    game, player, monster = start_level(3)
+    state = game.game_state
+    activated = next(iter(state['traps']))
+    state['traps'][activated][0] = True
+
+    occupancy = level_occupancy(state)
+    assert ('trap', activated) not in occupancy.positions
+    for entity in ('player', 'monster', 'treasure'):
+        assert entity in occupancy.at(state[entity + '_position'])
+    assert len(occupancy.positions) == 3 + len(state['traps']) - 1
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_occupancy_follows_the_game(seed):
+    game, player, monster = start_level(seed)
+    state = game.game_state
+    state['life'] = 1000  # the game goes on whatever happens
+    moves = player.mazeGame.rng
+
+    for _ in range(300):
+        lives = state['life']
+        traps = sum(not activated for activated, type in state['traps'].values())
+        player.move_player(SimpleNamespace(keysym=moves.choice(['Up', 'Down', 'Left', 'Right'])))
+        if game.end:
+            break
+
+        rebuilt = level_occupancy(state)
+        assert game.occupancy.positions == rebuilt.positions
+        assert game.occupancy.cells == rebuilt.cells
+        assert lives - state['life'] <= 2  # at most the monster and a trap
+        assert sum(not activated for activated, type in state['traps'].values()) <= traps
+
+
+def test_monster_respawning_on_a_trap_triggers_it():
+    game, player, monster = start_level(5, nb_traps=0)
+    state = game.game_state
+    occupancy = game.occupancy
+
+    # a trap under the monster, another one where it respawns
+    landing = monster.init_monster_pos()
+    under = next(cell for cell in paths_of(game.maze) if not occupancy.at(cell) and cell != landing)
+    for trap in (under, landing):
+        state['traps'][trap] = [False, 1]
+        occupancy.place(('trap', trap), trap)
+    state['monster_position'] = under
+    occupancy.place('monster', under)
+
+    life = state['life']
+    player.check_collision()
+    assert state['traps'] == {under: [True, 1], landing: [True, 1]}
+    assert state['monster_position'] == landing and 'monster' in occupancy.at(landing)
+    assert [message for message in player.observer.messages if message[0] == 'trap'] == \
+        [('trap', under), ('trap', landing)]
+    assert state['life'] == life  # only the monster stepped on them
@@ -0,0 +1,224 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import bfs, open_walls, paths_of, Recorder
+from GameFiles.MazeGenerators import generate
+from GameFiles.MazeGrid import WALL, PATH
+from GameFiles.Monster import Monster
+from GameFiles.Occupancy import Occupancy
+from GameFiles.Player import Player
+from GameFiles import Pathfinding
+from GameFiles.Pathfinding import DistanceField, TreeIndex, JunctionGraph, ChunkGraph, PathSearch, make_pathfinder, \
+    UNREACHABLE
+
+
+def check_field(field, grid):
+    """Compare every distance of a field to a plain BFS from its target."""
+    distances = bfs(grid, field.target)
+    for cell in paths_of(grid):
+        assert field.distance(cell) == distances.get(cell, UNREACHABLE), cell
+
+
+@pytest.mark.parametrize('loops', [0, 25])
+def test_distance_field_random_moves(loops, rng):
+    grid = generate((25, 19), 'prim', rng)
+    open_walls(grid, rng, loops)
+    field = DistanceField(grid, checked=True)  # every incremental update is also checked by the field itself
+
+    target = rng.choice(paths_of(grid))
+    field.update(target)
+    for _ in range(200):
+        target = rng.choice(grid.neighbors(*target, PATH))
+        field.update(target)
+        assert field.verify()
+    check_field(field, grid)
+
+
+def test_distance_field_wall_toggles(rng):
+    grid = generate((21, 21), 'kruskal', rng)
+    field = DistanceField(grid, checked=True)
+    target = rng.choice(paths_of(grid))
+    field.update(target)
+
+    width, height = grid.maze_size
+    inner = [(x, y) for x in range(1, width - 1) for y in range(1, height - 1) if (x, y) != target]
+    for _ in range(150):
+        cell = rng.choice(inner)
+        field.set_cell(cell, WALL if grid.get(*cell) == PATH else PATH)
+        assert field.verify()
+        if rng.random() < 0.3:  # the target keeps moving between the changes
+            neighbors = grid.neighbors(*target, PATH)
+            if neighbors:
+                target = rng.choice(neighbors)
+                inner.remove(target)
+                inner.append(field.target)
+                field.update(target)
+    check_field(field, grid)
+
+
+@pytest.mark.parametrize('chunks', [False, True])
+def test_monster_follows_the_changes_of_the_maze(chunks, rng):
+    grid = generate((21, 21), 'prim', rng)
+    player, monster_position = paths_of(grid)[0], paths_of(grid)[-1]
+    game_state = {'maze': grid, 'maze_size': grid.maze_size, 'player_position': player,
+                  'monster_position': monster_position}
+    # the pathfinder chosen by the monster, or a chunk graph updated chunk by chunk
+    monster = Monster(game_state, ChunkGraph(grid, chunk_size=4) if chunks else None)
+    monster.add_observer(Recorder())
+
+    for _ in range(40):
+        monster.move()
+        if game_state['monster_position'] == player:
+            break
+        walls = [(x, y) for x in range(1, 20) for y in range(1, 20) if grid.get(x, y) == WALL]
+        monster.set_cell(rng.choice(walls), PATH)  # shortcuts opening while the monster chases
+        distance = bfs(grid, player)[game_state['monster_position']]
+        assert len(monster.shortest_path()) - 1 == distance
+    assert game_state['monster_position'] == player
+    if chunks:
+        assert isinstance(monster.pathfinder, ChunkGraph) and monster.pathfinder.version == grid.version
+
+
+def test_monster_spawns_at_the_farthest_cell(rng):
+    grid = generate((25, 25), 'prim', rng)
+    open_walls(grid, rng, 15)
+    player = paths_of(grid)[0]
+    game_state = {'maze': grid, 'maze_size': grid.maze_size, 'player_position': player, 'monster_position': None}
+    monster = Monster(game_state)
+
+    distances = bfs(grid, player)
+    farthest = max(distances.values())
+    first = min((cell for cell, distance in distances.items() if distance == farthest), key=lambda c: grid.index(*c))
+    assert monster.init_monster_pos() == first
+    assert monster.distance_field.farthest_cell == ((player, grid.version), first)
+
+    monster.set_cell(first, WALL)  # a new version of the grid: searched again
+    assert monster.init_monster_pos() != first
+    assert monster.distance_field.farthest_cell[0] == (player, grid.version)
+
+
+def test_distance_field_follows_the_player(rng, monkeypatch):
+    grid = generate((31, 31), 'kruskal', rng)
+    open_walls(grid, rng, 30)
+    game_state = {'maze': grid, 'maze_size': grid.maze_size, 'player_position': paths_of(grid)[0],
+                  'monster_position': None, 'traps': {}, 'treasure_position': None, 'life': 1000}
+    maze_game = SimpleNamespace(end=False, rng=rng, win_game=lambda: None, lose_game=lambda: None,
+                                occupancy_grid=lambda occupancy=Occupancy(grid): occupancy,
+                                log_event=lambda *event, **values: None)
+    player = Player(game_state, maze_game)
+    player.add_observer(Recorder())
+    monster = Monster(game_state)
+    monster.add_observer(Recorder())
+    player.monster = monster
+    game_state['monster_position'] = monster.init_monster_pos()
+
+    computed = []
+    compute = DistanceField.compute
+    monkeypatch.setattr(DistanceField, 'compute',
+                        lambda field, target: computed.append(target) or compute(field, target))
+    for _ in range(300):
+        player.move_player(SimpleNamespace(keysym=rng.choice(['Up', 'Down', 'Left', 'Right'])))
+        field = monster.distance_field
+        assert field.target == game_state['player_position'] and field.version == grid.version
+        if rng.random() < 0.2:  # respawning only reads the field
+            game_state['monster_position'] = monster.init_monster_pos()
+    assert not computed  # every step of the player was a single incremental update
+    check_field(monster.distance_field, grid)
+
+
+def test_tree_index_matches_bfs(rng):
+    grid = generate((31, 31), 'wilson', rng)
+    search = TreeIndex(grid)
+    paths = paths_of(grid)
+    for _ in range(30):
+        start, goal = rng.sample(paths, 2)
+        assert search.distance_between(start, goal) == bfs(grid, start)[goal]
+        search.update(goal)
+        assert len(search.path(start)) - 1 == search.distance(start)
+        assert search.next_step(start) in grid.neighbors(*start, PATH)
+
+    open_walls(grid, rng, 5)
+    with pytest.raises(ValueError):
+        TreeIndex(grid)
+
+
+def check_search(search, grid, rng, nb_paths=30):
+    """Compare the paths found by a pathfinder between random cells to a plain BFS."""
+    paths = paths_of(grid)
+    for _ in range(nb_paths):
+        start, goal = rng.sample(paths, 2)
+        path = search.search(grid.index(*start), grid.index(*goal))
+        distances = bfs(grid, start)
+        if goal not in distances:
+            assert path is None
+            continue
+        assert path[0] == grid.index(*start) and path[-1] == grid.index(*goal)
+        for first, second in zip(path, path[1:]):
+            assert grid.coord(second) in grid.neighbors(*grid.coord(first), PATH)
+        assert len(path) - 1 == distances[goal]
+
+
+def isolate(grid):
+    """Wall the neighbors of the last path cell of a grid, so that it can't be reached from the others."""
+    goal = paths_of(grid)[-1]
+    for x, y in grid.neighbors(*goal, PATH):
+        grid.set(x, y, WALL)
+    return grid.index(*paths_of(grid)[0]), grid.index(*goal)
+
+
+@pytest.mark.parametrize('pathfinder', [JunctionGraph, lambda grid: ChunkGraph(grid, chunk_size=8)])
+@pytest.mark.parametrize('loops', [0, 40])
+def test_graph_search_is_shortest(pathfinder, loops):
+    rng = random.Random(loops)
+    grid = generate((41, 33), 'backtracker', rng)
+    open_walls(grid, rng, loops)
+    check_search(pathfinder(grid), grid, rng)
+
+
+def test_graph_search_unreachable():
+    grid = generate((15, 15), 'prim', random.Random(3))
+    start, goal = isolate(grid)
+    assert JunctionGraph(grid).search(start, goal) is None
+    assert ChunkGraph(grid, chunk_size=4).search(start, goal) is None
+
+
+def test_chunk_graph_rebuilds_only_the_changed_chunks(rng):
+    grid = generate((37, 29), 'kruskal', rng)
+    open_walls(grid, rng, 20)
+    chunks = ChunkGraph(grid, chunk_size=6)
+
+    inner = [(x, y) for x in range(1, 36) for y in range(1, 28)]
+    for _ in range(60):
+        cell = rng.choice(inner)
+        chunks.set_cell(cell, WALL if grid.get(*cell) == PATH else PATH)
+        assert chunks.version == grid.version  # nothing left to build again on the next update
+
+        fresh = ChunkGraph(grid, chunk_size=6)
+        assert chunks.entrances == fresh.entrances
+        assert {entrance: sorted(links) for entrance, links in chunks.links.items()} == \
+               {entrance: sorted(links) for entrance, links in fresh.links.items()}
+        check_search(chunks, grid, rng, nb_paths=3)
+    check_search(chunks, grid, rng, nb_paths=100)
+
+    # changed without set_cell: the whole graph is built again on the next update
+    grid.set(*rng.choice(inner), PATH)
+    chunks.set_cell(rng.choice(inner), PATH)
+    assert chunks.version != grid.version
+    chunks.update(paths_of(grid)[0])
+    assert chunks.version == grid.version
+
+
+def test_make_pathfinder(rng, monkeypatch):
+    grid = generate((21, 21), 'prim', rng)
+    assert isinstance(make_pathfinder(grid), TreeIndex)
+    open_walls(grid, rng, 10)
+    assert isinstance(make_pathfinder(grid), JunctionGraph)
+    monkeypatch.setattr(Pathfinding, 'CHUNK_GRAPH_CELLS', 21 * 21)
+    assert isinstance(make_pathfinder(grid), ChunkGraph)
+
+
+def test_path_search_is_abstract():
+    with pytest.raises(TypeError):
+        PathSearch(generate((12, 12)))
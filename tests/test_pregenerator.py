@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+
+from GameFiles.LevelPregenerator import LevelPregenerator
+
+
+class Builder:
+    """Fake level builder recording its calls, blocking until released if asked to."""
+
+    def __init__(self, blocking=False):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not blocking:
+            self.release.set()
+
+    def __call__(self, maze_size, nb_traps, level, seed, algorithm):
+        self.calls.append((maze_size, nb_traps, level, seed, algorithm))
+        self.started.set()
+        self.release.wait(5)
+        if algorithm == 'broken':
+            raise RuntimeError("generation failed")
+        return ('game', maze_size, nb_traps, level, seed, algorithm)
+
+
+@pytest.fixture
+def builder():
+    return Builder()
+
+
+@pytest.fixture
+def pregenerator(builder):
+    pregenerator = LevelPregenerator(builder)
+    yield pregenerator
+    builder.release.set()
+    pregenerator.shutdown()
+
+
+def test_take_the_finished_level(pregenerator, builder):
+    pregenerator.start((13, 13), 5, 2, 'kruskal')
+    pregenerator.future.result(5)
+    game = pregenerator.take((13, 13), 5, 2, 'kruskal')
+    assert game[:4] == ('game', (13, 13), 5, 2) and game[5] == 'kruskal'
+    assert isinstance(game[4], int)  # the seed is drawn before the generation
+    assert pregenerator.take((13, 13), 5, 2, 'kruskal') is None  # only handed over once
+
+
+def test_wrong_parameters(pregenerator):
+    pregenerator.start((13, 13), 5, 2)
+    pregenerator.future.result(5)
+    assert pregenerator.take((13, 13), 5, 3) is None
+    assert pregenerator.take((12, 12), 3, 1) is None  # nothing being generated
+
+
+def test_queued_level_is_cancelled():
+    builder = Builder(blocking=True)
+    pregenerator = LevelPregenerator(builder)
+    try:
+        pregenerator.start((13, 13), 5, 2)
+        assert builder.started.wait(5)
+        running = pregenerator.future
+        pregenerator.start((14, 14), 7, 3)  # queued behind the running one, which can't be cancelled anymore
+        assert pregenerator.take((14, 14), 7, 3) is None
+    finally:
+        builder.release.set()
+        running.result(5)
+        pregenerator.shutdown()
+    assert [call[:3] for call in builder.calls] == [((13, 13), 5, 2)]
+
+
+def test_running_level_is_waited_for():
+    builder = Builder(blocking=True)
+    pregenerator = LevelPregenerator(builder)
+    try:
+        pregenerator.start((13, 13), 5, 2)
+        assert builder.started.wait(5)
+        threading.Timer(0.05, builder.release.set).start()
+        assert pregenerator.take((13, 13), 5, 2)[1:4] == ((13, 13), 5, 2)
+    finally:
+        builder.release.set()
+        pregenerator.shutdown()
+
+
+def test_failed_generation(pregenerator, capsys):
+    pregenerator.start((13, 13), 5, 2, 'broken')
+    with pytest.raises(RuntimeError):
+        pregenerator.future.result(5)
+    assert pregenerator.take((13, 13), 5, 2, 'broken') is None
+    assert "generation failed" in capsys.readouterr().out
@@ -0,0 +1,373 @@
+import os
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from GameFiles.MazeGame import MazeGame
+from GameFiles.MazeGrid import UNCHECKED
+from GameFiles.SaveFormat import write_save, read_save, save_checksum, encode_save, decode_save, pack_grid, \
+    unpack_grid, SAVE_HEADER, SAVE_MAGIC, MAPPED_CELLS
+from GameFiles import SaveJournal as save_journal_module
+from GameFiles.SaveJournal import SaveJournal, replay_journal, JOURNAL_HEADER, JOURNAL_RECORD, PLAYER_MOVED, \
+    MONSTER_MOVED, TRAP_CHANGED, LIFE_CHANGED, SCORE_CHANGED
+from GameFiles.SaveWriter import SaveWriter
+
+
+def new_state(maze_size, seed=5, nb_traps=4):
+    """game_state of a new level."""
+    game = MazeGame(maze_size, seed)
+    game.create_level(nb_traps)
+    return game.game_state
+
+
+def assert_same_state(loaded, saved):
+    """Compare two game_states, the grids by their cells."""
+    assert loaded.keys() == saved.keys()
+    assert loaded['maze'].maze_size == saved['maze'].maze_size
+    assert bytes(loaded['maze'].cells) == bytes(saved['maze'].cells)
+    for key in saved:
+        if key != 'maze':
+            assert loaded[key] == saved[key], key
+
+
+@pytest.mark.parametrize('nb_cells', [0, 1, 7, 8, 9, 441])
+def test_pack_grid(nb_cells, rng):
+    cells = bytearray(rng.choice(b'\x00\x01') for _ in range(nb_cells))
+    packed = pack_grid(cells)
+    assert len(packed) == (nb_cells + 7) // 8
+    assert unpack_grid(packed, nb_cells) == cells
+
+
+@pytest.mark.parametrize('maze_size', [(12, 12), (31, 17), (257, 256)])
+def test_save_round_trip(maze_size, tmp_path):
+    state = new_state(maze_size)
+    state['score'] = 123.5
+    state['life'] = 2
+    filename = str(tmp_path / 'game.sav')
+
+    write_save(filename, state, 7)
+    loaded, generation = read_save(filename)
+    assert generation == 7
+    assert_same_state(loaded, state)
+    assert not os.path.exists(filename + '.tmp')
+    assert isinstance(loaded['maze'].cells, memoryview) == (maze_size[0] * maze_size[1] >= MAPPED_CELLS)
+    loaded['maze'].detach()
+    assert isinstance(loaded['maze'].cells, bytearray)
+
+    loaded, generation = read_save(filename, lazy=False)
+    assert_same_state(loaded, state)
+
+
+@pytest.mark.parametrize('compress', [True, False])
+@pytest.mark.parametrize('mapped', [True, False])
+def test_encode_decode(compress, mapped):
+    state = new_state((21, 21))
+    state['seed'] = None
+    state['treasure_position'] = None
+    state['traps'][next(iter(state['traps']))][0] = True
+    assert_same_state(decode_save(encode_save(state, 3, compress, mapped))[0], state)
+
+    # a maze not fully generated keeps its unchecked cells
+    state['maze'].set(1, 1, UNCHECKED)
+    assert_same_state(decode_save(encode_save(state, 3, compress, mapped))[0], state)
+
+
+def test_corrupted_save_is_refused(tmp_path):
+    filename = str(tmp_path / 'game.sav')
+    write_save(filename, new_state((15, 15)))
+    with open(filename, 'r+b') as file:
+        file.seek(-1, 2)
+        last = file.read(1)
+        file.seek(-1, 2)
+        file.write(bytes([last[0] ^ 0xFF]))
+    with pytest.raises(ValueError):
+        read_save(filename)
+
+
+def corrupt_mapped_grid(filename, state):
+    """Write a save with its grid mapped, then change a cell of the grid in the file."""
+    write_save(filename, state, mapped=True)
+    with open(filename, 'r+b') as file:
+        file.seek(SAVE_HEADER.size + state['maze'].index(1, 1))
+        file.write(bytes([1 - state['maze'].get(1, 1)]))
+
+
+def test_corrupted_mapped_grid_is_refused(tmp_path):
+    filename = str(tmp_path / 'game.sav')
+    state = new_state((15, 15))
+    corrupt_mapped_grid(filename, state)
+    with pytest.raises(ValueError):
+        read_save(filename, lazy=False)
+
+    # only checked when every cell is needed
+    for use in (lambda grid: grid.adjacency(), lambda grid: grid.detach(), lambda grid: grid.set(2, 2, 1)):
+        loaded, generation = read_save(filename)
+        assert isinstance(loaded['maze'].cells, memoryview)
+        with pytest.raises(ValueError):
+            use(loaded['maze'])
+        loaded['maze'].cells.release()
+
+    # a valid mapped grid is checked once
+    write_save(filename, state, mapped=True)
+    loaded, generation = read_save(filename)
+    assert loaded['maze'].checksum is not None
+    loaded['maze'].adjacency()
+    assert loaded['maze'].checksum is None
+    loaded['maze'].detach()
+
+
+def test_game_refuses_a_corrupted_mapped_grid(saves):
+    game = MazeGame((15, 15), 5)
+    game.create_level(4)
+    corrupt_mapped_grid(str(saves / 'savegame.sav'), game.game_state)
+
+    loaded = MazeGame((12, 12))
+    before = loaded.game_state
+    loaded.load_game()
+    assert loaded.game_state is before and loaded.maze is before['maze']
+
+
+@pytest.mark.parametrize('data', [b'', b'DMZS', b'\x80\x04\x95\x05\x00\x00\x00\x00\x00\x00\x00}\x94.' * 10])
+def test_decode_refuses_other_data(data):
+    with pytest.raises(ValueError):
+        decode_save(data)
+
+
+def test_other_version_is_refused():
+    data = bytearray(encode_save(new_state((15, 15))))
+    SAVE_HEADER.pack_into(data, 0, SAVE_MAGIC, 99, *SAVE_HEADER.unpack_from(data)[2:])
+    with pytest.raises(ValueError, match='version'):
+        decode_save(bytes(data))
+
+
+def test_game_save_and_load(saves):
+    game = MazeGame((15, 15), 5)
+    game.create_level(4)
+    game.save_game()
+    game.save_game()
+
+    loaded = MazeGame()
+    loaded.load_game()
+    assert loaded.generation == 2
+    assert_same_state(loaded.game_state, game.game_state)
+    assert loaded.maze is loaded.game_state['maze'] and loaded.maze_size == (15, 15)
+
+    (saves / 'savegame.sav').write_bytes(b'garbage')
+    MazeGame().load_game()  # reported, not raised
+
+
+def test_legacy_csv_save_is_imported(saves):
+    game = MazeGame((17, 13), 8)
+    game.create_level(5)
+    game.game_state['score'] = 12.5
+    game.save_csv_game()
+    assert not (saves / 'savegame.sav').exists()
+
+    loaded = MazeGame()
+    loaded.load_game()
+    assert_same_state(loaded.game_state, game.game_state)
+    assert loaded.rng.random() == MazeGame((17, 13), 8).rng.random()  # the seed of the level is back
+
+    # written again in the binary format, the CSV save isn't parsed anymore
+    (saves / 'savegame.csv').write_text('not a csv save')
+    again = MazeGame()
+    again.load_game()
+    assert_same_state(again.game_state, game.game_state)
+
+
+def test_big_legacy_csv_save(saves):
+    game = MazeGame((151, 151), 2)
+    game.create_level(10)
+    game.save_csv_game()
+    loaded = MazeGame()
+    loaded.load_game()
+    assert_same_state(loaded.game_state, game.game_state)
+
+
+def log_events(journal, state):
+    """Log an event of every kind, returning the game_state they lead to."""
+    x, y = next(iter(state['traps']))
+    journal.log(PLAYER_MOVED, 3, 4)
+    journal.log(MONSTER_MOVED, 5, 6)
+    journal.log(TRAP_CHANGED, x, y, 1)
+    journal.log(LIFE_CHANGED, value=1)
+    journal.log(SCORE_CHANGED, value=42.25)
+    expected = dict(state, player_position=(3, 4), monster_position=(5, 6), life=1, score=42.25)
+    expected['traps'] = {trap: list(value) for trap, value in state['traps'].items()}
+    expected['traps'][(x, y)][0] = True
+    return expected
+
+
+def test_journal_round_trip(tmp_path):
+    filename = str(tmp_path / 'game.sav')
+    snapshot = write_save(filename, new_state((15, 15)))
+    journal = SaveJournal(str(tmp_path / 'game.journal'))
+    journal.start(snapshot)
+    expected = log_events(journal, read_save(filename)[0])
+    journal.close()
+
+    state = read_save(filename)[0]
+    assert replay_journal(journal.filename, state, snapshot) == 5
+    assert_same_state(state, expected)
+
+    # the journal of another snapshot is ignored
+    state = read_save(filename)[0]
+    assert replay_journal(journal.filename, state, snapshot + 1) == 0
+    assert_same_state(state, read_save(filename)[0])
+    assert replay_journal(str(tmp_path / 'missing.journal'), state, snapshot) == 0
+
+
+def test_journal_partial_record_and_resume(tmp_path):
+    filename = str(tmp_path / 'game.sav')
+    snapshot = write_save(filename, new_state((15, 15)))
+    journal = SaveJournal(str(tmp_path / 'game.journal'))
+    journal.start(snapshot)
+    log_events(journal, read_save(filename)[0])
+    journal.close()
+
+    # the game stopped while writing an event
+    with open(journal.filename, 'ab') as file:
+        file.write(JOURNAL_RECORD.pack(PLAYER_MOVED, 9, 9, 0, 0)[:7])
+    state = read_save(filename)[0]
+    assert replay_journal(journal.filename, state, snapshot) == 5
+
+    # the game goes on in the same journal, after the complete events
+    journal.resume(snapshot, 5)
+    journal.log(PLAYER_MOVED, 7, 8)
+    journal.close()
+    with open(journal.filename, 'rb') as file:
+        assert len(file.read()) == JOURNAL_HEADER.size + 6 * JOURNAL_RECORD.size
+    state = read_save(filename)[0]
+    assert replay_journal(journal.filename, state, snapshot) == 6
+    assert state['player_position'] == (7, 8)
+
+    # resuming the journal of another snapshot starts a new one
+    journal.resume(snapshot + 1, 6)
+    journal.close()
+    assert replay_journal(journal.filename, read_save(filename)[0], snapshot) == 0
+
+
+def test_game_resumes_its_journal(saves):
+    game = MazeGame((15, 15), 5)
+    game.create_level(4)
+    game.save_game('game.sav')
+    game.log_event(PLAYER_MOVED, 2, 3)
+    game.log_event(SCORE_CHANGED, value=10)
+    game.close_journal()
+
+    loaded = MazeGame()
+    loaded.load_game('game.sav')
+    assert loaded.game_state['player_position'] == (2, 3)
+    assert loaded.game_state['score'] == 10
+    loaded.log_event(MONSTER_MOVED, 4, 5)
+    loaded.close_journal()
+
+    again = MazeGame()
+    again.load_game('game.sav')
+    assert again.game_state['player_position'] == (2, 3)
+    assert again.game_state['monster_position'] == (4, 5)
+    again.close_journal()
+
+
+def test_long_journal_is_compacted(saves, monkeypatch):
+    monkeypatch.setattr(save_journal_module, 'COMPACT_RECORDS', 10)
+    game = MazeGame((15, 15), 5)
+    game.create_level(4)
+    game.save_game()
+    for x in range(25):
+        game.log_event(PLAYER_MOVED, x, 1)
+    assert game.generation == 3  # saved again every 10 events
+    assert game.journal.nb_records == 5
+    game.close_journal()
+
+    loaded = MazeGame()
+    loaded.load_game()
+    assert loaded.generation == 3 and loaded.game_state['player_position'] == (24, 1)
+    loaded.close_journal()
+
+
+def test_writer_coalesces_waiting_saves(tmp_path):
+    started, gate, written = threading.Event(), threading.Event(), []
+
+    def blocking_write(filename, game_state, generation=0):
+        written.append((generation, game_state['life']))
+        started.set()
+        gate.wait(5)
+        return write_save(filename, game_state, generation)
+
+    writer = SaveWriter(blocking_write)
+    filename = str(tmp_path / 'game.sav')
+    state = new_state((15, 15))
+    first = writer.save(filename, state, 1)
+    assert started.wait(5)  # the first save is being written
+
+    second = writer.save(filename, state, 2)
+    state['life'] = 1
+    trap = next(iter(state['traps']))
+    state['traps'][trap][0] = True
+    third = writer.save(filename, state, 3)  # replaces the second one, still waiting
+    state['traps'][trap][0] = False  # the save has its own copy
+    assert third is second and first is not second
+
+    gate.set()
+    writer.shutdown()
+    assert written == [(1, 3), (3, 1)]  # the second save was never written
+    loaded, generation = read_save(filename)
+    assert generation == 3 and loaded['life'] == 1 and loaded['traps'][trap][0]
+    assert third.result() == save_checksum(filename)
+
+
+def test_journal_rotation_carries_the_events(tmp_path, capsys):
+    filename = str(tmp_path / 'game.sav')
+    old = write_save(filename, new_state((15, 15)), 1)
+    journal = SaveJournal(str(tmp_path / 'game.journal'))
+    journal.start(old)
+    journal.log(PLAYER_MOVED, 1, 1)
+
+    future = Future()
+    journal.rotate(future)  # the new snapshot has the first move
+    journal.log(PLAYER_MOVED, 2, 2)
+    journal.log(MONSTER_MOVED, 3, 3)
+    journal.flush()
+    state = read_save(filename)[0]
+    assert replay_journal(journal.filename, state, old) == 3  # still written in the old journal
+    assert state['player_position'] == (2, 2)
+
+    new = write_save(filename, new_state((15, 15)), 2)
+    future.set_result(new)
+    journal.log(PLAYER_MOVED, 4, 4)  # the new journal is started with the events carried
+    journal.flush()
+    state = read_save(filename)[0]
+    assert replay_journal(journal.filename, state, new) == 3
+    assert state['player_position'] == (4, 4) and state['monster_position'] == (3, 3)
+
+    # a save that failed leaves the old journal going on
+    failed = Future()
+    journal.rotate(failed)
+    failed.set_exception(OSError('disk full'))
+    journal.log(LIFE_CHANGED, value=2)
+    journal.close()
+    assert 'could not be saved' in capsys.readouterr().out
+    state = read_save(filename)[0]
+    assert replay_journal(journal.filename, state, new) == 4 and state['life'] == 2
+
+
+def test_game_saves_in_the_background(saves):
+    game = MazeGame((15, 15), 5)
+    game.create_level(4)
+    game.writer = SaveWriter()
+    game.save_game()
+    game.game_state['player_position'] = (2, 3)
+    game.log_event(PLAYER_MOVED, 2, 3)
+    game.save_game()
+    game.game_state['monster_position'] = (4, 5)
+    game.log_event(MONSTER_MOVED, 4, 5)
+    game.close_journal()
+    game.writer.shutdown()
+
+    loaded = MazeGame()
+    loaded.load_game()
+    assert loaded.generation == 2
+    assert loaded.game_state['player_position'] == (2, 3) and loaded.game_state['monster_position'] == (4, 5)
+    loaded.close_journal()
@@ -0,0 +1,115 @@
+import pytest
+
+from GameFiles.MazeGame import MazeGame
+from GameFiles.MazeGrid import WALL, PATH
+from GameFiles.SaveSlots import slot_filename, file_slot, load_slot, make_thumbnail, read_index, write_index, \
+    write_slot_save, NB_SLOTS, INDEX_HEADER, INDEX_MAGIC, THUMBNAIL_SIZE, THUMBNAIL_PLAYER, THUMBNAIL_TREASURE
+
+
+def new_game(maze_size, seed=5, nb_traps=4):
+    """Game of a new level."""
+    game = MazeGame(maze_size, seed)
+    game.create_level(nb_traps)
+    return game
+
+
+def test_slot_files():
+    assert slot_filename(1) == 'savegame.sav'
+    assert len({slot_filename(slot) for slot in range(1, NB_SLOTS + 1)}) == NB_SLOTS
+    for slot in range(1, NB_SLOTS + 1):
+        assert file_slot('./data/saves/' + slot_filename(slot)) == slot
+    assert file_slot('./data/saves/other.sav') is None
+
+
+def test_small_thumbnail_is_the_maze():
+    state = new_game((12, 14)).game_state
+    (width, height), pixels = make_thumbnail(state)
+    assert (width, height) == (12, 14)
+    for x in range(12):
+        for y in range(14):
+            if (x, y) == state['player_position']:
+                expected = THUMBNAIL_PLAYER
+            elif (x, y) == state['treasure_position']:
+                expected = THUMBNAIL_TREASURE
+            else:
+                expected = state['maze'].get(x, y)
+            assert pixels[y * width + x] == expected, (x, y)
+
+
+def test_big_thumbnail_is_sampled():
+    state = new_game((101, 61)).game_state
+    (width, height), pixels = make_thumbnail(state)
+    assert (width, height) == (THUMBNAIL_SIZE, THUMBNAIL_SIZE) and len(pixels) == width * height
+    assert set(pixels) <= {WALL, PATH, THUMBNAIL_PLAYER, THUMBNAIL_TREASURE}
+    assert pixels.count(THUMBNAIL_PLAYER) == 1 and THUMBNAIL_TREASURE in pixels
+
+
+def test_index_round_trip(tmp_path):
+    filename = str(tmp_path / 'slots.index')
+    assert read_index(filename) == {}
+
+    slots = {
+        3: {'level': 7, 'life': 2, 'score': 81.5, 'maze_size': (31, 29), 'timestamp': 1700000000.25,
+            'thumbnail': ((2, 3), bytes([0, 1, 2, 3, 1, 0]))},
+        1: {'level': 1, 'life': 3, 'score': 0.0, 'maze_size': (12, 12), 'timestamp': 1600000000.0,
+            'thumbnail': make_thumbnail(new_game((12, 12)).game_state)},
+    }
+    write_index(slots, filename)
+    assert read_index(filename) == slots
+
+    # an index of another format is ignored
+    with open(filename, 'r+b') as file:
+        file.write(INDEX_HEADER.pack(INDEX_MAGIC, 99, 2))
+    assert read_index(filename) == {}
+    with open(filename, 'wb') as file:
+        file.write(b'DM')
+    assert read_index(filename) == {}
+
+
+def test_slot_saves_update_the_index(saves):
+    first, second = new_game((15, 15)), new_game((21, 17), seed=6)
+    second.game_state['level'] = 4
+    second.game_state['life'] = 1
+    write_slot_save(str(saves / slot_filename(2)), second.game_state)
+    write_slot_save(str(saves / slot_filename(1)), first.game_state)
+    write_slot_save(str(saves / 'other.sav'), first.game_state)  # not a slot, not indexed
+
+    slots = read_index(str(saves / 'slots.index'))
+    assert sorted(slots) == [1, 2]
+    assert (slots[2]['level'], slots[2]['life'], slots[2]['maze_size']) == (4, 1, (21, 17))
+    assert slots[1]['thumbnail'] == make_thumbnail(first.game_state)
+
+
+@pytest.mark.parametrize('slot', [1, 2, 3])
+def test_game_saves_in_its_slot(saves, slot):
+    game = new_game((15, 15), seed=slot)
+    game.save_game(slot_filename(slot))
+    game.close_journal()
+
+    loaded = MazeGame()
+    load_slot(loaded, slot)
+    assert loaded.game_state['seed'] == slot
+    assert bytes(loaded.maze.cells) == bytes(game.maze.cells)
+    loaded.close_journal()
+    assert list(read_index('./data/saves/slots.index')) == [slot]
+
+    empty = MazeGame()
+    before = empty.game_state
+    load_slot(empty, slot % NB_SLOTS + 1)  # an empty slot
+    assert empty.game_state is before
+
+
+def test_legacy_save_goes_to_the_first_slot(saves):
+    game = new_game((15, 15), seed=8)
+    game.save_csv_game()
+
+    other = MazeGame()
+    before = other.game_state
+    load_slot(other, 2)
+    assert other.game_state is before  # only the first slot imports the old save
+
+    loaded = MazeGame()
+    load_slot(loaded, 1)
+    assert loaded.game_state['seed'] == 8
+    loaded.close_journal()
+    assert (saves / slot_filename(1)).exists() and list(read_index('./data/saves/slots.index')) == [1]
@@ -0,0 +1,90 @@
+import math
+
+import pytest
+
+from conftest import paths_of
+from GameFiles.GameElements import GameElements
+from GameFiles.MazeGame import MazeGame
+from GameFiles.MazeGenerators import generate
+from GameFiles.MazeGrid import WALL
+from GameFiles.SpawnAllocator import CellPool, SpawnAllocator, level_allocator
+
+
+def test_cell_pool_matches_a_set(rng):
+    pool, cells = CellPool(range(10)), set(range(10))
+    for _ in range(2000):
+        cell = rng.randrange(30)
+        if rng.random() < 0.5:
+            pool.add(cell)
+            cells.add(cell)
+        else:
+            pool.remove(cell)
+            cells.discard(cell)
+        assert sorted(pool.cells) == sorted(cells) and len(pool) == len(cells)
+        assert all(pool.cells[position] == cell for cell, position in pool.positions.items())
+        assert (pool.draw(rng) in cells) if cells else pool.draw(rng) is None
+
+
+def test_draw_takes_every_free_cell_once(rng):
+    grid = generate((15, 15), 'prim', rng)
+    allocator = SpawnAllocator(grid, rng)
+    drawn = [allocator.draw() for _ in range(len(paths_of(grid)))]
+    assert sorted(drawn) == sorted(paths_of(grid))
+    assert allocator.draw() is None
+
+
+def test_regions_and_occupy(rng):
+    grid = generate((21, 21), 'kruskal', rng)
+    allocator = SpawnAllocator(grid, rng)
+    left = lambda x, y: x < 8  # noqa: E731
+
+    taken = paths_of(grid)[0]
+    allocator.occupy(taken)
+    drawn = set()
+    while True:
+        cell = allocator.draw('left', left)
+        if cell is None:
+            break
+        drawn.add(cell)
+    assert drawn == {cell for cell in paths_of(grid) if left(*cell)} - {taken}
+    assert not drawn & set(map(grid.coord, allocator.pool('free').cells))  # taken from every pool
+
+    allocator.release(taken)
+    assert allocator.draw('left') == taken  # back in the pools of its regions
+    allocator.release(next(iter(drawn)))
+    right = allocator.draw('right', lambda x, y: x >= 8)
+    assert right is not None and right[0] >= 8
+
+    wall = next((x, y) for x in range(21) for y in range(21) if grid.get(x, y) == WALL)
+    allocator.occupy(wall)
+    allocator.release(wall)  # a wall is never added to the pools
+    assert grid.index(*wall) not in allocator.pool('free')
+
+
+def test_too_many_traps_are_dropped():
+    game = MazeGame((12, 12), seed=5)
+    game.create_level(nb_traps=500)
+    state = game.game_state
+    cells = [state['player_position'], state['monster_position'], state['treasure_position'], *state['traps']]
+    assert len(set(cells)) == len(cells)  # no two elements on the same cell
+    assert all(game.maze.get(*cell) != WALL for cell in cells)
+
+    max_distance = math.sqrt((0.1 * 12) ** 2 + (0.1 * 12) ** 2)
+    x, y = state['player_position']
+    far_enough = {cell for cell in paths_of(game.maze) if math.sqrt((cell[0] - x) ** 2 + (cell[1] - y) ** 2) >
+                  max_distance} - {state['monster_position'], state['treasure_position']}
+    assert set(state['traps']) == far_enough  # every cell far enough from the player, then no more traps
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_level_allocator_skips_placed_elements(seed):
+    game = MazeGame((25, 25), seed=seed)
+    game.create_level(nb_traps=10)
+    state = game.game_state
+    allocator = level_allocator(state)
+    placed = {state['player_position'], state['monster_position'], state['treasure_position'], *state['traps']}
+    assert set(map(game.maze.coord, allocator.pool('free').cells)) == set(paths_of(game.maze)) - placed
+
+    state['treasure_position'] = None
+    GameElements(state, 0, game.rng, allocator)  # a new treasure never spawns on an element
+    assert state['treasure_position'] not in placed
@@ -0,0 +1,22 @@
+import random
+
+import pytest
+
+from conftest import random_grid
+from GameFiles.MazeGenerators import generate
+from GameFiles.MazeTiles import verify_tiles
+
+SIZES = [(3, 3), (12, 12), (3, 9), (9, 3), (17, 11), (11, 24)]
+
+
+@pytest.mark.parametrize('maze_size', SIZES)
+def test_table_matches_rules_on_random_grids(maze_size, rng):
+    for path_ratio in (0.2, 0.5, 0.8):
+        for _ in range(20):
+            assert verify_tiles(random_grid(maze_size, rng, path_ratio)) == []
+
+
+@pytest.mark.parametrize('maze_size', [(12, 12), (31, 19), (19, 31)])
+@pytest.mark.parametrize('algorithm', ['prim', 'binary_tree', 'eller'])
+def test_table_matches_rules_on_mazes(maze_size, algorithm):
+    assert verify_tiles(generate(maze_size, algorithm, random.Random(7))) == []